@@ -5,37 +5,193 @@ from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
 
     # ====== 基本配置 ======
     app.config["SECRET_KEY"] = "your-secret-key"
     app.config["SESSION_PERMANENT"] = False
 
-    db_path = os.path.join(app.root_path, "lostfound.db")
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + db_path
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # ====== 목록 페이지 크기 (?size= 로 MAX_PAGE_SIZE 까지 조절 가능) ======
+    app.config["PAGE_SIZE"] = int(os.getenv("PAGE_SIZE", "20"))
+    app.config["MAX_PAGE_SIZE"] = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+    # ====== 통계 캐시 유지 시간(초) — 물품이 바뀌면 즉시 무효화 ======
+    app.config["STATS_CACHE_TTL"] = int(os.getenv("STATS_CACHE_TTL", "60"))
+
+    # ====== 화면 조각 캐시 / 페이지 ETag (fragments.py) — 물품이 바뀌면 즉시 무효화 ======
+    app.config["PAGE_CACHE_ENABLED"] = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+    app.config["FRAGMENT_CACHE_TTL"] = int(os.getenv("FRAGMENT_CACHE_TTL", "300"))
+
+    # ====== AI 매칭 설정 ======
+    # AI_MATCH_OFFLINE=1 이면 LLM 재정렬 없이 로컬 벡터 인덱스 결과만 사용
+    app.config["AI_MATCH_OFFLINE"] = os.getenv("AI_MATCH_OFFLINE", "0") == "1"
+    app.config["AI_MATCH_CANDIDATES"] = int(os.getenv("AI_MATCH_CANDIDATES", "20"))
+
+    # ====== LLM 클라이언트 (llm.py 참고) ======
+    app.config["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
+    app.config["OPENAI_BASE_URL"] = os.getenv("OPENAI_BASE_URL")     # 로컬 가짜 서버 등
+    app.config["LLM_MODEL"] = os.getenv("LLM_MODEL", "gpt-4o-mini")
+    app.config["LLM_TIMEOUT"] = float(os.getenv("LLM_TIMEOUT", "20"))
+    app.config["LLM_CONNECT_TIMEOUT"] = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+    app.config["LLM_MAX_RETRIES"] = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    app.config["LLM_MAX_CONCURRENCY"] = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    app.config["LLM_QUEUE_TIMEOUT"] = float(os.getenv("LLM_QUEUE_TIMEOUT", "2"))
+
+    # ====== AI 결과 캐시 (AI_CACHE_PATH 를 주면 워커끼리 공유하는 디스크 캐시 사용) ======
+    app.config["AI_CACHE_SIZE"] = int(os.getenv("AI_CACHE_SIZE", "512"))
+    app.config["AI_CACHE_TTL"] = int(os.getenv("AI_CACHE_TTL", "3600"))
+    app.config["AI_CACHE_PATH"] = os.getenv("AI_CACHE_PATH")
+
+    # ====== 분실물 ↔ 습득물 자동 매칭 (matcher.py) ======
+    app.config["MATCH_ENABLED"] = os.getenv("MATCH_ENABLED", "1") == "1"
+    app.config["MATCH_DATE_WINDOW"] = int(os.getenv("MATCH_DATE_WINDOW", "14"))      # ±일
+    app.config["MATCH_MIN_SCORE"] = float(os.getenv("MATCH_MIN_SCORE", "0.5"))
+    app.config["MATCH_TOP_K"] = int(os.getenv("MATCH_TOP_K", "5"))
+    app.config["MATCH_MAX_CANDIDATES"] = int(os.getenv("MATCH_MAX_CANDIDATES", "300"))
+
+    # ====== 업로드 이미지 후처리 (images.py) ======
+    app.config["IMAGE_WORKERS"] = int(os.getenv("IMAGE_WORKERS", "2"))
+    app.config["IMAGE_MAX_SIZE"] = int(os.getenv("IMAGE_MAX_SIZE", "1600"))
+    app.config["IMAGE_THUMB_SIZE"] = int(os.getenv("IMAGE_THUMB_SIZE", "400"))
+    app.config["IMAGE_QUALITY"] = int(os.getenv("IMAGE_QUALITY", "85"))
+
+    # ====== 업로드 크기 제한 (storage.py) ======
+    # MAX_CONTENT_LENGTH: 요청 전체 — 본문을 읽기 전에 Content-Length 로 413
+    # UPLOAD_MAX_BYTES  : 파일 하나 — 저장하면서 넘는 순간 413
+    app.config["UPLOAD_MAX_BYTES"] = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", str(12 * 1024 * 1024)))
+
+    # ====== 업로드 이미지 브라우저 캐시 시간(초) — ETag 로 재검증 (assets.py) ======
+    app.config["UPLOAD_CACHE_MAX_AGE"] = int(os.getenv("UPLOAD_CACHE_MAX_AGE", "3600"))
+
+    # ====== 비밀번호 해시 정책 (passwords.py) — 바꾸면 다음 로그인 때 다시 해시 ======
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+    # ====== 로그인 시도 제한 (ratelimit.py) — "횟수/초", PATH 를 주면 워커끼리 공유 ======
+    app.config["LOGIN_LIMIT_ENABLED"] = os.getenv("LOGIN_LIMIT_ENABLED", "1") == "1"
+    app.config["LOGIN_LIMIT_IP"] = os.getenv("LOGIN_LIMIT_IP", "20/60")
+    app.config["LOGIN_LIMIT_USER"] = os.getenv("LOGIN_LIMIT_USER", "5/60")
+    app.config["LOGIN_LIMIT_PATH"] = os.getenv("LOGIN_LIMIT_PATH")
+
+    # ====== 요청 / SQL 측정 (profiling.py) — 켜면 Server-Timing 헤더 + /admin/metrics ======
+    app.config["PROFILING"] = os.getenv("PROFILING", "0") == "1"
+    app.config["SLOW_QUERY_MS"] = float(os.getenv("SLOW_QUERY_MS", "100"))
+    # 느린 쿼리에 실제 파라미터 값 기록 (비밀번호 해시 / 연락처가 남으므로 기본은 끔)
+    app.config["SLOW_QUERY_PARAMS"] = os.getenv("SLOW_QUERY_PARAMS", "0") == "1"
+    app.config["SLOW_REQUEST_MS"] = float(os.getenv("SLOW_REQUEST_MS", "500"))
+    app.config["N_PLUS_ONE_THRESHOLD"] = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+    # ====== Prometheus /metrics (metrics.py) — 다중 워커면 METRICS_DIR 공유 ======
+    app.config["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "1") == "1"
+    app.config["METRICS_DIR"] = os.getenv("METRICS_DIR")
+    app.config["METRICS_FLUSH_SECONDS"] = float(os.getenv("METRICS_FLUSH_SECONDS", "1"))
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")     # 있으면 Bearer 토큰 필요
+
+    # ====== 새 물품 실시간 알림 SSE (stream.py) — 구독자 수 / 버퍼는 워커(프로세스)당 ======
+    # 연결마다 스레드를 점유하는 서버(flask run / sync / gthread)에서는 끄는 게 기본
+    # gunicorn.conf.py 는 gevent 워커일 때만 켬 (STREAM_ENABLED=1 로 직접 켤 수도 있음)
+    app.config["STREAM_ENABLED"] = os.getenv("STREAM_ENABLED", "0") == "1"
+    app.config["STREAM_MAX_CLIENTS"] = int(os.getenv("STREAM_MAX_CLIENTS", "4"))
+    app.config["STREAM_BUFFER"] = int(os.getenv("STREAM_BUFFER", "100"))          # 넘치면 그 구독자만 끊음
+    app.config["STREAM_KEEPALIVE_SECONDS"] = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+    app.config["STREAM_MAX_SECONDS"] = float(os.getenv("STREAM_MAX_SECONDS", "300"))  # 끊고 재연결
+    app.config["STREAM_POLL_SECONDS"] = float(os.getenv("STREAM_POLL_SECONDS", "1"))  # 다른 워커 변경 확인
+    app.config["STREAM_RETRY_MS"] = int(os.getenv("STREAM_RETRY_MS", "3000"))
+
+    # ====== 시작할 때 스키마 생성 여부 — 기본은 `flask db init` 으로 따로 (migrations.py) ======
+    app.config["DB_AUTO_INIT"] = os.getenv("DB_AUTO_INIT", "0") == "1"
+
+    # 벤치마크/테스트용 설정 덮어쓰기 (예: 임시 DB 경로)
+    if test_config:
+        app.config.update(test_config)
+
+    # ====== DB 연결 프로필 (DATABASE_URL / DB_PROFILE, db_profile.py 참고) ======
+    from . import db_profile
+    db_profile.configure(app)
+
+    from .cache import ai_cache
+    ai_cache.configure(
+        maxsize=app.config["AI_CACHE_SIZE"],
+        ttl=app.config["AI_CACHE_TTL"],
+        path=app.config["AI_CACHE_PATH"],
+    )
+
+    from .ratelimit import login_limiter
+    from .passwords import normalize_method
+    normalize_method(app.config["PASSWORD_HASH_METHOD"])     # 잘못된 정책이면 시작할 때 오류
+    login_limiter.configure(
+        enabled=app.config["LOGIN_LIMIT_ENABLED"],
+        ip_rule=app.config["LOGIN_LIMIT_IP"],
+        user_rule=app.config["LOGIN_LIMIT_USER"],
+        path=app.config["LOGIN_LIMIT_PATH"],
+    )
+
     # 初始化数据库
     db.init_app(app)
+    with app.app_context():
+        db_profile.install(app, db.engine)
+        from . import profiling
+        profiling.install(app, db.engine)
+        from . import metrics
+        metrics.install(app, db.engine)
 
     # ====== 导入蓝图（非常重要，避免循环引用）======
     from .views import views                 # 主页/物品 CRUD
     from .auth import auth_bp                # 登录注册
     from .admin import admin_bp              # 管理员面板（如存在）
     from .ai_match import ai_bp              # AI 自动匹配（API）
+    from .api import api_bp                  # 읽기 전용 JSON API (/api/v1)
+    from .stream import stream_bp            # 새 물품 실시간 알림 (SSE)
 
     # 导入 models（确保 SQLAlchemy 识别所有表）
     from . import models
+    from . import changelog                  # 물품 변경 기록 리스너 등록
+
+    # 현재 사용자 (g.current_user, 템플릿 current_user) — 사용자 캐시 사용
+    from . import users
+    users.install(app)
+
+    # 템플릿에서 srcset 생성용
+    from .images import image_variants
+    app.jinja_env.globals["image_variants"] = image_variants
+
+    # 정적 파일 지문 URL (`flask assets build` 후 /assets/..., 전에는 /static/...)
+    from .assets import assets_bp, asset_url, assets_cli
+    app.jinja_env.globals["asset_url"] = asset_url
+    app.cli.add_command(assets_cli)
+
+    # 업로드 저장소 (refcount 리스너 등록 + `flask uploads gc`)
+    from . import storage
+    app.cli.add_command(storage.uploads_cli)
+
+    # 자동 매칭 (커밋 구독 + `flask matches backfill`)
+    from . import matcher
+    app.cli.add_command(matcher.matches_cli)
+
+    # 물품 대량 가져오기 / 내보내기 (`flask items import|export`)
+    from .bulk import items_cli
+    app.cli.add_command(items_cli)
+
+    # 스키마 생성 / 마이그레이션 (`flask db init|status`)
+    from . import migrations
+    app.cli.add_command(migrations.db_cli)
 
     # ====== 注册蓝图 ======
     app.register_blueprint(views)                     # 无前缀 → "/" 开头路由
     app.register_blueprint(auth_bp, url_prefix="/auth")   # 所有 auth 路由自动变成 /auth/xxx
     app.register_blueprint(admin_bp, url_prefix="/admin") # 管理后台
     app.register_blueprint(ai_bp, url_prefix="/ai")       # AI API → /ai/xxx
+    app.register_blueprint(api_bp, url_prefix="/api/v1")  # 물품 JSON API → /api/v1/items
+    app.register_blueprint(stream_bp, url_prefix="/stream")  # SSE → /stream/items
+    app.register_blueprint(assets_bp, url_prefix="/assets")  # 지문 붙은 정적 파일
+    app.register_blueprint(metrics.metrics_bp)               # /metrics (Prometheus)
 
-    # ====== 自动建表 ======
-    with app.app_context():
-        db.create_all()
+    # ====== 自动建表 (DB_AUTO_INIT=1 일 때만, 아니면 `flask db init`) ======
+    if app.config["DB_AUTO_INIT"]:
+        with app.app_context():
+            migrations.init_db()             # FTS 등 create_all 로 안 되는 스키마 포함
 
     return app
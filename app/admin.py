@@ -1,8 +1,14 @@
 ﻿# app/admin.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, abort, current_app
 from functools import wraps
-from app.models import User, LostItem, FoundItem, Feedback   
+from app.models import User, LostItem, FoundItem, ITEM_CLASSES, Feedback   
 from app import db
+from app.utils import statistics_data
+from app.cache import cache_stats
+from app import profiling
+from app.users import get_current_user
+from app.pagination import keyset_page, page_size, page_url
+from sqlalchemy.orm import joinedload
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -10,7 +16,8 @@ admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 def admin_required(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        if not session.get("is_admin"):
+        user = get_current_user()
+        if user is None or not user.is_admin:
             flash("관리자 권한이 필요합니다.", "danger")
             return redirect(url_for("auth.login_page"))
         return f(*args, **kwargs)
@@ -21,8 +28,7 @@ def admin_required(f):
 @admin_required
 def dashboard():
     total_users = User.query.count()
-    total_lost = LostItem.query.count()
-    total_found = FoundItem.query.count()
+    total_lost, total_found = statistics_data()[:2]
     recent_users = User.query.order_by(User.id.desc()).limit(5).all()
     recent_lost = LostItem.query.order_by(LostItem.id.desc()).limit(5).all()
 
@@ -40,12 +46,19 @@ def dashboard():
 @admin_required
 def users():
     q = request.args.get("q", "").strip()
+    query = User.query
     if q:
-        users = User.query.filter(User.username.contains(q)).all()
-    else:
-        users = User.query.order_by(User.id.desc()).all()
+        query = query.filter(User.username.contains(q))
+
+    users, next_cursor = keyset_page(query, User, request.args.get("cursor"), page_size())
 
-    return render_template("admin_users.html", users=users, q=q)
+    return render_template(
+        "admin_users.html",
+        users=users,
+        q=q,
+        next_url=page_url(next_cursor) if next_cursor else None,
+        first_url=page_url(None) if request.args.get("cursor") else None,
+    )
 
 # ============================ 관리자 권한 토글 ============================
 @admin_bp.route("/users/<int:user_id>/toggle_admin", methods=["POST"])
@@ -78,22 +91,31 @@ def delete_user(user_id):
 @admin_required
 def items():
     t = request.args.get("type", "all")
+    size = page_size()
 
-    if t == "lost":
-        items = LostItem.query.order_by(LostItem.id.desc()).all()
-        return render_template("admin_items.html", items=items, type="lost")
+    def item_page(Model, cursor):
+        query = Model.query.options(joinedload(Model.user))
+        return keyset_page(query, Model, cursor, size)
 
-    elif t == "found":
-        items = FoundItem.query.order_by(FoundItem.id.desc()).all()
-        return render_template("admin_items.html", items=items, type="found")
+    if t in ("lost", "found"):
+        items, next_cursor = item_page(ITEM_CLASSES[t], request.args.get("cursor"))
+        return render_template(
+            "admin_items.html",
+            items=items,
+            type=t,
+            next_url=page_url(next_cursor) if next_cursor else None,
+            first_url=page_url(None) if request.args.get("cursor") else None,
+        )
 
     else:
-        lost = LostItem.query.order_by(LostItem.id.desc()).all()
-        found = FoundItem.query.order_by(FoundItem.id.desc()).all()
+        # 전체 보기: 각각 첫 페이지만, 나머지는 종류별 목록에서
+        lost, lost_next = item_page(LostItem, None)
+        found, found_next = item_page(FoundItem, None)
 
         return render_template(
             "admin_items.html",
             items={"lost": lost, "found": found},
+            more={"lost": bool(lost_next), "found": bool(found_next)},
             type="all"
         )
 
@@ -101,10 +123,9 @@ def items():
 @admin_bp.route("/items/<string:item_type>/<int:item_id>/delete", methods=["POST"])
 @admin_required
 def delete_item(item_type, item_id):
-    if item_type == "lost":
-        item = LostItem.query.get_or_404(item_id)
-    else:
-        item = FoundItem.query.get_or_404(item_id)
+    if item_type not in ITEM_CLASSES:
+        abort(404)
+    item = db.get_or_404(ITEM_CLASSES[item_type], item_id)
 
     db.session.delete(item)
     db.session.commit()
@@ -115,8 +136,9 @@ def delete_item(item_type, item_id):
 @admin_bp.route("/items/<string:item_type>/<int:item_id>/toggle_resolved", methods=["POST"])
 @admin_required
 def toggle_resolved(item_type, item_id):
-    Model = LostItem if item_type == "lost" else FoundItem
-    item = Model.query.get_or_404(item_id)
+    if item_type not in ITEM_CLASSES:
+        abort(404)
+    item = db.get_or_404(ITEM_CLASSES[item_type], item_id)
 
     if hasattr(item, "resolved"):
         item.resolved = not item.resolved
@@ -130,8 +152,7 @@ def toggle_resolved(item_type, item_id):
 @admin_required
 def stats():
     total_users = User.query.count()
-    total_lost = LostItem.query.count()
-    total_found = FoundItem.query.count()
+    total_lost, total_found = statistics_data()[:2]
     recent_users = User.query.order_by(User.id.desc()).limit(5).all()
     recent_lost = LostItem.query.order_by(LostItem.id.desc()).limit(5).all()
 
@@ -144,6 +165,28 @@ def stats():
         recent_lost=recent_lost
     )
 
+# ============================ 캐시 적중률 ============================
+@admin_bp.route("/cache")
+@admin_required
+def cache_info():
+    return jsonify(cache_stats())
+
+# ============================ 요청 / SQL 측정 ============================
+@admin_bp.route("/metrics")
+@admin_required
+def metrics():
+    """profiling.py 측정값 (이 워커 기준, PROFILING=1 일 때만 쌓임)"""
+    data = profiling.metrics.snapshot()
+    data["enabled"] = profiling.enabled(current_app)
+    return jsonify(data)
+
+
+@admin_bp.route("/metrics/reset", methods=["POST"])
+@admin_required
+def metrics_reset():
+    profiling.metrics.reset()
+    return jsonify({"ok": True})
+
 # ============================ 사용자 피드백 관리 ============================
 @admin_bp.route("/feedback")
 @admin_required
@@ -1,9 +1,11 @@
 # app/ai_match.py
-import os
 import json
-from flask import Blueprint, request, jsonify
-from openai import OpenAI
-from app.models import LostItem, FoundItem
+from types import SimpleNamespace
+from flask import Blueprint, request, jsonify, current_app
+from app import llm
+from app.llm import LLMError
+from app.match_index import match_index
+from app.cache import ai_cache
 
 ai_bp = Blueprint("ai", __name__)
 
@@ -21,73 +23,132 @@ def build_item_text(item, tag):
         f"description={item.description or ''}"
     )
 
-@ai_bp.route("/ai/match", methods=["POST"])
-def ai_match():
-    """
-    경량 AI 매칭 기능 (OpenAI 사용)
-    요청: {"text": "..."}
-    응답: [{ "type": "lost|found", "name": "...", "score": 0.87 }, ...]
-    """
-    data = request.get_json() or {}
-    user_text = (data.get("text") or "").strip()
 
-    if not user_text:
-        return jsonify([])
+def is_offline():
+    """LLM 을 쓰지 않는 오프라인 모드 여부 (설정 또는 API 키/서버 없음)"""
+    return current_app.config.get("AI_MATCH_OFFLINE") or not llm.available()
 
-    # DB 의 모든 물품을 텍스트 형태로 변환
-    lines = []
-    for item in LostItem.query.all():
-        lines.append(build_item_text(item, "lost"))
-    for item in FoundItem.query.all():
-        lines.append(build_item_text(item, "found"))
-
-    if not lines:
-        return jsonify([])
 
+def rerank_with_llm(user_text, candidates, limit):
+    """
+    로컬 인덱스가 뽑은 후보들만 LLM 에 보내 다시 정렬합니다.
+    LLM 응답을 해석할 수 없으면 None 을 반환합니다.
+    """
+    lines = [
+        f"{c['type']}:{c['id']} " + build_item_text(SimpleNamespace(**c), c["type"])
+        for c in candidates
+    ]
     db_text = "\n".join(lines)
 
     # 프롬프트 생성
     prompt = f"""
 당신은 분실물 자동 매칭 도우미입니다.
-사용자가 입력한 설명을 보고 DB 목록에서 가장 유사한 최대 5개 물품을 찾으세요.
+사용자가 입력한 설명을 보고 후보 목록에서 가장 유사한 최대 {limit}개 물품을 고르세요.
 
 ### 출력 형식
 - 반드시 **JSON 배열만** 출력하세요.
 - 배열의 각 항목은 다음을 포함해야 합니다:
-  - "type": "lost" 또는 "found"
-  - "name": 물품 이름
+  - "key": 후보 줄 맨 앞의 "type:id" 값
   - "score": 0~1 사이 숫자 (유사도)
 
 ### 사용자 입력
 {user_text}
 
-### DB 목록
+### 후보 목록
 {db_text}
 """
 
+    content = llm.chat(
+        [
+            {"role": "system", "content": "JSON 형식만 반환하는 분실물 매칭 도우미입니다."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.2,
+    ).strip()
+
+    # JSON 파싱 시도
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "JSON 형식만 반환하는 분실물 매칭 도우미입니다."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
-
-        content = resp.choices[0].message.content.strip()
-
-        # JSON 파싱 시도
+        ranked = json.loads(content)
+    except Exception:
+        return None
+    if not isinstance(ranked, list):
+        return None
+
+    by_key = {f"{c['type']}:{c['id']}": c for c in candidates}
+    results = []
+    for r in ranked:
+        if not isinstance(r, dict) or r.get("key") not in by_key:
+            continue
+        c = dict(by_key.pop(r["key"]))
         try:
-            results = json.loads(content)
-            if not isinstance(results, list):
-                results = []
-        except Exception:
-            results = []
+            c["score"] = float(r.get("score", c["score"]))
+        except (TypeError, ValueError):
+            pass
+        results.append(c)
+    return results[:limit] or None
+
+
+def _match_items(user_text, limit, offline):
+    """
+    반환: (results, complete)
+    complete=False 는 LLM 실패로 로컬 순위를 대신 돌려준 경우 (캐시하지 않음)
+    """
+    k = current_app.config.get("AI_MATCH_CANDIDATES", 20)
+    candidates = match_index.ensure_fresh().search(user_text, k=max(k, limit))
+    if not candidates:
+        return [], True
+
+    if offline:
+        return candidates[:limit], True
+
+    try:
+        reranked = rerank_with_llm(user_text, candidates, limit)
+    except LLMError:
+        # LLM 이 느리거나 실패하면 로컬 순위로 응답
+        return candidates[:limit], False
+    if reranked:
+        return reranked, True
+    return candidates[:limit], False
 
-        return jsonify(results)
 
+def ai_match_items(user_text, limit=5):
+    """
+    로컬 벡터 인덱스로 top-k 후보를 찾고, 온라인 모드에서는 LLM 으로 재정렬합니다.
+    /ai/ai/match 와 /api/ai-match 가 함께 사용합니다.
+    결과는 (정규화한 입력, 데이터 버전) 으로 캐시되므로 물품이 바뀌면 다시 계산됩니다.
+    """
+    user_text = (user_text or "").strip()
+    if not user_text:
+        return []
+
+    offline = bool(is_offline())
+    fallback = []
+
+    def compute():
+        results, complete = _match_items(user_text, limit, offline)
+        if not complete:
+            fallback.append(results)
+            return None
+        return results
+
+    results = ai_cache.get_or_set("match", user_text, compute, limit, offline)
+    return results if results is not None else fallback[0]
+
+
+@ai_bp.route("/ai/match", methods=["POST"])
+def ai_match():
+    """
+    경량 AI 매칭 기능 (로컬 인덱스 + 선택적 LLM 재정렬)
+    요청: {"text": "..."}
+    응답: [{ "type": "lost|found", "id": 1, "name": "...", "score": 0.87 }, ...]
+    """
+    data = request.get_json() or {}
+    user_text = (data.get("text") or "").strip()
+
+    if not user_text:
+        return jsonify([])
+
+    try:
+        return jsonify(ai_match_items(user_text))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-
@@ -0,0 +1,125 @@
+# =====================================================
+# 📡 api.py — 읽기 전용 JSON API (/api/v1)
+# =====================================================
+#
+# 키오스크 / 모바일 앱이 search.html 을 긁어 가지 않도록 물품 목록을 JSON 으로 줍니다.
+#   GET /api/v1/items?keyword=&category=&place=&date=&cursor=&size=&fields=
+#   GET /api/v1/items/<id>?fields=
+#
+# - 필터는 /search 와 같음 (search_index.search_items)
+# - 예전 /api/search 도 이 목록을 그대로 씀 (Deprecation 헤더, views.search_api)
+# - ?fields=id,name,image → 그 컬럼만 SELECT, ORM 객체 없이 행 → dict
+# - 키셋 페이지네이션: 응답의 next (또는 next_cursor) 로 다음 페이지
+# - ETag = (API 버전, 데이터 버전, URL) 해시 → If-None-Match 가 같으면 DB 조회 없이 304
+#   로그인 사용자 전용이므로 Cache-Control: private, no-cache
+
+import hashlib
+import json
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from app import changelog, db
+from app.auth import api_login_required
+from app.models import Item
+from app.pagination import page_size, page_url
+from app.search_index import RESULT_FIELDS, search_items, to_result
+
+API_VERSION = "v1"
+
+# ?fields= 로 고를 수 있는 컬럼 (기본은 RESULT_FIELDS — /search 결과와 같은 모양)
+FIELDS = ("id", "type", "name", "category", "place", "date",
+          "contact", "description", "image", "created_at")
+
+api_bp = Blueprint("api", __name__)
+
+
+@api_bp.errorhandler(404)
+def not_found(e):
+    return jsonify({"error": "해당 물품을 찾을 수 없습니다."}), 404
+
+
+def parse_fields():
+    """?fields=a,b,c → (필드 튜플, None) / 모르는 필드가 있으면 (None, 400 응답)"""
+    raw = request.args.get("fields", "")
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    if not fields:
+        return RESULT_FIELDS, None
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        return None, (jsonify({
+            "error": f"알 수 없는 필드: {', '.join(unknown)}",
+            "fields": list(FIELDS),
+        }), 400)
+    return fields, None
+
+
+def api_etag():
+    raw = f"{API_VERSION}|{changelog.data_version()}|{request.full_path}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional_json(build):
+    """
+    ETag 가 같으면 build() 없이 304, 아니면 build() 결과를 JSON 으로
+    (jsonify 와 달리 키 정렬 / \\u 이스케이프 없이 한 번에 직렬화)
+    """
+    etag = api_etag()
+    if request.if_none_match.contains_weak(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        body = json.dumps(build(), ensure_ascii=False, separators=(",", ":"))
+        resp = current_app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag, weak=True)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    resp.vary.add("Cookie")
+    return resp
+
+
+# =====================================================
+# 🔹 물품 목록 / 상세
+# =====================================================
+@api_bp.route("/items")
+@api_login_required
+def list_items():
+    fields, error = parse_fields()
+    if error:
+        return error
+
+    def build():
+        items, next_cursor = search_items(
+            request.args.get("keyword", ""),
+            request.args.get("category", ""),
+            request.args.get("place", ""),
+            request.args.get("date", ""),
+            cursor=request.args.get("cursor"),
+            size=page_size(),
+            fields=fields,
+        )
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "next": page_url(next_cursor) if next_cursor else None,
+        }
+
+    return conditional_json(build)
+
+
+@api_bp.route("/items/<int:item_id>")
+@api_login_required
+def get_item(item_id):
+    fields, error = parse_fields()
+    if error:
+        return error
+
+    def build():
+        row = (
+            db.session.query(*[getattr(Item, f) for f in fields])
+            .filter(Item.id == item_id)
+            .first()
+        )
+        if row is None:
+            abort(404)
+        return to_result(row, fields)
+
+    return conditional_json(build)
@@ -0,0 +1,196 @@
+# =====================================================
+# 🎨 assets.py — 정적 파일 지문(fingerprint) / 사전 압축 / 장기 캐시
+# =====================================================
+#
+#   flask assets build
+#
+# app/static 아래 파일(uploads 제외)을 내용 해시가 들어간 이름으로
+# app/static/dist 에 복사하고, 텍스트 파일은 .gz (brotli 패키지가 있으면 .br 도)
+# 를 미리 만들어 둡니다. 원래 이름 → 지문 이름은 dist/manifest.json 에 기록합니다.
+#
+#   - 템플릿: {{ asset_url('content/site.css') }}
+#             빌드 전이면 일반 /static/... 주소로 대체
+#   - /assets/<지문 이름>: Accept-Encoding 에 맞는 사전 압축본 전송,
+#             이름이 내용과 함께 바뀌므로 Cache-Control: immutable (1년)
+#   - /static/uploads/...: ETag / Last-Modified 로 조건부 GET(304) +
+#             UPLOAD_CACHE_MAX_AGE 동안 재검증 없이 캐시
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+import click
+from flask import Blueprint, abort, current_app, request, send_file, url_for
+from flask.cli import AppGroup
+from werkzeug.security import safe_join
+
+try:
+    import brotli   # 선택 사항 (pip install brotli)
+except ImportError:
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST = "manifest.json"
+SKIP_DIRS = {"uploads", DIST_DIR}
+
+# 압축 효과가 있는 형식만 미리 압축
+COMPRESSIBLE = {".css", ".js", ".map", ".json", ".svg", ".txt", ".html", ".eot", ".ttf", ".xml"}
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+assets_bp = Blueprint("assets", __name__)
+
+_manifest = {"path": None, "mtime": None, "data": {}}
+
+
+# =====================================================
+# 🔹 빌드
+# =====================================================
+def _fingerprint(rel, data):
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def _write_compressed(path, data):
+    """원본보다 충분히 작을 때만 .gz / .br 저장, 저장한 바이트 수 반환"""
+    written = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data) * 0.9:
+        with open(path + ".gz", "wb") as f:
+            f.write(gz)
+        written["gzip"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data) * 0.9:
+            with open(path + ".br", "wb") as f:
+                f.write(br)
+            written["br"] = len(br)
+    return written
+
+
+def build_assets(static_folder, clean=True):
+    """
+    static_folder 의 파일을 dist 로 지문 복사 + 사전 압축
+    반환: {"files", "bytes", "gzip_bytes", "br_bytes"}
+    """
+    out_dir = os.path.join(static_folder, DIST_DIR)
+    if clean and os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest = {}
+    totals = {"files": 0, "bytes": 0, "gzip_bytes": 0, "br_bytes": 0}
+
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder)
+        if rel_root == ".":
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            rel = os.path.normpath(os.path.join(rel_root, name)).replace(os.sep, "/")
+            with open(os.path.join(root, name), "rb") as f:
+                data = f.read()
+
+            fingerprinted = _fingerprint(rel, data)
+            target = os.path.join(out_dir, *fingerprinted.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+
+            totals["files"] += 1
+            totals["bytes"] += len(data)
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE:
+                written = _write_compressed(target, data)
+                totals["gzip_bytes"] += written.get("gzip", len(data))
+                totals["br_bytes"] += written.get("br", len(data))
+            manifest[rel] = fingerprinted
+
+    tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    return totals
+
+
+# =====================================================
+# 🔹 템플릿 헬퍼
+# =====================================================
+def load_manifest():
+    """dist/manifest.json (파일이 바뀌면 다시 읽음, 없으면 빈 dict)"""
+    path = os.path.join(current_app.static_folder, DIST_DIR, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    if _manifest["path"] != path or _manifest["mtime"] != mtime:
+        with open(path, encoding="utf-8") as f:
+            _manifest.update(path=path, mtime=mtime, data=json.load(f))
+    return _manifest["data"]
+
+
+def asset_url(filename):
+    """{{ asset_url('content/site.css') }} → /assets/content/site.<hash>.css"""
+    fingerprinted = load_manifest().get(filename)
+    if fingerprinted:
+        return url_for("assets.serve", filename=fingerprinted)
+    return url_for("static", filename=filename)
+
+
+# =====================================================
+# 🔹 전송
+# =====================================================
+@assets_bp.route("/<path:filename>")
+def serve(filename):
+    dist = os.path.join(current_app.static_folder, DIST_DIR)
+    path = safe_join(dist, filename)
+    if path is None or filename == MANIFEST or not os.path.isfile(path):
+        abort(404)
+
+    encoding = None
+    for enc, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if enc in request.accept_encodings and os.path.isfile(path + suffix):
+            encoding, path = enc, path + suffix
+            break
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=True,
+                     max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+@assets_bp.after_app_request
+def upload_cache_headers(resp):
+    """
+    업로드 이미지: Flask static 전송이 이미 ETag / Last-Modified 를 붙이고
+    If-None-Match 에 304 로 응답하므로, 여기서는 캐시 유지 시간만 지정
+    (본 이미지는 업로드 직후 한 번 리사이즈되므로 immutable 은 쓰지 않음)
+    """
+    if request.path.startswith("/static/uploads/") and resp.status_code in (200, 206, 304):
+        resp.cache_control.no_cache = None
+        resp.cache_control.public = True
+        resp.cache_control.max_age = current_app.config.get("UPLOAD_CACHE_MAX_AGE", 3600)
+    return resp
+
+
+assets_cli = AppGroup("assets", help="정적 파일 빌드")
+
+
+@assets_cli.command("build")
+@click.option("--no-clean", is_flag=True, help="기존 dist 를 지우지 않음")
+def build_command(no_clean):
+    """app/static → app/static/dist (지문 이름 + .gz/.br + manifest.json)"""
+    totals = build_assets(current_app.static_folder, clean=not no_clean)
+    click.echo(
+        f"{totals['files']}개 파일, {totals['bytes']:,} B → "
+        f"gzip {totals['gzip_bytes']:,} B"
+        + (f", br {totals['br_bytes']:,} B" if brotli is not None else " (brotli 미설치)")
+    )
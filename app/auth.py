@@ -1,6 +1,8 @@
 ﻿from flask import Blueprint, request, jsonify, session, render_template, redirect
 from app import db
 from app.models import User
+from app.users import get_current_user
+from app.ratelimit import login_limiter
 from functools import wraps
 
 auth_bp = Blueprint('auth', __name__)
@@ -14,10 +16,64 @@ def login_required(f):
     def wrapper(*args, **kwargs):
         if not session.get("user_id"):
             return redirect("/auth/login")
+        # 삭제된 사용자의 세션은 끊음 (사용자 캐시 → 보통 DB 조회 없음)
+        if get_current_user() is None:
+            session.clear()
+            return redirect("/auth/login")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def api_login_required(f):
+    """JSON API 용: 로그인 페이지로 보내지 않고 401 JSON"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not session.get("user_id"):
+            return jsonify({"error": "로그인이 필요합니다."}), 401
+        if get_current_user() is None:
+            session.clear()
+            return jsonify({"error": "로그인이 필요합니다."}), 401
         return f(*args, **kwargs)
     return wrapper
 
 
+# =======================
+# 🔹 로그인 시도 제한 (DB 조회 / 해시 계산 전에 거부)
+# =======================
+def login_throttled(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True)
+        username = data.get("username") if isinstance(data, dict) else None
+        # 아이디가 없거나 문자열이 아니면 IP 버킷만 (본 요청에서 401)
+        retry_after = login_limiter.hit(request.remote_addr, username)
+        if retry_after:
+            resp = jsonify({"error": "로그인 시도가 너무 많습니다. 잠시 후 다시 시도하세요",
+                            "retry_after": retry_after})
+            resp.status_code = 429
+            resp.headers["Retry-After"] = str(retry_after)
+            return resp
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def authenticate(username, password):
+    """
+    아이디/비밀번호 확인 → User 또는 None
+    해시 정책(PASSWORD_HASH_METHOD)이 바뀌었으면 이번에 받은 비밀번호로 다시 해시해 저장
+    """
+    if not isinstance(username, str) or not isinstance(password, str):
+        return None
+    user = User.query.filter_by(username=username).first()
+    if not user or not user.check_password(password):
+        return None
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+    login_limiter.succeeded(username)
+    return user
+
+
 # =======================
 # 🔹 注册页面
 # =======================
@@ -63,14 +119,17 @@ def register_api():
 # 🔹 登录 API（已修改 session.permanent=False）
 # =======================
 @auth_bp.route('/api/login', methods=['POST'])
+@login_throttled
 def login():
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "아이디 또는 비밀번호가 틀립니다"}), 401
     username = data.get('username', '')
     password = data.get('password', '')
 
-    user = User.query.filter_by(username=username).first()
+    user = authenticate(username, password)
 
-    if not user or not user.check_password(password):
+    if not user:
         return jsonify({"error": "아이디 또는 비밀번호가 틀립니다"}), 401
 
     # 浏览器关闭即失效
@@ -97,13 +156,14 @@ def logout():
 # =======================
 @auth_bp.route('/api/me', methods=['GET'])
 def me():
-    if 'user_id' not in session:
+    user = get_current_user()
+    if user is None:
         return jsonify({"user": None})
     return jsonify({
         "user": {
-            "id": session['user_id'],
-            "username": session.get('username'),
-            "is_admin": session.get('is_admin')
+            "id": user.id,
+            "username": user.username,
+            "is_admin": user.is_admin
         }
     })
 
@@ -120,14 +180,17 @@ def admin_login_page():
 # 🔹 管理员登录 API（加入 session.permanent=False）
 # =======================
 @auth_bp.route('/api/admin/login', methods=['POST'])
+@login_throttled
 def admin_login_api():
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "아이디 또는 비밀번호가 틀립니다"}), 401
     username = data.get("username", "")
     password = data.get("password", "")
 
-    user = User.query.filter_by(username=username).first()
+    user = authenticate(username, password)
 
-    if not user or not user.check_password(password):
+    if not user:
         return jsonify({"error": "아이디 또는 비밀번호가 틀립니다"}), 401
 
     if not user.is_admin:
@@ -149,9 +212,11 @@ def admin_login_api():
 def admin_required(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        if not session.get("user_id"):
+        user = get_current_user()
+        if user is None:
             return redirect("/auth/login")
-        if not session.get("is_admin"):
+        # session['is_admin'] 이 아니라 현재 권한으로 확인 (권한 해제 즉시 반영)
+        if not user.is_admin:
             return redirect("/")
         return f(*args, **kwargs)
     return wrapper
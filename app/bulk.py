@@ -0,0 +1,305 @@
+# =====================================================
+# 📥 bulk.py — 물품 대량 가져오기 / 내보내기 (CLI)
+# =====================================================
+#
+#   flask items import data.csv  [--batch 1000] [--images-dir DIR] [--restart]
+#   flask items export out.jsonl [--type lost|found] [--batch 1000]
+#
+# 형식은 확장자로 정합니다. (.csv / .jsonl, 그 외와 "-" 는 --format)
+# 컬럼: EXPORT_COLUMNS (가져올 때 id 는 무시하고 새로 발급)
+#
+# 가져오기
+#   - 파일을 한 줄씩 읽어 batch 개씩 executemany INSERT, batch 마다 커밋
+#   - 같은 트랜잭션에서 item_change(변경 기록) · blob refcount · 진행 상황
+#     (item_import.rows_done) 을 함께 기록 → 중간에 멈춰도 다시 실행하면
+#     마지막으로 커밋된 batch 다음부터 이어서 진행 (파일 sha256 으로 구분)
+#   - 매퍼 이벤트를 거치지 않으므로 행마다 하는 일이 없고, 대신
+#       전문 검색(item_fts)  : DB 트리거가 INSERT 와 함께 갱신
+#       벡터 인덱스(match_index): 다른 워커가 item_change 를 보고 500개씩 동기화
+#       자동 매칭(item_match) : 끝난 뒤 영향받은 블록 · 날짜 범위만 backfill
+#   - image 컬럼: /static/uploads/... 또는 http(s) URL 은 그대로,
+#     그 외는 --images-dir 기준 파일 경로로 보고 storage 에 저장
+#
+# 내보내기는 yield_per 로 batch 개씩 읽어 바로 쓰므로 메모리 사용량이 일정합니다.
+
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from app import db, changelog, images, matcher, storage
+from app.models import Item, ItemChange, ItemImport, ITEM_CLASSES, User
+from app.pagination import parse_datetime
+from app.utils import parse_date
+
+EXPORT_COLUMNS = ("id", "type", "name", "category", "place", "date", "contact",
+                  "description", "image", "created_at", "user_id")
+
+TEXT_COLUMNS = ("name", "category", "place", "contact", "description")
+
+items_cli = AppGroup("items", help="물품 대량 가져오기 / 내보내기")
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".jsonl"):
+        return ext[1:]
+    raise click.UsageError("형식을 알 수 없습니다. --format csv|jsonl 을 지정하세요")
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# =====================================================
+# 🔹 읽기 / 검증
+# =====================================================
+def read_records(f, fmt):
+    """파일 객체 → dict 레코드 (한 줄씩, 빈 줄 제외)"""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None     # 번호는 유지하고 clean_record 에서 오류 처리
+
+
+def _text(value):
+    value = "" if value is None else str(value).strip()
+    return value or None
+
+
+def clean_record(record, now):
+    """
+    레코드 → item 행 dict (image 는 아직 원래 값), 잘못된 레코드면 ValueError
+    views.register 와 같은 규칙: 이름과 장소는 필수, 종류가 없으면 습득물
+    """
+    if not isinstance(record, dict):
+        raise ValueError("JSON 객체가 아님")
+    item_type = _text(record.get("type")) or "found"
+    if item_type not in ITEM_CLASSES:
+        raise ValueError(f"알 수 없는 종류: {item_type!r}")
+    row = {c: _text(record.get(c)) for c in TEXT_COLUMNS}
+    if not row["name"] or not row["place"]:
+        raise ValueError("name / place 누락")
+
+    row["type"] = item_type
+    row["date"] = parse_date(record.get("date"))
+    row["created_at"] = parse_datetime(_text(record.get("created_at"))) or now
+    user_id = _text(record.get("user_id"))
+    row["user_id"] = int(user_id) if user_id and user_id.isdigit() else None
+    row["image"] = _text(record.get("image"))
+    return row
+
+
+def resolve_image(value, images_dir):
+    """image 값 → 저장할 URL (로컬 파일이면 storage 에 저장), 파일이 없으면 None"""
+    if not value or value.startswith((storage.URL_PREFIX, "http://", "https://")):
+        return value
+    path = value if os.path.isabs(value) else os.path.join(images_dir, value)
+    if not os.path.isfile(path):
+        click.echo(f"  이미지 없음: {path}", err=True)
+        return None
+    return storage.store_path(path)
+
+
+# =====================================================
+# 🔹 가져오기
+# =====================================================
+def _insert_batch(rows, run, consumed):
+    """batch 하나를 한 트랜잭션으로: 물품 + 변경 기록 + refcount + 진행 상황"""
+    # 없는 사용자를 가리키면 작성자 없음으로
+    user_ids = {r["user_id"] for r in rows if r["user_id"] is not None}
+    if user_ids:
+        known = set(db.session.scalars(select(User.id).where(User.id.in_(user_ids))))
+        for r in rows:
+            if r["user_id"] not in known:
+                r["user_id"] = None
+
+    inserted = []
+    if rows:
+        table = Item.__table__
+        inserted = db.session.execute(
+            table.insert().returning(table.c.id, table.c.type), rows
+        ).all()
+        db.session.execute(ItemChange.__table__.insert(), [
+            {"item_type": t, "item_id": i, "op": "insert", "created_at": datetime.utcnow()}
+            for i, t in inserted
+        ])
+        storage.add_refs(Counter(
+            d for d in (storage.digest_from_url(r["image"]) for r in rows) if d
+        ))
+
+    run.rows_done += consumed
+    run.inserted += len(inserted)
+    db.session.commit()
+    # 다른 워커: 다음 요청에서 버전이 바뀐 것을 보고 변경분을 읽어 감
+    changelog.touch_stamp()
+    return len(inserted)
+
+
+def import_items(path, fmt, batch=1000, images_dir=None, restart=False, log=print):
+    """
+    파일을 batch 개씩 가져오기, 반환: {"read", "inserted", "skipped", "errors", "seconds", "blocks", "start", "end"}
+    blocks/start/end 는 자동 매칭을 다시 계산해야 하는 범위
+    """
+    started = time.perf_counter()
+    images_dir = images_dir or os.path.dirname(os.path.abspath(path))
+    source = file_digest(path)
+
+    run = db.session.get(ItemImport, source)
+    if run is None or restart:
+        if run is None:
+            run = ItemImport(source=source)
+            db.session.add(run)
+        run.filename = os.path.basename(path)
+        run.rows_done = run.inserted = 0
+        run.finished = False
+        db.session.commit()
+    elif run.finished:
+        log(f"이미 가져온 파일입니다 ({run.inserted}개). 다시 가져오려면 --restart")
+        return None
+    elif run.rows_done:
+        log(f"이어서 진행: {run.rows_done}번째 레코드 다음부터")
+
+    skip = run.rows_done
+    totals = {"read": 0, "inserted": 0, "skipped": skip, "errors": 0,
+              "blocks": set(), "start": None, "end": None}
+    now = datetime.utcnow()
+    rows, consumed = [], 0
+
+    def remember(row):
+        # 매칭을 다시 계산할 범위 (이전 실행에서 넣은 레코드 포함)
+        totals["blocks"].add(matcher.block_of(row["category"], row["place"]))
+        day = row["date"] or row["created_at"].date()
+        totals["start"] = min(totals["start"] or day, day)
+        totals["end"] = max(totals["end"] or day, day)
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for n, record in enumerate(read_records(f, fmt), start=1):
+            if n <= skip:
+                try:
+                    remember(clean_record(record, now))
+                except ValueError:
+                    pass
+                continue
+            totals["read"] += 1
+            consumed += 1
+            try:
+                row = clean_record(record, now)
+            except ValueError as e:
+                totals["errors"] += 1
+                log(f"  {n}번째 레코드 건너뜀: {e}")
+            else:
+                row["image"] = resolve_image(row["image"], images_dir)
+                rows.append(row)
+                remember(row)
+
+            if consumed >= batch:
+                totals["inserted"] += _insert_batch(rows, run, consumed)
+                log(f"  {run.rows_done}개 처리, {run.inserted}개 추가")
+                rows, consumed = [], 0
+
+    totals["inserted"] += _insert_batch(rows, run, consumed)
+    run.finished = True
+    db.session.commit()
+
+    totals["seconds"] = round(time.perf_counter() - started, 2)
+    return totals
+
+
+@items_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="기본: 확장자")
+@click.option("--batch", default=1000, show_default=True, help="한 트랜잭션에 넣을 레코드 수")
+@click.option("--images-dir", type=click.Path(file_okay=False), help="이미지 상대 경로 기준 (기본: 파일 위치)")
+@click.option("--restart", is_flag=True, help="진행 기록을 무시하고 처음부터")
+@click.option("--no-match", is_flag=True, help="자동 매칭 계산 생략 (나중에 `flask matches backfill`)")
+def import_command(path, fmt, batch, images_dir, restart, no_match):
+    """CSV / JSONL 파일의 물품을 추가"""
+    totals = import_items(path, detect_format(path, fmt), batch=batch,
+                          images_dir=images_dir, restart=restart, log=click.echo)
+    if totals is None:
+        return
+    click.echo(f"{totals['inserted']}개 추가, 오류 {totals['errors']}개 ({totals['seconds']}초)")
+
+    # 새로 올라온 이미지 변환이 끝난 뒤 종료
+    images.wait()
+
+    if no_match or not totals["blocks"] or not current_app.config.get("MATCH_ENABLED", True):
+        return
+    window = timedelta(days=int(current_app.config.get("MATCH_DATE_WINDOW", 14)))
+    matched = matcher.backfill(
+        batch=batch,
+        blocks=sorted(totals["blocks"], key=lambda b: (b[0] or "", b[1] or "")),
+        start=totals["start"] - window,
+        end=totals["end"] + window,
+    )
+    click.echo(f"자동 매칭: 분실물 {matched['lost']}개, {matched['pairs']}쌍 ({matched['seconds']}초)")
+
+
+# =====================================================
+# 🔹 내보내기
+# =====================================================
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_items(f, fmt, item_type=None, batch=1000):
+    """물품을 id 순으로 f 에 기록 (batch 개씩 읽음), 기록한 개수 반환"""
+    table = Item.__table__
+    query = select(*[table.c[c] for c in EXPORT_COLUMNS]).order_by(table.c.id)
+    if item_type:
+        query = query.where(table.c.type == item_type)
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+
+    count = 0
+    result = db.session.execute(query.execution_options(yield_per=batch))
+    for row in result:
+        values = [_plain(v) for v in row]
+        if writer is not None:
+            writer.writerow(["" if v is None else v for v in values])
+        else:
+            f.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+@items_cli.command("export")
+@click.argument("path", default="-")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="기본: 확장자 (\"-\" 는 jsonl)")
+@click.option("--type", "item_type", type=click.Choice(sorted(ITEM_CLASSES)), help="한 종류만")
+@click.option("--batch", default=1000, show_default=True, help="한 번에 읽을 행 수")
+def export_command(path, fmt, item_type, batch):
+    """물품을 CSV / JSONL 로 내보내기 (PATH 가 - 이면 표준 출력)"""
+    if path == "-":
+        count = export_items(sys.stdout, fmt or "jsonl", item_type, batch)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            count = export_items(f, detect_format(path, fmt), item_type, batch)
+    click.echo(f"{count}개 내보냄", err=True)
@@ -0,0 +1,270 @@
+# =====================================================
+# 🗃 cache.py — 데이터 버전 기반 캐시
+# =====================================================
+#
+# 값마다 "계산할 때의 데이터 버전" (changelog.data_version) 을 같이 저장하고,
+# 버전이 바뀌었거나 TTL 이 지나면 다시 계산합니다.
+#   - VersionedCache : 통계 / HTML 조각처럼 키가 몇 개 안 되는 스냅샷
+#   - ResultCache    : AI 매칭/질문 결과 (정규화한 입력 + 버전 → LRU/TTL,
+#                      선택적으로 워커끼리 공유하는 SQLite 디스크 캐시)
+# 적중/실패 횟수는 cache_stats() 로 확인합니다. (/admin/cache)
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app import changelog
+
+_registry = {}
+
+
+def cache_stats():
+    """등록된 모든 캐시의 적중/실패 통계"""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+class VersionedCache:
+    def __init__(self, ttl=60, name=None):
+        self.ttl = ttl
+        self._store = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if name:
+            _registry[name] = self
+
+    def get_or_set(self, key, loader, version=None, ttl=None):
+        """
+        캐시된 값이 있고 버전이 같으면 그대로 반환, 아니면 loader() 로 계산
+        version 을 주지 않으면 현재 데이터 버전을 사용
+        loader 가 None 을 반환하면 저장하지 않음
+        """
+        if version is None:
+            version = changelog.data_version()
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._store.get(key)
+            if entry and entry[0] == version and now - entry[1] < ttl:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            self._store[key] = (version, now, value)
+        return value
+
+    def clear(self, *args):
+        with self._lock:
+            self._store.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._store)}
+
+
+# =====================================================
+# 🔹 AI 결과 캐시
+# =====================================================
+_PUNCT = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def normalize_query(text):
+    """
+    "검은 지갑!!", " 검은   지갑 " → "검은 지갑"
+    유니코드 정규화(NFKC) + 소문자 + 문장부호 제거 + 공백 정리
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return " ".join(_PUNCT.sub(" ", text).split())
+
+
+class DiskBackend:
+    """
+    여러 gunicorn 워커가 함께 쓰는 SQLite 파일 캐시
+    값은 JSON 으로 저장하고 만료 시각이 지난 행은 읽지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn      # 경로 / 권한 오류는 설정할 때 바로 드러나도록
+
+    @property
+    def _conn(self):
+        # gunicorn preload_app: fork 된 워커는 부모 연결을 쓰지 않고 새로 연결
+        if self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._db, self._pid = conn, os.getpid()
+        return self._db
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM result_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def prune(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache")
+            self._conn.commit()
+
+
+class ResultCache:
+    """
+    (네임스페이스, 정규화한 입력, 데이터 버전) → 결과
+    메모리 LRU(maxsize) + TTL, path 를 주면 디스크 캐시를 2차로 사용
+    """
+
+    # 디스크 캐시에서 만료된 행을 지우는 주기 (set 횟수)
+    PRUNE_EVERY = 500
+
+    def __init__(self, name, maxsize=512, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk = None
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+        self._sets = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    def configure(self, maxsize=None, ttl=None, path=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            if path and (self.disk is None or self.disk.path != path):
+                self.disk = DiskBackend(path)
+            elif not path:
+                self.disk = None
+            self._store.clear()
+
+    @staticmethod
+    def make_key(namespace, text, version, *extra):
+        raw = "|".join([namespace, str(version), normalize_query(text)] + [str(e) for e in extra])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry and entry[0] > now:
+                self._store.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._store[key]
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value, self.ttl)
+            self._sets += 1
+            if self._sets % self.PRUNE_EVERY == 0:
+                self.disk.prune()
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._store[key] = (time.monotonic() + self.ttl, value)
+            self._store.move_to_end(key)
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+    def current_key(self, namespace, text, *extra):
+        """현재 데이터 버전 기준 키 (스트리밍처럼 get / set 을 따로 부를 때)"""
+        return self.make_key(namespace, text, changelog.data_version(), *extra)
+
+    def get_or_set(self, namespace, text, loader, *extra):
+        """
+        현재 데이터 버전 기준으로 캐시 조회, 없으면 loader() 결과를 저장
+        loader 가 None 을 반환하면 저장하지 않음
+        """
+        key = self.current_key(namespace, text, *extra)
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / total, 4) if total else None,
+            "size": len(self._store),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "disk": self.disk.path if self.disk else None,
+        }
+
+
+# 통계 스냅샷 캐시 (/statistics, /admin/stats)
+stats_cache = VersionedCache(ttl=60, name="statistics")
+
+changelog.subscribe(stats_cache.clear)
+
+# 렌더링한 HTML 조각 캐시 (fragments.py)
+fragment_cache = VersionedCache(ttl=300, name="fragments")
+
+changelog.subscribe(fragment_cache.clear)
+
+# AI 매칭 / AI 질문 결과 캐시 (create_app 에서 AI_CACHE_* 설정 적용)
+ai_cache = ResultCache("ai")
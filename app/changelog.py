@@ -0,0 +1,170 @@
+# =====================================================
+# 🔁 changelog.py — 물품 변경 기록 / 데이터 버전
+# =====================================================
+#
+# LostItem / FoundItem 이 추가·수정·삭제될 때마다 같은 트랜잭션 안에서
+# item_change 테이블에 한 줄을 남깁니다. item_change.id 의 최댓값이
+# "데이터 버전" 이며, 다른 gunicorn 워커는 이 버전을 비교해서
+# 바뀐 행만 다시 읽어 갑니다.
+#
+# 같은 프로세스 안에서는 커밋 직후 구독 함수(subscribe)로 변경분을
+# 바로 전달하고, 버전 스탬프 파일을 갱신해 다른 프로세스에 알립니다.
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import LostItem, FoundItem, ItemChange
+
+ITEM_TYPES = {LostItem: "lost", FoundItem: "found"}
+
+# 커밋 시점에 전달할 물품 컬럼
+SNAPSHOT_COLUMNS = ("id", "type", "name", "category", "place", "date", "description", "image")
+
+# 스탬프 파일이 그대로여도 이 시간(초)이 지나면 DB 버전을 다시 확인
+VERSION_RECHECK_SECONDS = 30
+
+_subscribers = []
+_version_lock = threading.Lock()
+_version_cache = {}   # 스탬프 경로 → {"stamp", "version", "checked_at"}
+
+
+def subscribe(fn):
+    """
+    커밋된 변경분을 받을 함수 등록 (데코레이터로 사용 가능)
+    fn(changes) — changes: [SimpleNamespace(op, item_type, item_id, item), ...]
+    """
+    _subscribers.append(fn)
+    return fn
+
+
+def snapshot(item):
+    """세션 밖에서도 안전하게 쓸 수 있는 물품 값 복사본"""
+    return SimpleNamespace(**{c: getattr(item, c) for c in SNAPSHOT_COLUMNS})
+
+
+# =====================================================
+# 🔹 매퍼 이벤트 → item_change 기록
+# =====================================================
+def _record(op):
+    def listener(mapper, connection, target):
+        item_type = ITEM_TYPES[mapper.class_]
+        connection.execute(
+            ItemChange.__table__.insert().values(
+                item_type=item_type, item_id=target.id, op=op
+            )
+        )
+
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("item_changes", []).append(SimpleNamespace(
+                op=op,
+                item_type=item_type,
+                item_id=target.id,
+                item=None if op == "delete" else snapshot(target),
+            ))
+    return listener
+
+
+for _Model in ITEM_TYPES:
+    event.listen(_Model, "after_insert", _record("insert"))
+    event.listen(_Model, "after_update", _record("update"))
+    event.listen(_Model, "after_delete", _record("delete"))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    changes = session.info.pop("item_changes", None)
+    if not changes:
+        return
+
+    touch_stamp()
+    for fn in _subscribers:
+        fn(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("item_changes", None)
+
+
+# =====================================================
+# 🔹 데이터 버전
+# =====================================================
+def stamp_path(kind="version"):
+    """
+    버전 스탬프 파일 경로 (CHANGE_STAMP_PATH)
+    기본값은 SQLite 파일 옆 "<db 파일>.version"
+    kind 가 다르면 "<db 파일>.<kind>" (예: 사용자 캐시용 "users")
+    """
+    path = current_app.config.get("CHANGE_STAMP_PATH")
+    if path:
+        return path if kind == "version" else f"{path}.{kind}"
+    url = make_url(current_app.config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        return f"{url.database}.{kind}"
+    return os.path.join(current_app.instance_path, f"lostfound.{kind}")
+
+
+def touch_stamp(kind="version"):
+    """다른 워커에게 변경이 있었음을 알림 (파일 mtime 갱신)"""
+    if not has_app_context():
+        return
+    path = stamp_path(kind)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a"):
+        os.utime(path, None)
+
+
+def read_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns
+
+
+def data_version():
+    """
+    현재 데이터 버전 (= item_change.id 최댓값)
+    스탬프 파일이 바뀌지 않았으면 DB 를 조회하지 않습니다.
+    """
+    path = stamp_path()
+    stamp = read_stamp(path)
+    now = time.monotonic()
+
+    with _version_lock:
+        cached = _version_cache.get(path)
+        if (
+            cached is not None
+            and stamp is not None
+            and stamp == cached["stamp"]
+            and now - cached["checked_at"] < VERSION_RECHECK_SECONDS
+        ):
+            return cached["version"]
+
+    version = db.session.execute(select(func.max(ItemChange.id))).scalar() or 0
+
+    with _version_lock:
+        _version_cache[path] = {"stamp": stamp, "version": version, "checked_at": now}
+    return version
+
+
+def changes_since(version):
+    """
+    version 이후에 바뀐 물품 목록
+    반환: {("lost" | "found", item_id), ...}
+    """
+    rows = db.session.execute(
+        select(ItemChange.item_type, ItemChange.item_id)
+        .where(ItemChange.id > version)
+        .distinct()
+    )
+    return {(t, i) for t, i in rows}
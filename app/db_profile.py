@@ -0,0 +1,128 @@
+# =====================================================
+# ⚙ db_profile.py — DB 연결 프로필 (SQLite 운영 설정 / PostgreSQL)
+# =====================================================
+#
+# DATABASE_URL  : 없으면 app/lostfound.db (SQLite). postgres://... 로 교체 가능
+# DB_PROFILE    : production (기본) — WAL + PRAGMA 튜닝
+#                 default            — SQLite 기본값 그대로 (비교/디버깅용)
+# DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_BUSY_TIMEOUT_MS
+#
+# gunicorn 워커 여러 개가 같은 SQLite 파일을 쓸 때
+#   - WAL: 읽기와 쓰기가 서로 막지 않음
+#   - synchronous=NORMAL: WAL 에서는 안전하면서 커밋마다 fsync 하지 않음
+#   - busy_timeout: 잠겨 있으면 바로 "database is locked" 대신 기다림
+
+import os
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+PROFILES = ("production", "default")
+
+# production 프로필에서 연결마다 실행하는 PRAGMA
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,     # 256MB
+    "cache_size": -64 * 1024,           # 음수 = KiB 단위 → 64MB
+    "temp_store": "MEMORY",
+}
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def database_uri(app):
+    """DATABASE_URL 환경 변수 또는 기본 SQLite 파일"""
+    uri = os.getenv("DATABASE_URL")
+    if not uri:
+        return "sqlite:///" + os.path.join(app.root_path, "lostfound.db")
+    # Heroku 등에서 쓰는 postgres:// 표기 보정
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def is_sqlite_file(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def engine_options(uri, profile):
+    """SQLALCHEMY_ENGINE_OPTIONS"""
+    url = make_url(uri)
+
+    if url.get_backend_name() == "sqlite":
+        if not is_sqlite_file(uri):
+            return {}
+        options = {
+            # 워커 하나(동기)당 연결은 1~2개면 충분, 스레드 워커를 위해 여유를 둠
+            "pool_size": _env_int("DB_POOL_SIZE", 5),
+            "max_overflow": _env_int("DB_MAX_OVERFLOW", 5),
+            "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10),
+        }
+        if profile == "production":
+            # sqlite3 의 timeout(초) = busy_timeout
+            options["connect_args"] = {
+                "timeout": _env_int("DB_BUSY_TIMEOUT_MS", 5000) / 1000,
+            }
+        return options
+
+    # PostgreSQL 등 서버형 DB
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10),
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+
+
+def configure(app):
+    """
+    app.config 에 DB 설정 채우기 (test_config 로 이미 지정된 값은 유지)
+    db.init_app() 전에 호출합니다.
+    """
+    app.config.setdefault("DB_PROFILE", os.getenv("DB_PROFILE", "production"))
+    if app.config["DB_PROFILE"] not in PROFILES:
+        raise ValueError(f"알 수 없는 DB_PROFILE: {app.config['DB_PROFILE']}")
+
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_uri(app))
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        engine_options(app.config["SQLALCHEMY_DATABASE_URI"], app.config["DB_PROFILE"]),
+    )
+
+
+def install(app, engine):
+    """
+    production 프로필 + SQLite 파일이면 새 연결마다 PRAGMA 실행
+    db.init_app() 직후, 아직 연결이 만들어지기 전에 호출합니다.
+    """
+    # gunicorn preload_app: 마스터에서 연 연결을 워커가 같이 쓰지 않도록
+    # fork 직후 자식에서 풀을 비움 (close=False — 부모 연결은 닫지 않음)
+    engine_ref = weakref.ref(engine)
+
+    def _dispose_after_fork():
+        engine = engine_ref()
+        if engine is not None:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+    if app.config["DB_PROFILE"] != "production":
+        return
+    if not is_sqlite_file(app.config["SQLALCHEMY_DATABASE_URI"]):
+        return
+
+    busy_ms = _env_int("DB_BUSY_TIMEOUT_MS", 5000)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {busy_ms}")
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
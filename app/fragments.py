@@ -0,0 +1,127 @@
+# =====================================================
+# 🧩 fragments.py — 렌더링한 HTML 조각 캐시 / 페이지 ETag
+# =====================================================
+#
+# 여러 사용자가 똑같이 보는 부분만 HTML 문자열로 캐시합니다.
+#   - 최근 등록 물품 카드, 통계 그래프 데이터  → 데이터 버전 기준
+#   - CATEGORIES / LOCATIONS <option> 목록     → 상수라서 버전 없음
+# 적중하면 조각을 만드는 SQL 도 실행하지 않습니다. (context 함수를 안 부름)
+# 사용자 이름 / flash 메시지처럼 사람마다 다른 부분(base.html)은
+# 캐시하지 않고 매번 렌더링합니다.
+#
+# 페이지 전체에는 @conditional_page 로 약한 ETag 를 붙입니다.
+# ETag = (데이터 버전, 사용자, URL, 템플릿 버전, 추가 값) 해시이므로
+# 렌더링 전에 계산할 수 있고, If-None-Match 가 같으면 바로 304 를 보냅니다.
+
+import hashlib
+import os
+from functools import wraps
+
+from flask import current_app, g, make_response, render_template, request, session
+from markupsafe import Markup
+
+from app import changelog
+from app.cache import fragment_cache
+
+STATIC = "static"       # 데이터와 상관없는 조각의 버전
+
+
+def enabled():
+    return bool(current_app.config.get("PAGE_CACHE_ENABLED", True))
+
+
+def render(key, template, context, version=None):
+    """
+    template 을 context() 결과로 렌더링한 HTML (Markup)
+    같은 key / 데이터 버전이면 캐시된 문자열을 반환 (context 는 호출 안 함)
+    """
+    if not enabled():
+        return Markup(render_template(template, **context()))
+
+    rendered = []
+
+    def load():
+        rendered.append(render_template(template, **context()))
+        # 변환 중인 이미지가 있으면 원본 <img> 가 굳지 않도록 저장 안 함
+        return None if g.get("_images_pending") else rendered[0]
+
+    html = fragment_cache.get_or_set(
+        key, load, version=version,
+        ttl=current_app.config.get("FRAGMENT_CACHE_TTL", 300),
+    )
+    return Markup(rendered[0] if html is None else html)
+
+
+def select_options(name, values, selected=""):
+    """<option> 목록 조각 (선택값이 목록에 없으면 선택 없음)"""
+    selected = selected if selected in values else ""
+    return render(
+        ("options", name, selected),
+        "_options.html",
+        lambda: {"values": values, "selected": selected},
+        version=STATIC,
+    )
+
+
+# =====================================================
+# 🔹 페이지 ETag / 304
+# =====================================================
+_template_versions = {}
+
+
+def template_version():
+    """
+    템플릿 파일 mtime 최댓값 — 배포로 템플릿이 바뀌면 ETag 도 바뀜
+    (워커끼리 같은 값이라 어느 워커가 받아도 304 가능)
+    """
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    version = _template_versions.get(folder)
+    if version is None:
+        version = max(
+            (os.stat(os.path.join(folder, name)).st_mtime_ns for name in os.listdir(folder)),
+            default=0,
+        )
+        _template_versions[folder] = version
+    return version
+
+
+def page_etag(*extra):
+    raw = "|".join(str(part) for part in (
+        changelog.data_version(),
+        session.get("user_id"),
+        session.get("username"),
+        request.full_path,
+        template_version(),
+        *extra,
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional_page(extra=None):
+    """
+    @conditional_page() / @conditional_page(lambda: [...])
+    extra() 는 데이터 버전 말고 페이지에 영향을 주는 값 (예: 매칭 수)
+    flash 메시지가 남아 있거나 변환 중인 이미지를 그린 응답에는 ETag 를 붙이지 않음
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not enabled() or request.method != "GET" or "_flashes" in session:
+                return view(*args, **kwargs)
+
+            etag = page_etag(*(extra() if extra else ()))
+            if request.if_none_match.contains_weak(etag):
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200 or g.get("_images_pending"):
+                    return resp
+
+            resp.set_etag(etag, weak=True)
+            # 사용자마다 다르므로 공유 캐시 금지, 매번 재검증
+            resp.cache_control.private = True
+            resp.cache_control.no_cache = True
+            resp.vary.add("Cookie")
+            return resp
+        return wrapper
+    return decorator
@@ -0,0 +1,222 @@
+# =====================================================
+# 🖼 images.py — 업로드 이미지 후처리 (리사이즈 / 썸네일 / WebP)
+# =====================================================
+#
+# 업로드 원본은 그대로 저장한 뒤, 요청 스레드가 아닌 작업 풀에서
+#   1) EXIF 회전 적용 후 EXIF 제거 (위치 정보 등)
+#   2) 본 이미지: 긴 변 IMAGE_MAX_SIZE 이하로 줄여 확장자에 맞는 형식으로 덮어쓰기
+#      (MPO·TIFF 등 메타데이터를 담는 형식도 모두 다시 저장, GIF 만 원본 유지)
+#   3) 썸네일:   <이름>_thumb.<확장자> (긴 변 IMAGE_THUMB_SIZE, GIF 는 _thumb.jpg)
+#   4) WebP:     <이름>.webp, <이름>_thumb.webp
+#   5) 변환 결과(경로/너비)를 <이름>.variants.json 에 기록
+# 을 수행합니다. 템플릿은 image_variants() 로 srcset 을 만듭니다.
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g, has_request_context
+
+log = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_variants_cache = OrderedDict()       # URL → image_variants 결과 (LRU)
+_variants_lock = threading.Lock()
+VARIANTS_CACHE_SIZE = 4096
+
+# 저장 확장자 → Pillow 저장 형식 (storage.py 는 이 밖의 확장자를 .jpg 로 저장)
+SAVE_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP", ".gif": "GIF"}
+# 썸네일은 GIF 대신 JPEG
+THUMB_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# 업로드 후 이 시간(초) 안에 변환 전 이미지를 그리면 "변환 중" 으로 표시
+# (g._images_pending → fragments.py 가 조각 캐시 / 페이지 ETag 를 건너뜀)
+PENDING_SECONDS = 120
+
+
+def _pool(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image")
+    return _executor
+
+
+def stored_extension(ext):
+    """업로드 확장자 → 저장할 확장자 (변환할 수 없는 확장자는 .jpg 로 다시 저장)"""
+    ext = ext.lower()
+    return ext if ext in SAVE_FORMATS else ".jpg"
+
+
+def variant_paths(path):
+    """원본 경로 → 파생 파일 경로들"""
+    stem, ext = os.path.splitext(path)
+    thumb_ext = ext if ext.lower() in THUMB_EXTENSIONS else ".jpg"
+    return {
+        "thumb": f"{stem}_thumb{thumb_ext}",
+        "webp": f"{stem}.webp",
+        "thumb_webp": f"{stem}_thumb.webp",
+        "sidecar": f"{stem}.variants.json",
+    }
+
+
+def _save_atomic(img, path, **params):
+    """같은 경로를 읽는 요청이 반쯤 쓴 파일을 보지 않도록 임시 파일 후 교체"""
+    tmp = f"{path}.tmp"
+    img.save(tmp, **params)
+    os.replace(tmp, path)
+
+
+def _save_as(img, path, quality):
+    """확장자에 맞는 형식으로 저장 (EXIF 를 넘기지 않으므로 메타데이터 제거됨)"""
+    fmt = SAVE_FORMATS.get(os.path.splitext(path)[1].lower(), "JPEG")
+    if fmt == "JPEG":
+        _save_atomic(img.convert("RGB"), path, format="JPEG", quality=quality,
+                     optimize=True, progressive=True)
+    elif fmt == "PNG":
+        _save_atomic(img, path, format="PNG", optimize=True)
+    elif fmt == "WEBP":
+        _save_atomic(img, path, format="WEBP", quality=quality)
+    else:
+        _save_atomic(img, path, format=fmt)
+
+
+def process_image(path, max_size=1600, thumb_size=400, quality=85):
+    """
+    업로드 파일 하나를 변환합니다. (작업 풀에서 실행)
+    이미지가 아니면 아무것도 하지 않고 None 을 반환합니다.
+    """
+    # Pillow 는 실제로 변환할 때만 import
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as src:
+            fmt = src.format
+            img = ImageOps.exif_transpose(src)
+            img.load()
+    except (UnidentifiedImageError, OSError) as e:
+        log.warning("이미지 변환 건너뜀 %s: %s", path, e)
+        return None
+
+    # GIF 는 EXIF 가 없으므로 본 파일은 그대로 (애니메이션 유지), 파생본만 첫 프레임으로
+    # 그 외 (MPO 등 휴대폰 사진, TIFF, 확장자와 내용이 다른 파일) 는 모두 다시 저장
+    keep_original = fmt == "GIF" and path.lower().endswith(".gif")
+
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "P") else "RGB")
+
+    paths = variant_paths(path)
+
+    main = img.copy()
+    main.thumbnail((max_size, max_size))
+    thumb = img.copy()
+    thumb.thumbnail((thumb_size, thumb_size))
+
+    # 본 이미지 / 썸네일
+    if not keep_original:
+        _save_as(main, path, quality)
+    _save_as(thumb, paths["thumb"], quality)
+
+    _save_atomic(main, paths["webp"], format="WEBP", quality=quality, method=4)
+    _save_atomic(thumb, paths["thumb_webp"], format="WEBP", quality=quality, method=4)
+
+    variants = {
+        "main": {"file": os.path.basename(path), "webp": os.path.basename(paths["webp"]),
+                 "width": main.width},
+        "thumb": {"file": os.path.basename(paths["thumb"]),
+                  "webp": os.path.basename(paths["thumb_webp"]), "width": thumb.width},
+    }
+    tmp = paths["sidecar"] + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(variants, f)
+    os.replace(tmp, paths["sidecar"])
+    return variants
+
+
+def submit(path):
+    """작업 풀에 변환 예약 (app context 안에서 호출)"""
+    config = current_app.config
+    return _pool(config.get("IMAGE_WORKERS", 2)).submit(
+        process_image,
+        path,
+        config.get("IMAGE_MAX_SIZE", 1600),
+        config.get("IMAGE_THUMB_SIZE", 400),
+        config.get("IMAGE_QUALITY", 85),
+    )
+
+
+def wait():
+    """예약된 변환이 모두 끝날 때까지 대기 (CLI 처럼 곧 종료되는 프로세스용)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def url_to_path(url):
+    """'/static/uploads/a.jpg' → 실제 파일 경로 (static 밖이면 None)"""
+    if not url or not url.startswith("/static/"):
+        return None
+    rel = url[len("/static/"):]
+    return os.path.join(current_app.static_folder, *rel.split("/"))
+
+
+def image_variants(url):
+    """
+    템플릿용: 변환이 끝난 이미지면
+      {"main": {"src", "webp", "width"}, "thumb": {"src", "webp", "width"}}
+    아직 변환 전이거나 이미지가 아니면 None
+    """
+    with _variants_lock:
+        if url in _variants_cache:
+            _variants_cache.move_to_end(url)
+            return _variants_cache[url]
+
+    path = url_to_path(url)
+    if not path:
+        return None
+    try:
+        with open(variant_paths(path)["sidecar"], encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        _mark_pending(path)
+        return None
+
+    base = url.rsplit("/", 1)[0]
+    result = {
+        size: {
+            "src": f"{base}/{data[size]['file']}",
+            "webp": f"{base}/{data[size]['webp']}",
+            "width": data[size]["width"],
+        }
+        for size in ("main", "thumb")
+    }
+    # 변환이 끝난 결과만 기억 (파일 이름이 같은 새 업로드는 forget() 으로 비움)
+    with _variants_lock:
+        _variants_cache[url] = result
+        while len(_variants_cache) > VARIANTS_CACHE_SIZE:
+            _variants_cache.popitem(last=False)
+    return result
+
+
+def _mark_pending(path):
+    """변환이 곧 끝날 원본이면 이번 요청 결과를 캐시하지 않도록 표시"""
+    if not has_request_context():
+        return
+    try:
+        recent = time.time() - os.path.getmtime(path) < PENDING_SECONDS
+    except OSError:
+        return
+    if recent:
+        g._images_pending = True
+
+
+def forget(url):
+    with _variants_lock:
+        _variants_cache.pop(url, None)
@@ -0,0 +1,227 @@
+# =====================================================
+# 🤖 llm.py — 공용 LLM(OpenAI 호환) 클라이언트
+# =====================================================
+#
+# 요청마다 OpenAI(...) 를 새로 만들지 않고 프로세스당 하나의 클라이언트
+# (HTTP 연결 풀 재사용)를 씁니다.
+#   - LLM_TIMEOUT / LLM_CONNECT_TIMEOUT : 응답/연결 타임아웃(초)
+#   - LLM_MAX_RETRIES                  : 타임아웃·연결 오류·429·5xx 재시도 횟수 (지수 백오프)
+#   - LLM_MAX_CONCURRENCY              : 프로세스당 동시 호출 수 상한
+#   - LLM_QUEUE_TIMEOUT                : 자리가 날 때까지 기다리는 최대 시간(초), 넘으면 LLMBusyError
+#   - OPENAI_BASE_URL                  : 로컬 가짜 서버(benchmarks/fake_llm.py) 등으로 교체
+#
+# 동시 호출 수를 제한하므로 느린 LLM 때문에 모든 워커가 묶이지 않고,
+# 남는 요청은 바로 실패해 일반 페이지를 계속 처리할 수 있습니다.
+#
+# stream_chat() 은 도착한 텍스트 조각을 바로 넘겨 주는 ChatStream 을 반환합니다.
+# close() 하면 (클라이언트가 끊기면) 업스트림 HTTP 응답을 닫아 생성을 중단시킵니다.
+# 블로킹 지점은 SDK 의 HTTP 소켓과 threading 뿐이라 gthread / gevent 워커
+# (gunicorn.conf.py) 에서 그대로 동작합니다.
+
+import random
+import threading
+import time
+
+from flask import current_app
+
+from app import metrics
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class LLMError(Exception):
+    """LLM 호출 실패 (재시도 후에도)"""
+
+
+class LLMBusyError(LLMError):
+    """동시 호출 수 상한에 걸려 기다리다 포기함"""
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+_semaphores = {}
+
+
+def _config(name, default):
+    return current_app.config.get(name, default)
+
+
+def available():
+    """API 키나 로컬 서버 주소가 설정되어 있는지"""
+    return bool(_config("OPENAI_API_KEY", None) or _config("OPENAI_BASE_URL", None))
+
+
+def get_client():
+    """설정별로 하나씩 만든 OpenAI 클라이언트 (연결 풀 공유)"""
+    key = (
+        _config("OPENAI_API_KEY", None),
+        _config("OPENAI_BASE_URL", None),
+        float(_config("LLM_TIMEOUT", 20)),
+        float(_config("LLM_CONNECT_TIMEOUT", 5)),
+    )
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # openai SDK 는 처음 사용할 때 import (앱 시작 시간 단축)
+            import openai
+
+            api_key, base_url, timeout, connect_timeout = key
+            # 클라이언트를 재사용하면 SDK 내부 HTTP 연결 풀(keep-alive)도 재사용됨
+            client = openai.OpenAI(
+                api_key=api_key or "not-needed",
+                base_url=base_url,
+                # 재시도는 chat() 에서 직접 처리
+                max_retries=0,
+                timeout=openai.Timeout(timeout, connect=connect_timeout),
+            )
+            _clients[key] = client
+    return client
+
+
+def _semaphore():
+    limit = int(_config("LLM_MAX_CONCURRENCY", 4))
+    with _clients_lock:
+        sem = _semaphores.get(limit)
+        if sem is None:
+            sem = _semaphores[limit] = threading.BoundedSemaphore(limit)
+    return sem
+
+
+def _is_retryable(exc):
+    import openai
+
+    return isinstance(exc, (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    ))
+
+
+def _backoff(attempt):
+    """0.5s, 1s, 2s ... (+ 지터), 최대 8초"""
+    base = float(_config("LLM_BACKOFF_BASE", 0.5))
+    return min(8.0, base * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+
+def _record_usage(model, resp):
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return
+    metrics.llm_tokens.inc(usage.prompt_tokens or 0, model=model, kind="prompt")
+    metrics.llm_tokens.inc(usage.completion_tokens or 0, model=model, kind="completion")
+
+
+def _acquire(model):
+    """동시 호출 자리 하나 (LLM_QUEUE_TIMEOUT 안에 못 얻으면 LLMBusyError)"""
+    sem = _semaphore()
+    if not sem.acquire(timeout=float(_config("LLM_QUEUE_TIMEOUT", 2))):
+        metrics.llm_requests.inc(model=model, outcome="busy")
+        raise LLMBusyError("AI 요청이 많습니다. 잠시 후 다시 시도해 주세요.")
+    return sem
+
+
+def _create(client, model, messages, **kwargs):
+    """chat.completions.create + 재시도 (지수 백오프), 실패 시 LLMError"""
+    retries = int(_config("LLM_MAX_RETRIES", 2))
+    for attempt in range(retries + 1):
+        try:
+            return client.chat.completions.create(model=model, messages=messages, **kwargs)
+        except Exception as e:
+            metrics.llm_errors.inc(model=model, error=type(e).__name__)
+            if attempt < retries and _is_retryable(e):
+                metrics.llm_retries.inc(model=model)
+                time.sleep(_backoff(attempt))
+                continue
+            metrics.llm_requests.inc(model=model, outcome="error")
+            raise LLMError(str(e)) from e
+
+
+def chat(messages, model=None, **kwargs):
+    """
+    chat.completions 호출 후 응답 텍스트 반환
+    실패 시 LLMError, 동시 호출 상한 초과 시 LLMBusyError
+    """
+    model = model or _config("LLM_MODEL", DEFAULT_MODEL)
+    sem = _acquire(model)
+    started = time.perf_counter()
+    try:
+        resp = _create(get_client(), model, messages, **kwargs)
+        _record_usage(model, resp)
+        metrics.llm_requests.inc(model=model, outcome="ok")
+        return resp.choices[0].message.content or ""
+    finally:
+        metrics.llm_duration.observe(time.perf_counter() - started, model=model)
+        sem.release()
+
+
+# =====================================================
+# 🔹 스트리밍
+# =====================================================
+class ChatStream:
+    """
+    stream_chat() 결과 — 반복하면 도착한 텍스트 조각을 차례로 돌려줌
+    close() 는 업스트림 응답을 닫고 (생성 중단) 동시 호출 자리를 돌려줌
+    다 읽었거나 중간에 끊겼거나 상관없이 한 번만 처리되므로 여러 번 불러도 됨
+    """
+
+    def __init__(self, model, upstream, sem, started):
+        self.model = model
+        self.finished = False
+        self._upstream = upstream
+        self._sem = sem
+        self._started = started
+        self._outcome = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        try:
+            for chunk in self._upstream:
+                _record_usage(self.model, chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            self.finished = True
+        except Exception as e:
+            if self._closed:
+                return                      # close() 로 끊은 것
+            metrics.llm_errors.inc(model=self.model, error=type(e).__name__)
+            self._outcome = "error"
+            raise LLMError(str(e)) from e
+        finally:
+            self.close()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._upstream.close()
+        finally:
+            outcome = "ok" if self.finished else (self._outcome or "cancelled")
+            metrics.llm_requests.inc(model=self.model, outcome=outcome)
+            metrics.llm_duration.observe(time.perf_counter() - self._started, model=self.model)
+            self._sem.release()
+
+
+def stream_chat(messages, model=None, **kwargs):
+    """
+    chat.completions 스트리밍 호출 → ChatStream (요청 컨텍스트 밖에서 반복해도 됨)
+    응답이 시작되기 전 실패만 재시도 (이미 보낸 조각은 되돌릴 수 없으므로)
+    실패 시 LLMError, 동시 호출 상한 초과 시 LLMBusyError
+    """
+    model = model or _config("LLM_MODEL", DEFAULT_MODEL)
+    sem = _acquire(model)
+    started = time.perf_counter()
+    try:
+        upstream = _create(get_client(), model, messages, stream=True, **kwargs)
+    except BaseException:
+        metrics.llm_duration.observe(time.perf_counter() - started, model=model)
+        sem.release()
+        raise
+    return ChatStream(model, upstream, sem, started)
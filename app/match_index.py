@@ -0,0 +1,267 @@
+# =====================================================
+# 🧠 match_index.py — 로컬 벡터 유사도 매칭 엔진
+# =====================================================
+#
+# 물품마다 문자 n-gram TF-IDF 벡터를 미리 계산해 NumPy 행렬에 저장하고,
+# 사용자 설명과의 코사인 유사도로 top-k 후보를 찾습니다.
+# LLM 은 이 후보들만 다시 정렬하므로 프롬프트 크기가 테이블 크기와 무관합니다.
+# NumPy 는 처음 벡터를 만들 때 import 합니다. (앱 시작 / 워커 부팅 시간 단축)
+
+import threading
+import unicodedata
+import zlib
+
+from app import db
+from app import changelog
+from app.models import Item
+
+# 해시 차원 수 (n-gram → 열 번호)
+DEFAULT_DIM = 2048
+
+# 사용할 문자 n-gram 길이
+NGRAM_SIZES = (2, 3)
+
+# 물품 벡터 계산에 필요한 컬럼만 조회 (ORM 객체 생성 X)
+ITEM_COLUMNS = ("id", "type", "name", "category", "place", "date", "description")
+
+
+def normalize_text(text):
+    """유니코드 정규화 + 소문자 + 공백 정리"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return " ".join(text.split())
+
+
+def item_feature_text(item):
+    """벡터화에 사용할 물품 텍스트 (필드 값만, 라벨 제외)"""
+    return " ".join(
+        str(v) for v in (
+            item.name, item.category, item.place, item.description
+        ) if v
+    )
+
+
+class MatchIndex:
+    """
+    해시 기반 문자 n-gram TF-IDF 인덱스
+      - _matrix[row]  : 물품의 (sublinear) TF 벡터
+      - _df           : 열별 문서 빈도 → IDF 계산
+      - _keys[row]    : ("lost" | "found", id)
+    """
+
+    def __init__(self, dim=DEFAULT_DIM):
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        # 행렬은 첫 upsert 때 만듦 (_grow)
+        self._matrix = None
+        self._df = None
+        self._keys = []
+        self._meta = []
+        self._rows = {}
+        self._norms = None
+        self.built = False
+        # 인덱스에 반영된 마지막 데이터 버전 (item_change.id)
+        self.version = 0
+
+    # -------------------------------------------------
+    # 벡터화
+    # -------------------------------------------------
+    def vectorize(self, text):
+        import numpy as np
+
+        text = normalize_text(text)
+        vec = np.zeros(self.dim, dtype=np.float32)
+        if not text:
+            return vec
+
+        padded = f" {text} "
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    vec[zlib.crc32(gram.encode("utf-8")) % self.dim] += 1
+
+        # sublinear TF: 1 + log(tf)
+        nz = vec > 0
+        vec[nz] = 1.0 + np.log(vec[nz])
+        return vec
+
+    def _idf(self):
+        import numpy as np
+
+        n = len(self._keys)
+        return np.log((1.0 + n) / (1.0 + self._df)).astype(np.float32) + 1.0
+
+    # -------------------------------------------------
+    # 구축 / 갱신
+    # -------------------------------------------------
+    def build(self):
+        """DB 전체를 읽어 인덱스를 새로 만듭니다. (app context 필요)"""
+        with self._lock:
+            self._reset()
+            # 읽는 도중 바뀐 행은 다음 sync 에서 다시 반영됨
+            self.version = changelog.data_version()
+            for row in self._query().yield_per(1000):
+                self.upsert(row.type, row)
+            self.built = True
+
+    @staticmethod
+    def _query():
+        return db.session.query(*[getattr(Item, c) for c in ITEM_COLUMNS])
+
+    def sync(self):
+        """
+        다른 프로세스가 바꾼 행만 다시 읽어 반영합니다.
+        데이터 버전이 그대로면 DB 를 조회하지 않습니다.
+        """
+        version = changelog.data_version()
+        with self._lock:
+            if version <= self.version:
+                return
+            changed = changelog.changes_since(self.version)
+
+            # ("*", 0) 같은 표시용 기록은 건너뜀
+            keys = sorted(k for k in changed if k[0] in ("lost", "found"))
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                found = set()
+                for row in self._query().filter(Item.id.in_([i for _, i in chunk])):
+                    self.upsert(row.type, row)
+                    found.add((row.type, row.id))
+                for tag, item_id in set(chunk) - found:
+                    self.remove(tag, item_id)
+
+            self.version = version
+
+    def ensure_fresh(self):
+        """처음이면 전체 구축, 이후에는 변경분만 동기화"""
+        if not self.built:
+            self.build()
+        else:
+            self.sync()
+        return self
+
+    def apply_changes(self, changes):
+        """같은 프로세스에서 커밋된 변경분을 즉시 반영"""
+        if not self.built:
+            return
+        for c in changes:
+            if c.op == "delete":
+                self.remove(c.item_type, c.item_id)
+            else:
+                self.upsert(c.item_type, c.item)
+
+    def upsert(self, tag, item):
+        """물품 하나를 추가하거나 벡터를 교체합니다."""
+        vec = self.vectorize(item_feature_text(item))
+        key = (tag, item.id)
+        meta = {
+            "type": tag,
+            "id": item.id,
+            "name": item.name,
+            "category": item.category,
+            "place": item.place,
+            "date": item.date.isoformat() if item.date else None,
+            "description": (item.description or "")[:200],
+        }
+
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                if self._matrix is None or row >= self._matrix.shape[0]:
+                    self._grow()
+                self._keys.append(key)
+                self._meta.append(meta)
+                self._rows[key] = row
+            else:
+                self._df -= self._matrix[row] > 0
+                self._meta[row] = meta
+
+            self._matrix[row] = vec
+            self._df += vec > 0
+            self._norms = None
+
+    def remove(self, tag, item_id):
+        """물품을 인덱스에서 제거합니다. (마지막 행을 빈자리로 이동)"""
+        key = (tag, item_id)
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+
+            self._df -= self._matrix[row] > 0
+            last = len(self._keys) - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._keys[row] = self._keys[last]
+                self._meta[row] = self._meta[last]
+                self._rows[self._keys[row]] = row
+
+            self._matrix[last] = 0
+            self._keys.pop()
+            self._meta.pop()
+            self._norms = None
+
+    def _grow(self):
+        import numpy as np
+
+        if self._matrix is None:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            self._df = np.zeros(self.dim, dtype=np.int64)
+        capacity = max(64, self._matrix.shape[0] * 2)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:self._matrix.shape[0]] = self._matrix
+        self._matrix = grown
+
+    def __len__(self):
+        return len(self._keys)
+
+    # -------------------------------------------------
+    # 검색
+    # -------------------------------------------------
+    def search(self, text, k=10):
+        """
+        코사인 유사도 top-k
+        반환: [{"type", "id", "name", "category", "place", "date", "description", "score"}, ...]
+        """
+        import numpy as np
+
+        query = self.vectorize(text)
+
+        with self._lock:
+            n = len(self._keys)
+            if n == 0 or not query.any():
+                return []
+
+            idf = self._idf()
+            matrix = self._matrix[:n]
+
+            # 문서 쪽 TF-IDF 노름은 데이터가 바뀔 때만 다시 계산
+            if self._norms is None:
+                self._norms = np.sqrt((matrix * matrix) @ (idf * idf))
+
+            q = query * idf
+            q_norm = float(np.linalg.norm(q))
+            scores = (matrix @ (q * idf)) / (self._norms * q_norm + 1e-9)
+
+            k = min(k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for row in top:
+                score = float(scores[row])
+                if score <= 0:
+                    break
+                results.append(dict(self._meta[row], score=round(score, 4)))
+            return results
+
+
+# 프로세스 공용 인덱스 (처음 검색할 때 구축)
+match_index = MatchIndex()
+
+# 이 프로세스에서 커밋된 물품 변경은 바로 인덱스에 반영
+changelog.subscribe(match_index.apply_changes)
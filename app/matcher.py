@@ -0,0 +1,390 @@
+# =====================================================
+# 🔗 matcher.py — 분실물 ↔ 습득물 자동 매칭
+# =====================================================
+#
+# 물품이 등록/수정되면 (커밋 후, 작업 스레드에서) 반대 종류의 물품 중
+# 같은 "블록" 에 있는 것만 골라 점수를 매기고 item_match 테이블에 저장합니다.
+#   - 블록: 카테고리가 같음 (카테고리가 없으면 장소가 같음)
+#   - 날짜: 기준 날짜(date, 없으면 등록일) 가 ±MATCH_DATE_WINDOW 일 이내
+# 모든 쌍을 비교하지 않으므로 물품 수가 늘어도 비교 횟수는 블록 크기에 비례합니다.
+#
+# 점수 = 0.55 × 이름/설명 문자 n-gram 코사인 유사도 (match_index 와 같은 벡터)
+#      + 0.15 × 카테고리 일치 + 0.15 × 장소 일치 + 0.15 × 날짜 근접도
+# MATCH_MIN_SCORE 이상인 것 중 물품당 상위 MATCH_TOP_K 개만 저장합니다.
+#
+# 기존 데이터는 `flask matches backfill` — 블록별로 분실물을 날짜순으로
+# batch 개씩 읽고, 그 날짜 범위 ± 창 안의 습득물만 불러와 비교하므로
+# 메모리 사용량이 전체 물품 수와 무관합니다.
+
+import logging
+import threading
+import time as _time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import AppGroup
+from sqlalchemy import and_, event, func, or_
+
+from app import db, changelog
+from app.cache import stats_cache
+from app.match_index import match_index
+from app.models import Item, LostItem, FoundItem, ITEM_CLASSES, Match
+
+log = logging.getLogger(__name__)
+
+WEIGHT_TEXT = 0.55
+WEIGHT_CATEGORY = 0.15
+WEIGHT_PLACE = 0.15
+WEIGHT_DATE = 0.15
+
+MATCH_COLUMNS = ("id", "type", "name", "category", "place", "date", "description", "created_at")
+
+OPPOSITE = {"lost": "found", "found": "lost"}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _config(name, default):
+    return current_app.config.get(name, default)
+
+
+# =====================================================
+# 🔹 블록 / 날짜 창
+# =====================================================
+def _empty(column):
+    return or_(column.is_(None), column == "")
+
+
+def block_clause(Model, category, place):
+    """category / place 가 같은 블록의 조건"""
+    if category:
+        return Model.category == category
+    if place:
+        return and_(_empty(Model.category), Model.place == place)
+    return and_(_empty(Model.category), _empty(Model.place))
+
+
+def effective_date(row):
+    """매칭 기준 날짜: 분실/습득 날짜, 없으면 등록일"""
+    if row.date:
+        return row.date
+    if row.created_at:
+        return row.created_at.date()
+    return date.today()
+
+
+def date_window_clause(Model, start, end):
+    """기준 날짜가 [start, end] 인 행 (date 가 없으면 created_at 으로)"""
+    return or_(
+        Model.date.between(start, end),
+        and_(
+            Model.date.is_(None),
+            Model.created_at >= datetime.combine(start, time.min),
+            Model.created_at < datetime.combine(end + timedelta(days=1), time.min),
+        ),
+    )
+
+
+def _columns(Model):
+    return [getattr(Model, c) for c in MATCH_COLUMNS]
+
+
+# =====================================================
+# 🔹 점수
+# =====================================================
+def _vectors(rows):
+    """이름 + 설명 벡터 (행마다 L2 정규화)"""
+    import numpy as np      # 처음 매칭할 때 import (앱 시작 시간 단축)
+
+    if not rows:
+        return np.zeros((0, match_index.dim), dtype=np.float32)
+    mat = np.stack([
+        match_index.vectorize(" ".join(v for v in (r.name, r.description) if v))
+        for r in rows
+    ])
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def _equal(a, b):
+    """두 값 목록의 쌍별 일치 여부 (빈 값은 불일치)"""
+    import numpy as np
+
+    a = np.array([v or None for v in a], dtype=object)
+    b = np.array([v or None for v in b], dtype=object)
+    return (a[:, None] == b[None, :]) & (a[:, None] != None)  # noqa: E711
+
+
+def score_pairs(sources, targets, window):
+    """sources × targets 점수 행렬 (날짜 창 밖은 0)"""
+    import numpy as np
+
+    text = _vectors(sources) @ _vectors(targets).T
+
+    sd = np.array([effective_date(r).toordinal() for r in sources])
+    td = np.array([effective_date(r).toordinal() for r in targets])
+    gap = np.abs(sd[:, None] - td[None, :])
+
+    scores = (
+        WEIGHT_TEXT * text
+        + WEIGHT_CATEGORY * _equal([r.category for r in sources], [r.category for r in targets])
+        + WEIGHT_PLACE * _equal([r.place for r in sources], [r.place for r in targets])
+        + WEIGHT_DATE * np.clip(1.0 - gap / (window + 1.0), 0.0, 1.0)
+    )
+    scores[gap > window] = 0.0
+    return scores
+
+
+def best_pairs(sources, targets, window, top_k, min_score):
+    """
+    source 마다 점수 상위 top_k 개 (min_score 이상)
+    반환: [{"lost_id", "found_id", "score"}, ...]
+    """
+    import numpy as np
+
+    if not sources or not targets:
+        return []
+
+    scores = score_pairs(sources, targets, window)
+    k = min(top_k, len(targets))
+    pairs = []
+    for i, src in enumerate(sources):
+        row = scores[i]
+        top = np.argpartition(-row, k - 1)[:k] if k < len(targets) else np.arange(len(targets))
+        for j in top:
+            if row[j] < min_score:
+                continue
+            tgt = targets[j]
+            lost, found = (src, tgt) if src.type == "lost" else (tgt, src)
+            pairs.append({"lost_id": lost.id, "found_id": found.id,
+                          "score": round(float(row[j]), 4)})
+    return pairs
+
+
+# =====================================================
+# 🔹 물품 하나 매칭 (등록/수정 후)
+# =====================================================
+def candidates(row, window, limit):
+    """row 와 같은 블록 · 날짜 창 안의 반대 종류 물품"""
+    Model = ITEM_CLASSES[OPPOSITE[row.type]]
+    day = effective_date(row)
+    return (
+        db.session.query(*_columns(Model))
+        .filter(
+            block_clause(Model, row.category, row.place),
+            date_window_clause(Model, day - timedelta(days=window), day + timedelta(days=window)),
+        )
+        .order_by(Model.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _delete_pairs_of(connection, item_id):
+    table = Match.__table__
+    connection.execute(
+        table.delete().where(or_(table.c.lost_id == item_id, table.c.found_id == item_id))
+    )
+
+
+def match_item(item_id):
+    """물품 하나의 매칭을 다시 계산 (커밋은 호출한 쪽에서), 저장한 쌍 수 반환"""
+    row = db.session.query(*_columns(Item)).filter(Item.id == item_id).first()
+    _delete_pairs_of(db.session.connection(), item_id)
+    if row is None or row.type not in OPPOSITE:
+        return 0
+
+    window = int(_config("MATCH_DATE_WINDOW", 14))
+    pairs = best_pairs(
+        [row],
+        candidates(row, window, int(_config("MATCH_MAX_CANDIDATES", 300))),
+        window,
+        int(_config("MATCH_TOP_K", 5)),
+        float(_config("MATCH_MIN_SCORE", 0.5)),
+    )
+    if pairs:
+        db.session.execute(Match.__table__.insert(), pairs)
+    return len(pairs)
+
+
+def match_items(item_ids):
+    """여러 물품을 매칭하고 커밋"""
+    total = sum(match_item(i) for i in item_ids)
+    db.session.commit()
+    stats_cache.clear()
+    return total
+
+
+def _run(app, item_ids):
+    with app.app_context():
+        try:
+            match_items(item_ids)
+        except Exception:
+            db.session.rollback()
+            log.exception("자동 매칭 실패: %s", item_ids)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # 한 스레드에서 순서대로 → 매칭 쓰기끼리 경합하지 않음
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="matcher")
+    return _executor
+
+
+@changelog.subscribe
+def _on_commit(changes):
+    """커밋된 물품 추가/수정 → 작업 스레드에서 매칭 (요청은 기다리지 않음)"""
+    if not has_app_context() or not _config("MATCH_ENABLED", True):
+        return
+    ids = sorted({c.item_id for c in changes if c.op != "delete"})
+    if ids:
+        return _pool().submit(_run, current_app._get_current_object(), ids)
+
+
+def _after_delete(mapper, connection, target):
+    # 물품 삭제와 같은 트랜잭션에서 그 물품의 매칭도 삭제
+    _delete_pairs_of(connection, target.id)
+
+
+for _Model in (LostItem, FoundItem):
+    event.listen(_Model, "after_delete", _after_delete)
+
+
+# =====================================================
+# 🔹 조회 (상세 페이지 / 통계)
+# =====================================================
+def matches_for(item, limit=5):
+    """item 과 매칭된 반대 종류 물품: [(Item, score), ...] 점수 높은 순"""
+    if item.type == "lost":
+        mine, other = Match.lost_id, Match.found_id
+    else:
+        mine, other = Match.found_id, Match.lost_id
+    return (
+        db.session.query(Item, Match.score)
+        .join(Match, Item.id == other)
+        .filter(mine == item.id)
+        .order_by(Match.score.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def matched_count():
+    """매칭 후보가 하나 이상 있는 분실물 수"""
+    return stats_cache.get_or_set(
+        "matched_count",
+        lambda: db.session.query(func.count(func.distinct(Match.lost_id))).scalar() or 0,
+        ttl=_config("STATS_CACHE_TTL", 60),
+    )
+
+
+# =====================================================
+# 🔹 전체 다시 계산 (backfill)
+# =====================================================
+def _blocks():
+    """분실물이 있는 블록들의 (category, place)"""
+    for (category,) in (
+        db.session.query(LostItem.category)
+        .filter(LostItem.category.isnot(None), LostItem.category != "")
+        .distinct()
+    ):
+        yield category, None
+    for (place,) in (
+        db.session.query(LostItem.place)
+        .filter(_empty(LostItem.category), LostItem.place.isnot(None), LostItem.place != "")
+        .distinct()
+    ):
+        yield None, place
+    yield None, None
+
+
+def block_of(category, place):
+    """물품 하나가 속한 블록 (block_clause 와 같은 규칙)"""
+    if category:
+        return category, None
+    if place:
+        return None, place
+    return None, None
+
+
+def backfill(batch=1000, reset=False, progress=None, blocks=None, start=None, end=None):
+    """
+    모든 분실물을 블록 · 날짜순으로 batch 개씩 매칭
+    한 번에 메모리에 올라가는 것은 분실물 batch 개 + 그 날짜 범위의 습득물뿐
+    blocks / start / end 를 주면 그 블록, 그 기준 날짜 범위의 분실물만 다시 계산
+    (대량 가져오기 후 영향받은 부분만 갱신)
+    반환: {"lost", "pairs", "seconds"}
+    """
+    window = int(_config("MATCH_DATE_WINDOW", 14))
+    top_k = int(_config("MATCH_TOP_K", 5))
+    min_score = float(_config("MATCH_MIN_SCORE", 0.5))
+    started = _time.perf_counter()
+    totals = {"lost": 0, "pairs": 0}
+
+    if reset:
+        db.session.execute(Match.__table__.delete())
+        db.session.commit()
+
+    day = func.coalesce(LostItem.date, func.date(LostItem.created_at))
+
+    for category, place in list(_blocks() if blocks is None else blocks):
+        after = None
+        while True:
+            query = db.session.query(*_columns(LostItem), day.label("day")).filter(
+                block_clause(LostItem, category, place)
+            )
+            if start is not None:
+                query = query.filter(day >= start)
+            if end is not None:
+                query = query.filter(day <= end)
+            if after is not None:
+                query = query.filter(or_(day > after[0], and_(day == after[0], LostItem.id > after[1])))
+            lost = query.order_by(day, LostItem.id).limit(batch).all()
+            if not lost:
+                break
+            after = (lost[-1].day, lost[-1].id)
+
+            # 이 배치의 습득물 날짜 범위 (start / end 인자와 별개)
+            found_start = effective_date(lost[0]) - timedelta(days=window)
+            found_end = effective_date(lost[-1]) + timedelta(days=window)
+            found = (
+                db.session.query(*_columns(FoundItem))
+                .filter(block_clause(FoundItem, category, place),
+                        date_window_clause(FoundItem, found_start, found_end))
+                .all()
+            )
+
+            pairs = best_pairs(lost, found, window, top_k, min_score)
+            if not reset:
+                table = Match.__table__
+                db.session.execute(table.delete().where(table.c.lost_id.in_([r.id for r in lost])))
+            if pairs:
+                db.session.execute(Match.__table__.insert(), pairs)
+            db.session.commit()
+
+            totals["lost"] += len(lost)
+            totals["pairs"] += len(pairs)
+            if progress:
+                progress(totals)
+
+    stats_cache.clear()
+    totals["seconds"] = round(_time.perf_counter() - started, 2)
+    return totals
+
+
+matches_cli = AppGroup("matches", help="분실물 ↔ 습득물 자동 매칭")
+
+
+@matches_cli.command("backfill")
+@click.option("--batch", default=1000, show_default=True, help="한 번에 처리할 분실물 수")
+@click.option("--reset", is_flag=True, help="기존 매칭 결과를 모두 지우고 다시 계산")
+def backfill_command(batch, reset):
+    """기존 물품 전체의 매칭 결과 계산"""
+    totals = backfill(batch=batch, reset=reset)
+    click.echo(f"분실물 {totals['lost']}개, 매칭 {totals['pairs']}쌍 ({totals['seconds']}초)")
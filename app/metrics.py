@@ -0,0 +1,373 @@
+# =====================================================
+# 📈 metrics.py — Prometheus 텍스트 형식 /metrics
+# =====================================================
+#
+# 외부 패키지 / 서비스 없이 카운터 · 게이지 · 히스토그램을 모아
+# GET /metrics 로 내보냅니다. (Prometheus 가 주기적으로 수집)
+#   - http_requests_total / http_request_duration_seconds   (엔드포인트, 상태 코드)
+#   - db_pool_*           커넥션 풀 체크아웃 수, 대기 시간, 타임아웃, 사용 중 연결
+#   - llm_*               LLM 호출 수/결과, 지연 시간, 토큰, 오류, 재시도 (llm.py)
+#   - upload_*            업로드 바이트 / 파일 수 (storage.py)
+#
+# gunicorn 처럼 워커가 여러 프로세스이면 METRICS_DIR 을 지정합니다.
+# (gunicorn.conf.py 가 기본값을 설정하고 서버 시작 시 비움)
+# 각 워커는 자기 값을 "<METRICS_DIR>/<pid>.json" 에 METRICS_FLUSH_SECONDS 마다
+# 원자적으로 덮어쓰고, /metrics 를 받은 워커가 모든 파일을 합쳐 응답합니다.
+#   - 카운터 / 히스토그램: 종료된 워커 값까지 합산 (단조 증가 유지)
+#   - 게이지: 살아 있는 워커 값만 합산
+# 다른 워커 값은 최대 METRICS_FLUSH_SECONDS 만큼 늦게 보일 수 있습니다.
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Blueprint, Response, abort, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# 초 단위 버킷 (Prometheus 기본값과 비슷하게, LLM 을 위해 위쪽을 넓힘)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+# =====================================================
+# 🔹 메트릭 / 레지스트리
+# =====================================================
+class Metric:
+    kind = None
+
+    def __init__(self, registry, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = registry.lock
+        registry.metrics[name] = self
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: 라벨은 {self.labels} 이어야 합니다")
+        return tuple(str(labels[k]) for k in self.labels)
+
+    def dump(self):
+        with self._lock:
+            return [[list(k), v if not isinstance(v, list) else list(v)]
+                    for k, v in self._values.items()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """값: [버킷별 개수..., 합계, 개수] (버킷은 누적이 아닌 구간별, 출력할 때 누적)"""
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            slots = self._values.get(key)
+            if slots is None:
+                slots = self._values[key] = [0] * (len(self.buckets) + 3)
+            n = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    n = i
+                    break
+            slots[n] += 1                 # 마지막 칸(len(buckets)) = +Inf
+            slots[-2] += value
+            slots[-1] += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.collectors = []      # 수집 직전에 게이지를 채우는 함수
+        self.directory = None
+        self.interval = 1.0
+        self._flushed = 0.0
+        self._flusher_pid = None
+
+    def counter(self, name, help, labels=()):
+        return Counter(self, name, help, labels)
+
+    def gauge(self, name, help, labels=()):
+        return Gauge(self, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return Histogram(self, name, help, labels, buckets)
+
+    def collect(self):
+        for fn in self.collectors:
+            fn()
+        return {
+            name: {"type": m.kind, "help": m.help, "labels": list(m.labels),
+                   "buckets": list(getattr(m, "buckets", ())), "values": m.dump()}
+            for name, m in self.metrics.items()
+        }
+
+    # -------------------------------------------------
+    # 다중 프로세스 (파일 공유)
+    # -------------------------------------------------
+    def use_dir(self, directory, interval=1.0):
+        os.makedirs(directory, exist_ok=True)
+        if self.directory is None:
+            atexit.register(self.flush, True)
+        self.directory = directory
+        self.interval = interval
+
+    @property
+    def path(self):
+        # fork 뒤에도 맞도록 매번 현재 pid 로 계산
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{os.getpid()}.json")
+
+    def _start_flusher(self):
+        """프로세스마다 한 번: 요청이 없어도 interval 마다 기록하는 데몬 스레드
+        (after_request 에서만 기록하면 한가한 워커의 마지막 값이 안 보임)"""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        self._flusher_pid = pid
+
+        def loop():
+            while True:
+                time.sleep(self.interval)
+                self.flush(force=True)
+
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+
+    def flush(self, force=False):
+        """interval 이 지났으면 (force 면 항상) 이 프로세스 값을 파일에 기록"""
+        path = self.path
+        if path is None:
+            return
+        self._start_flusher()
+        now = time.monotonic()
+        if not force and now - self._flushed < self.interval:
+            return
+        self._flushed = now
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "metrics": self.collect()}, f)
+        os.replace(tmp, path)
+
+    def snapshots(self):
+        """합칠 스냅샷 목록 [(pid, 살아 있는지, metrics), ...]"""
+        if self.path is None:
+            return [(os.getpid(), True, self.collect())]
+        self.flush(force=True)
+        result = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue      # 다른 워커가 쓰는 중
+            result.append((data["pid"], _alive(data["pid"]), data["metrics"]))
+        return result
+
+    def render(self):
+        """모든 프로세스 값을 합친 Prometheus 텍스트"""
+        merged = {}
+        for pid, alive, metrics in self.snapshots():
+            for name, m in metrics.items():
+                target = merged.setdefault(name, {**m, "values": {}})
+                if m["type"] == "gauge" and not alive:
+                    continue
+                for key, value in m["values"]:
+                    key = tuple(key)
+                    if isinstance(value, list):
+                        prev = target["values"].get(key) or [0] * len(value)
+                        target["values"][key] = [a + b for a, b in zip(prev, value)]
+                    else:
+                        target["values"][key] = target["values"].get(key, 0) + value
+
+        lines = []
+        for name in sorted(merged):
+            m = merged[name]
+            lines.append(f"# HELP {name} {m['help']}")
+            lines.append(f"# TYPE {name} {m['type']}")
+            for key, value in sorted(m["values"].items()):
+                labels = list(zip(m["labels"], key))
+                if m["type"] != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_num(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(m["buckets"] + ["+Inf"], value[:-2]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _num(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_num(value[-2])}")
+                lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _num(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def clear_dir(directory):
+    """서버 시작 시 이전 실행의 파일 삭제 (gunicorn.conf.py on_starting)"""
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        os.remove(path)
+
+
+registry = Registry()
+
+
+# =====================================================
+# 🔹 메트릭 정의
+# =====================================================
+http_requests = registry.counter(
+    "http_requests_total", "처리한 HTTP 요청 수", ("endpoint", "method", "status"))
+http_duration = registry.histogram(
+    "http_request_duration_seconds", "요청 처리 시간(초)", ("endpoint",))
+
+db_checkouts = registry.counter("db_pool_checkouts_total", "커넥션 풀 체크아웃 수")
+db_wait = registry.histogram(
+    "db_pool_wait_seconds", "커넥션을 얻을 때까지 걸린 시간(초)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10))
+db_timeouts = registry.counter("db_pool_timeouts_total", "커넥션 대기 시간 초과 수")
+db_checked_out = registry.gauge("db_pool_checked_out", "사용 중인 커넥션 수")
+db_pool_size = registry.gauge("db_pool_size", "커넥션 풀 크기")
+
+llm_requests = registry.counter("llm_requests_total", "LLM 호출 수", ("model", "outcome"))
+llm_duration = registry.histogram("llm_request_duration_seconds", "LLM 호출 시간(초, 재시도 포함)", ("model",))
+llm_tokens = registry.counter("llm_tokens_total", "LLM 사용 토큰", ("model", "kind"))
+llm_errors = registry.counter("llm_errors_total", "LLM 호출 오류 (재시도 전 포함)", ("model", "error"))
+llm_retries = registry.counter("llm_retries_total", "LLM 재시도 수", ("model",))
+
+upload_bytes = registry.counter("upload_bytes_total", "업로드 받은 바이트")
+upload_files = registry.counter("upload_files_total", "업로드 파일 수", ("result",))
+
+stream_clients = registry.gauge("stream_clients", "연결된 SSE 구독자 수 (/stream/items)")
+stream_events = registry.counter("stream_events_total", "SSE 이벤트 수 (sent / overflow)", ("result",))
+
+
+def enabled():
+    try:
+        return bool(current_app.config.get("METRICS_ENABLED", True))
+    except RuntimeError:
+        return False
+
+
+# =====================================================
+# 🔹 설치 (요청 훅 / 커넥션 풀)
+# =====================================================
+def _instrument_pool(engine):
+    pool = engine.pool
+    if getattr(pool, "_metrics_wrapped", False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        # Engine.raw_connection() → pool.connect(): 풀에서 기다리는 시간 포함
+        t0 = time.perf_counter()
+        try:
+            return connect()
+        except PoolTimeoutError:
+            db_timeouts.inc()
+            raise
+        finally:
+            db_wait.observe(time.perf_counter() - t0)
+
+    pool.connect = timed_connect
+    pool._metrics_wrapped = True
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, record, proxy):
+        db_checkouts.inc()
+
+    def _pool_gauges():
+        if hasattr(pool, "checkedout"):
+            db_checked_out.set(pool.checkedout())
+        if hasattr(pool, "size"):
+            db_pool_size.set(pool.size())
+
+    registry.collectors.append(_pool_gauges)
+
+
+def install(app, engine):
+    """METRICS_ENABLED 이면 요청 측정 / 풀 측정 설치 (db.init_app 직후)"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    directory = app.config.get("METRICS_DIR")
+    if directory:
+        registry.use_dir(directory, float(app.config.get("METRICS_FLUSH_SECONDS", 1)))
+
+    _instrument_pool(engine)
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _metrics_record(resp):
+        started = g.pop("_metrics_started", None)
+        if started is not None and request.endpoint != "metrics.export":
+            endpoint = request.endpoint or "-"
+            http_requests.inc(endpoint=endpoint, method=request.method, status=resp.status_code)
+            http_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+        registry.flush()
+        return resp
+
+
+@metrics_bp.route("/metrics")
+def export():
+    """Prometheus 수집용 (METRICS_TOKEN 이 있으면 Bearer 토큰 필요)"""
+    if not current_app.config.get("METRICS_ENABLED", True):
+        abort(404)
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        abort(401)
+    return Response(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,334 @@
+# =====================================================
+# 🗄 migrations.py — 스키마 마이그레이션
+# =====================================================
+#
+# db.create_all() 은 없는 테이블만 만들어 줄 뿐 가상 테이블/트리거/인덱스 변경은
+# 하지 못합니다. 그런 작업은 여기 순서대로 등록하고, 적용된 버전은
+# schema_migration 테이블에 기록해 한 번만 실행되도록 합니다.
+#
+# 앱 시작 때는 스키마를 건드리지 않습니다. (워커마다 반복하지 않도록)
+# 배포 / 설치 때 한 번:
+#   flask --app runserver db init      테이블 생성 + 마이그레이션 적용
+#   flask --app runserver db status    적용 / 대기 중인 마이그레이션 확인
+# 임시 DB 를 쓰는 벤치마크 등은 DB_AUTO_INIT=1 로 create_app 에서 바로 만듭니다.
+
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """마이그레이션 함수 등록 데코레이터: fn(conn)"""
+    def decorator(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+def is_sqlite(conn):
+    return conn.dialect.name == "sqlite"
+
+
+def has_table(conn, name):
+    return inspect(conn).has_table(name)
+
+
+def applied_versions(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migration ("
+        " version INTEGER PRIMARY KEY,"
+        " name VARCHAR(255) NOT NULL,"
+        " applied_at DATETIME NOT NULL)"
+    ))
+    return {v for (v,) in conn.execute(text("SELECT version FROM schema_migration"))}
+
+
+def upgrade():
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 실행합니다. (app context 필요)
+    반환: 이번에 적용된 마이그레이션 이름 목록
+    """
+    done = []
+    with db.engine.begin() as conn:
+        applied = applied_versions(conn)
+
+    for version, name, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        with db.engine.begin() as conn:
+            # fn 이 False 를 반환하면 (예: 지원하지 않는 DB) 기록하지 않고 다음에 재시도
+            if fn(conn) is False:
+                continue
+            conn.execute(
+                text("INSERT INTO schema_migration (version, name, applied_at) "
+                     "VALUES (:v, :n, :t)"),
+                {"v": version, "n": name, "t": datetime.utcnow()},
+            )
+        done.append(name)
+    return done
+
+
+def init_db():
+    """테이블 생성(create_all) + 마이그레이션 적용 (app context 필요)"""
+    db.create_all()
+    return upgrade()
+
+
+def pending():
+    """
+    아직 적용되지 않은 마이그레이션 [(version, name), ...]
+    읽기만 함 (schema_migration 이 없으면 전부 대기 중)
+    """
+    with db.engine.connect() as conn:
+        if not has_table(conn, "schema_migration"):
+            applied = set()
+        else:
+            applied = {v for (v,) in conn.execute(text("SELECT version FROM schema_migration"))}
+    return [(version, name) for version, name, _ in MIGRATIONS if version not in applied]
+
+
+db_cli = AppGroup("db", help="DB 스키마 생성 / 마이그레이션")
+
+
+@db_cli.command("init")
+def init_command():
+    """없는 테이블 생성 + 대기 중인 마이그레이션 적용 (여러 번 실행해도 안전)"""
+    done = init_db()
+    click.echo(f"마이그레이션 {len(done)}개 적용" + (f": {', '.join(done)}" if done else ""))
+
+
+@db_cli.command("status")
+def status_command():
+    """적용되지 않은 마이그레이션 목록"""
+    waiting = pending()
+    if not waiting:
+        click.echo("스키마 최신")
+    for version, name in waiting:
+        click.echo(f"대기 중: {version:04d} {name}")
+
+
+# =====================================================
+# 🔹 0001 — 전문 검색(FTS5, trigram) 섀도 테이블
+# =====================================================
+# rowid = id * 2 + (0: lost, 1: found) 로 두 테이블의 id 충돌을 피하고,
+# 트리거는 rowid 로 바로 찾아 수정/삭제합니다.
+# (0003 에서 item 테이블 하나로 합친 뒤에는 rowid = item.id)
+FTS_SOURCES = (("lost_item", "lost", 0), ("found_item", "found", 1))
+FTS_COLUMNS = "rowid, item_type, item_id, name, description, place, category, date"
+
+
+@migration(1, "item_fts")
+def create_item_fts(conn):
+    if not is_sqlite(conn):
+        return False
+
+    try:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS item_fts USING fts5("
+            " item_type UNINDEXED, item_id UNINDEXED,"
+            " name, description, place, category,"
+            " date UNINDEXED,"
+            " tokenize = 'trigram')"
+        ))
+    except OperationalError:
+        # FTS5 / trigram 을 지원하지 않는 SQLite (3.34 미만) → LIKE 검색 유지
+        return False
+
+    for table, tag, bit in FTS_SOURCES:
+        if not has_table(conn, table):
+            continue
+        values = (
+            f"new.id * 2 + {bit}, '{tag}', new.id, new.name,"
+            " coalesce(new.description, ''), coalesce(new.place, ''),"
+            " coalesce(new.category, ''), new.date"
+        )
+        columns = FTS_COLUMNS
+
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN"
+            f" INSERT INTO item_fts ({columns}) VALUES ({values}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN"
+            f" DELETE FROM item_fts WHERE rowid = old.id * 2 + {bit}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN"
+            f" DELETE FROM item_fts WHERE rowid = old.id * 2 + {bit};"
+            f" INSERT INTO item_fts ({columns}) VALUES ({values}); END"
+        ))
+
+        # 기존 데이터 채우기
+        conn.execute(text(
+            f"INSERT INTO item_fts ({columns})"
+            f" SELECT id * 2 + {bit}, '{tag}', id, name, coalesce(description, ''),"
+            f" coalesce(place, ''), coalesce(category, ''), date FROM {table}"
+        ))
+
+
+# =====================================================
+# 🔹 0002 — 자주 쓰는 필터/정렬 컬럼 인덱스 + date 를 DATE 로
+# =====================================================
+# 검색(category, place, date), 사용자별 물품(user_id),
+# 최신순 목록/키셋 페이지네이션(created_at, id) 에 쓰이는 인덱스입니다.
+# models.py 의 index=True / __table_args__ 와 이름을 맞춰 둡니다.
+ITEM_INDEXES = (
+    ("category", ("category",)),
+    ("place", ("place",)),
+    ("date", ("date",)),
+    ("user_id", ("user_id",)),
+    ("created_at_id", ("created_at", "id")),
+    ("type_created_at_id", ("type", "created_at", "id")),   # item 테이블만
+)
+
+LEGACY_ITEM_TABLES = ("lost_item", "found_item")
+
+
+def create_item_indexes(conn, tables=("item",)):
+    for table in tables:
+        for suffix, columns in ITEM_INDEXES:
+            if "type" in columns and table != "item":
+                continue
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{suffix}"
+                f" ON {table} ({', '.join(columns)})"
+            ))
+
+
+def drop_item_indexes(conn, tables=("item",)):
+    """벤치마크에서 인덱스 없는 상태를 재현할 때 사용"""
+    for table in tables:
+        for suffix, _ in ITEM_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_{suffix}"))
+
+
+@migration(2, "item_indexes_and_date_type")
+def item_indexes_and_date_type(conn):
+    tables = [t for t in LEGACY_ITEM_TABLES if has_table(conn, t)]
+    for table in tables:
+        if is_sqlite(conn):
+            # SQLite 의 DATE 는 'YYYY-MM-DD' 문자열로 저장되므로 테이블을 다시 만들 필요는 없고,
+            # 날짜로 해석되지 않는 값만 정리합니다. (ISO 문자열은 정렬 순서 = 날짜 순서)
+            conn.execute(text(
+                f"UPDATE {table} SET date = NULL"
+                f" WHERE date IS NOT NULL AND date(date) IS NOT date"
+            ))
+        elif conn.dialect.name == "postgresql":
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN date TYPE DATE"
+                f" USING CASE WHEN date ~ '^\\d{{4}}-\\d{{2}}-\\d{{2}}$'"
+                f" THEN date::date END"
+            ))
+
+    create_item_indexes(conn, tables)
+
+    if is_sqlite(conn):
+        conn.execute(text("ANALYZE"))
+
+
+# =====================================================
+# 🔹 0003 — lost_item / found_item → item (type 으로 구분하는 한 테이블)
+# =====================================================
+# lost_item 의 id 는 그대로 두고, found_item 의 id 는 lost_item 최댓값만큼
+# 밀어서 겹치지 않게 옮깁니다. item_change 의 습득물 id 도 같이 바꾸고,
+# 버전을 한 칸 올려 예전 id 로 만든 캐시를 무효화합니다.
+ITEM_COPY_COLUMNS = ("name", "category", "place", "date", "contact",
+                     "description", "image", "created_at", "user_id")
+
+
+def install_item_fts(conn):
+    """item_fts 를 item 테이블 기준으로 다시 채우고 트리거 설치 (rowid = item.id)"""
+    conn.execute(text("DELETE FROM item_fts"))
+
+    values = (
+        "new.id, new.type, new.id, new.name,"
+        " coalesce(new.description, ''), coalesce(new.place, ''),"
+        " coalesce(new.category, ''), new.date"
+    )
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS item_fts_ai AFTER INSERT ON item BEGIN"
+        f" INSERT INTO item_fts ({FTS_COLUMNS}) VALUES ({values}); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS item_fts_ad AFTER DELETE ON item BEGIN"
+        " DELETE FROM item_fts WHERE rowid = old.id; END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS item_fts_au AFTER UPDATE ON item BEGIN"
+        " DELETE FROM item_fts WHERE rowid = old.id;"
+        f" INSERT INTO item_fts ({FTS_COLUMNS}) VALUES ({values}); END"
+    ))
+    conn.execute(text(
+        f"INSERT INTO item_fts ({FTS_COLUMNS})"
+        " SELECT id, type, id, name, coalesce(description, ''),"
+        " coalesce(place, ''), coalesce(category, ''), date FROM item"
+    ))
+
+
+@migration(3, "unified_item_table")
+def unify_item_tables(conn):
+    columns = ", ".join(ITEM_COPY_COLUMNS)
+    offset = 0
+
+    if has_table(conn, "lost_item"):
+        conn.execute(text(
+            f"INSERT INTO item (id, type, {columns})"
+            f" SELECT id, 'lost', {columns} FROM lost_item"
+        ))
+        offset = conn.execute(text("SELECT coalesce(max(id), 0) FROM item")).scalar()
+
+    if has_table(conn, "found_item"):
+        conn.execute(text(
+            f"INSERT INTO item (id, type, {columns})"
+            f" SELECT id + :offset, 'found', {columns} FROM found_item"
+        ), {"offset": offset})
+        conn.execute(text(
+            "UPDATE item_change SET item_id = item_id + :offset WHERE item_type = 'found'"
+        ), {"offset": offset})
+
+    moved = False
+    for table in LEGACY_ITEM_TABLES:
+        if has_table(conn, table):
+            # SQLite 는 테이블과 함께 그 테이블의 트리거(…_fts_*)도 삭제됨
+            conn.execute(text(f"DROP TABLE {table}"))
+            moved = True
+
+    if moved:
+        conn.execute(text(
+            "INSERT INTO item_change (item_type, item_id, op, created_at)"
+            " VALUES ('*', 0, 'migrate', :t)"
+        ), {"t": datetime.utcnow()})
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(
+                "SELECT setval(pg_get_serial_sequence('item', 'id'),"
+                " (SELECT coalesce(max(id), 1) FROM item))"
+            ))
+
+    if is_sqlite(conn) and has_table(conn, "item_fts"):
+        install_item_fts(conn)
+
+    if is_sqlite(conn):
+        conn.execute(text("ANALYZE"))
+
+
+# =====================================================
+# 🔹 0004 — user.password_hash 길이 128 → 255
+# =====================================================
+# werkzeug 기본 scrypt 해시("scrypt:32768:8:1$salt$...")는 160자가 넘습니다.
+# SQLite 는 VARCHAR 길이를 검사하지 않으므로 다른 DB 에서만 변경합니다.
+@migration(4, "user_password_hash_length")
+def user_password_hash_length(conn):
+    if is_sqlite(conn) or not has_table(conn, "user"):
+        return
+    if conn.dialect.name == "postgresql":
+        conn.execute(text('ALTER TABLE "user" ALTER COLUMN password_hash TYPE VARCHAR(255)'))
+    elif conn.dialect.name in ("mysql", "mariadb"):
+        conn.execute(text("ALTER TABLE `user` MODIFY password_hash VARCHAR(255) NOT NULL"))
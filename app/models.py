@@ -1,6 +1,5 @@
 ﻿# app/models.py
-from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app import db, passwords
 from datetime import datetime
 
 
@@ -10,23 +9,26 @@ from datetime import datetime
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(64), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)   # scrypt 해시는 160자 이상
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # 🔗 关联：用户 → 发布的失物
-    lost_items = db.relationship("LostItem", backref="user", lazy=True)
+    # 🔗 关联：用户 → 发布的物品 (失物 / 拾得物)
+    items = db.relationship("Item", back_populates="user", lazy=True)
+    lost_items = db.relationship("LostItem", lazy=True, viewonly=True)
+    found_items = db.relationship("FoundItem", lazy=True, viewonly=True)
 
-    # 🔗 关联：用户 → 发布的拾得物
-    found_items = db.relationship("FoundItem", backref="user", lazy=True)
-
-    # 设置密码
+    # 设置密码 (PASSWORD_HASH_METHOD 정책)
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     # 校验密码
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify_password(self.password_hash, password)
+
+    # 정책이 바뀐 뒤 예전 파라미터로 만든 해시인지
+    def password_needs_rehash(self):
+        return passwords.needs_rehash(self.password_hash)
 
     def to_dict(self):
         return {
@@ -38,39 +40,52 @@ class User(db.Model):
 
 
 # =====================================
-# 失物表
+# 物品表 (분실물 / 습득물 공용, type 으로 구분)
 # =====================================
-class LostItem(db.Model):
+# 두 테이블로 나뉘어 있으면 id 가 겹쳐 /item/<id> 로 한쪽을 찾을 수 없고
+# 조회마다 두 번 질의해야 하므로, 한 테이블(단일 테이블 상속)에 모읍니다.
+#   Item.query          → 전체
+#   LostItem.query      → type = 'lost'
+#   db.session.get(Item, id) → LostItem / FoundItem 인스턴스
+class Item(db.Model):
+    __tablename__ = "item"
+
     id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(16), nullable=False)        # lost / found
     name = db.Column(db.String(255), nullable=False)
-    category = db.Column(db.String(255))
-    place = db.Column(db.String(255))
-    date = db.Column(db.String(255))
+    category = db.Column(db.String(255), index=True)
+    place = db.Column(db.String(255), index=True)
+    date = db.Column(db.Date, index=True)
     contact = db.Column(db.String(255))
     description = db.Column(db.Text)
     image = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # 🔑 外键：物品属于谁
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True, index=True)
+    user = db.relationship("User", back_populates="items")
 
+    __mapper_args__ = {"polymorphic_on": type}
 
-# =====================================
-# 拾得物表
-# =====================================
-class FoundItem(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(255), nullable=False)
-    category = db.Column(db.String(255))
-    place = db.Column(db.String(255))
-    date = db.Column(db.String(255))
-    contact = db.Column(db.String(255))
-    description = db.Column(db.Text)
-    image = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # 최신순 목록 / 키셋 페이지네이션 (created_at DESC, id DESC), 종류별 목록
+    __table_args__ = (
+        db.Index("ix_item_created_at_id", "created_at", "id"),
+        db.Index("ix_item_type_created_at_id", "type", "created_at", "id"),
+    )
+
+
+# 失物
+class LostItem(Item):
+    __mapper_args__ = {"polymorphic_identity": "lost"}
+
+
+# 拾得物
+class FoundItem(Item):
+    __mapper_args__ = {"polymorphic_identity": "found"}
+
+
+ITEM_CLASSES = {"lost": LostItem, "found": FoundItem}
 
-    # 🔑 外键：物品属于谁
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
 
 class Feedback(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -78,3 +93,58 @@ class Feedback(db.Model):
     email = db.Column(db.String(120))
     message = db.Column(db.Text)
     date = db.Column(db.DateTime, default=db.func.now())
+
+
+# =====================================
+# 물품 변경 기록 (인덱스/캐시 동기화용)
+# =====================================
+class ItemChange(db.Model):
+    # id 가 곧 데이터 버전 번호
+    id = db.Column(db.Integer, primary_key=True)
+    item_type = db.Column(db.String(16), nullable=False)   # lost / found
+    item_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(16), nullable=False)          # insert / update / delete
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# =====================================
+# 업로드 파일 (내용 해시로 저장, 참조 횟수로 정리)
+# =====================================
+class Blob(db.Model):
+    digest = db.Column(db.String(64), primary_key=True)    # sha256 hex
+    path = db.Column(db.String(255), nullable=False)       # uploads/ 아래 상대 경로
+    size = db.Column(db.Integer, nullable=False)
+    refcount = db.Column(db.Integer, nullable=False, default=0)   # 이 이미지를 쓰는 물품 수
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# =====================================
+# 분실물 ↔ 습득물 자동 매칭 결과 (matcher.py)
+# =====================================
+class Match(db.Model):
+    __tablename__ = "item_match"
+
+    id = db.Column(db.Integer, primary_key=True)
+    lost_id = db.Column(db.Integer, db.ForeignKey("item.id"), nullable=False)
+    found_id = db.Column(db.Integer, db.ForeignKey("item.id"), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # (lost_id, found_id) 는 한 번만, lost_id 로 찾기도 이 인덱스 사용
+    __table_args__ = (
+        db.UniqueConstraint("lost_id", "found_id", name="uq_item_match_pair"),
+    )
+
+
+# =====================================
+# 대량 가져오기 진행 상황 (`flask items import`, bulk.py)
+# =====================================
+class ItemImport(db.Model):
+    __tablename__ = "item_import"
+
+    source = db.Column(db.String(64), primary_key=True)       # 입력 파일 sha256
+    filename = db.Column(db.String(255))
+    rows_done = db.Column(db.Integer, nullable=False, default=0)   # 커밋된 레코드 수 (건너뛴 것 포함)
+    inserted = db.Column(db.Integer, nullable=False, default=0)
+    finished = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,115 @@
+# =====================================================
+# 📑 pagination.py — 키셋(커서) 페이지네이션
+# =====================================================
+#
+# OFFSET 대신 "마지막으로 본 행의 정렬 키" 를 커서로 넘겨
+# 다음 페이지를 WHERE (created_at, id) < (:c, :i) 로 가져옵니다.
+# 어느 페이지든 page_size + 1 행만 읽습니다.
+
+import base64
+import json
+import math
+from datetime import datetime
+
+from flask import current_app, request, url_for
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def page_size():
+    """?size= (없으면 설정 PAGE_SIZE), 1 ~ MAX_PAGE_SIZE 로 제한"""
+    default = current_app.config.get("PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    limit = current_app.config.get("MAX_PAGE_SIZE", MAX_PAGE_SIZE)
+    size = request.args.get("size", default, type=int)
+    return max(1, min(size or default, limit))
+
+
+def encode_cursor(values):
+    """정렬 키 목록 → URL 에 넣을 수 있는 문자열"""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# SQLite INTEGER 범위 (넘는 값은 바인딩할 때 OverflowError)
+_INT_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def _cursor_value(value):
+    """커서 값은 문자열 / 정수 / 유한한 실수만 (SQL 파라미터로 그대로 들어가므로)"""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return _INT_RANGE[0] <= value <= _INT_RANGE[1]
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return isinstance(value, str)
+
+
+def decode_cursor(cursor):
+    """잘못된 커서는 None (= 첫 페이지)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or not all(_cursor_value(v) for v in values):
+        return None
+    return values
+
+
+def parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_filter(columns, values):
+    """
+    내림차순 (c1, c2, ...) < (v1, v2, ...) 조건
+    (row value 를 지원하지 않는 DB 도 있으므로 OR/AND 로 펼침)
+    """
+    clauses = []
+    for n, column in enumerate(columns):
+        equal = [c == v for c, v in zip(columns[:n], values[:n])]
+        clauses.append(and_(*equal, column < values[n]))
+    return or_(*clauses)
+
+
+def keyset_page(query, Model, cursor, size):
+    """
+    created_at DESC, id DESC 순 한 페이지
+    반환: (rows, next_cursor)
+    """
+    values = decode_cursor(cursor)
+    if values and len(values) >= 2 and isinstance(values[1], int):
+        created_at = parse_datetime(values[0])
+        if created_at is not None:
+            query = query.filter(
+                keyset_filter([Model.created_at, Model.id], [created_at, values[1]])
+            )
+
+    rows = query.order_by(Model.created_at.desc(), Model.id.desc()).limit(size + 1).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.created_at, last.id])
+    return rows, next_cursor
+
+
+def page_url(cursor, **overrides):
+    """현재 요청의 쿼리 문자열을 유지한 채 cursor 만 바꾼 URL"""
+    args = request.args.to_dict()
+    args.update(overrides)
+    if cursor:
+        args["cursor"] = cursor
+    else:
+        args.pop("cursor", None)
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
@@ -0,0 +1,62 @@
+# =====================================================
+# 🔑 passwords.py — 비밀번호 해시 정책 / 로그인 시 재해시
+# =====================================================
+#
+# PASSWORD_HASH_METHOD 에 werkzeug 방식 문자열을 지정합니다.
+#   scrypt:32768:8:1        (기본, werkzeug 기본값과 같음)
+#   pbkdf2:sha256:600000
+# 해시 문자열 앞부분("방식:파라미터$salt$hash")에 만들 때의 파라미터가 남아 있으므로,
+# 정책을 바꾸면 기존 사용자는 다음 로그인 성공 시 새 파라미터로 다시 해시됩니다.
+# (비밀번호 원문은 로그인할 때만 알 수 있으므로 일괄 변환은 하지 않음)
+
+from flask import current_app, has_app_context
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+def normalize_method(method):
+    """
+    생략된 파라미터를 werkzeug 기본값으로 채운 방식 문자열
+    "scrypt" → "scrypt:32768:8:1", "pbkdf2" → "pbkdf2:sha256:600000"
+    """
+    name, *args = (method or DEFAULT_METHOD).strip().split(":")
+    if name == "scrypt":
+        if not args:
+            args = ["32768", "8", "1"]
+        if len(args) != 3:
+            raise ValueError(f"scrypt 는 n:r:p 세 값이 필요합니다: {method!r}")
+        return "scrypt:" + ":".join(str(int(a)) for a in args)
+    if name == "pbkdf2":
+        if len(args) > 2:
+            raise ValueError(f"pbkdf2 는 hash:iterations 까지 지정할 수 있습니다: {method!r}")
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"지원하지 않는 비밀번호 해시 방식: {method!r}")
+
+
+def current_method():
+    """현재 정책 (app context 밖이면 기본값)"""
+    if has_app_context():
+        return normalize_method(current_app.config.get("PASSWORD_HASH_METHOD"))
+    return DEFAULT_METHOD
+
+
+def hash_password(password):
+    return generate_password_hash(password, method=current_method())
+
+
+def verify_password(pwhash, password):
+    return bool(pwhash) and check_password_hash(pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """저장된 해시의 방식/파라미터가 현재 정책과 다르면 True"""
+    if not pwhash or "$" not in pwhash:
+        return True
+    return pwhash.split("$", 1)[0] != current_method()
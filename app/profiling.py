@@ -0,0 +1,212 @@
+# =====================================================
+# ⏱ profiling.py — 요청 시간 / SQL 횟수 측정 (선택 사항)
+# =====================================================
+#
+# PROFILING=1 일 때만 설치됩니다. 요청마다
+#   - 전체 처리 시간, SQL 문 개수, SQL 총 시간
+#     (SQLAlchemy before/after_cursor_execute 이벤트)
+#   - SLOW_QUERY_MS 이상 걸린 SQL → 경고 로그 + 최근 목록
+#     (파라미터 값은 "?" 로 가림. SLOW_QUERY_PARAMS=1 일 때만 실제 값)
+#   - 같은 SQL 문(파라미터만 다름)이 N_PLUS_ONE_THRESHOLD 번 이상 → N+1 의심
+# 을 기록하고, 응답에 Server-Timing 헤더를 붙입니다.
+#   Server-Timing: app;dur=35.2, db;dur=12.8;desc="14 queries"
+# (브라우저 개발자 도구 Network → Timing 에 표시됨)
+#
+# 엔드포인트별 누적값과 최근 느린 쿼리 / N+1 / 느린 요청은
+# /admin/metrics 에서 JSON 으로 봅니다. 값은 워커(프로세스)별입니다.
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+
+# 최근 항목 목록 길이 / 엔드포인트별 백분위수 계산에 쓰는 최근 요청 수
+RECENT = 50
+WINDOW = 500
+
+
+def _short(statement, limit=500):
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + " …"
+
+
+def _redact(parameters):
+    """파라미터 모양(개수 / 이름)만 남기고 값은 "?" 로"""
+    if isinstance(parameters, dict):
+        return {k: "?" for k in parameters}
+    if isinstance(parameters, (list, tuple)):
+        return type(parameters)(_redact(p) for p in parameters)
+    return "?"
+
+
+class RequestProfile:
+    """요청 하나 동안의 SQL 기록 (g._profile)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.statements = Counter()
+
+    def add(self, statement, elapsed_ms):
+        self.queries += 1
+        self.sql_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """threshold 번 이상 실행된 같은 SQL 문 [(횟수, SQL), ...]"""
+        return [(n, s) for s, n in self.statements.most_common() if n >= threshold]
+
+
+class Metrics:
+    """엔드포인트별 누적 + 최근 느린 쿼리 / N+1 / 느린 요청 (프로세스 안)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.since = time.time()
+            self.endpoints = {}
+            self.slow_queries = deque(maxlen=RECENT)
+            self.n_plus_one = deque(maxlen=RECENT)
+            self.slow_requests = deque(maxlen=RECENT)
+
+    def record_request(self, endpoint, wall_ms, profile):
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    "requests": 0, "wall_ms": 0.0, "max_ms": 0.0,
+                    "queries": 0, "sql_ms": 0.0, "max_queries": 0,
+                    "recent": deque(maxlen=WINDOW),
+                }
+            stats["requests"] += 1
+            stats["wall_ms"] += wall_ms
+            stats["max_ms"] = max(stats["max_ms"], wall_ms)
+            stats["queries"] += profile.queries
+            stats["sql_ms"] += profile.sql_ms
+            stats["max_queries"] = max(stats["max_queries"], profile.queries)
+            stats["recent"].append(wall_ms)
+
+    def add(self, kind, entry):
+        entry["at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock:
+            getattr(self, kind).append(entry)
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for name, s in sorted(self.endpoints.items()):
+                recent = sorted(s["recent"])
+                n = s["requests"]
+                endpoints[name] = {
+                    "requests": n,
+                    "avg_ms": round(s["wall_ms"] / n, 2),
+                    "p50_ms": round(recent[len(recent) // 2], 2),
+                    "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 2),
+                    "max_ms": round(s["max_ms"], 2),
+                    "avg_queries": round(s["queries"] / n, 2),
+                    "max_queries": s["max_queries"],
+                    "avg_sql_ms": round(s["sql_ms"] / n, 2),
+                }
+            return {
+                "pid": os.getpid(),
+                "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.since)),
+                "endpoints": endpoints,
+                "slow_queries": list(self.slow_queries),
+                "n_plus_one": list(self.n_plus_one),
+                "slow_requests": list(self.slow_requests),
+            }
+
+
+metrics = Metrics()
+
+
+def enabled(app):
+    return bool(app.config.get("PROFILING"))
+
+
+# =====================================================
+# 🔹 설치
+# =====================================================
+def install(app, engine):
+    """PROFILING 이 켜져 있으면 SQL 이벤트 / 요청 훅 등록 (db.init_app 직후)"""
+    if not enabled(app):
+        return
+
+    slow_query_ms = float(app.config.get("SLOW_QUERY_MS", 100))
+    slow_request_ms = float(app.config.get("SLOW_REQUEST_MS", 500))
+    threshold = int(app.config.get("N_PLUS_ONE_THRESHOLD", 5))
+    show_params = bool(app.config.get("SLOW_QUERY_PARAMS"))
+
+    # 시작 시각은 문장마다 생기는 실행 컨텍스트에 둠 (연결별 스택에 쌓으면 실패한
+    # 문장은 after_cursor_execute 가 오지 않아 남고, 다음 문장이 엉뚱한 값을 꺼냄)
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - context._query_start) * 1000
+        in_request = has_request_context()
+        if in_request and "_profile" in g:
+            g._profile.add(statement, elapsed)
+        if elapsed >= slow_query_ms:
+            path = request.path if in_request else None
+            log.warning("느린 쿼리 %.1fms (%s): %s", elapsed, path or "-", _short(statement))
+            metrics.add("slow_queries", {
+                "ms": round(elapsed, 2),
+                "path": path,
+                "statement": _short(statement),
+                "parameters": _short(repr(parameters if show_params else _redact(parameters)), 200),
+            })
+
+    @app.before_request
+    def _start_profile():
+        g._profile = RequestProfile()
+
+    @app.after_request
+    def _finish_profile(resp):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return resp
+        wall = (time.perf_counter() - profile.started) * 1000
+        endpoint = request.endpoint or "-"
+        metrics.record_request(endpoint, wall, profile)
+
+        timing = [
+            f"app;dur={wall:.1f}",
+            f'db;dur={profile.sql_ms:.1f};desc="{profile.queries} queries"',
+        ]
+
+        repeated = profile.repeated(threshold)
+        if repeated:
+            count, statement = repeated[0]
+            log.warning("N+1 의심 %s: 같은 SQL %d번 — %s", request.path, count, _short(statement, 200))
+            metrics.add("n_plus_one", {
+                "path": request.path,
+                "endpoint": endpoint,
+                "queries": profile.queries,
+                "repeated": [{"count": n, "statement": _short(s)} for n, s in repeated[:5]],
+            })
+            timing.append(f'n1;desc="{count}x repeated query"')
+
+        if wall >= slow_request_ms:
+            metrics.add("slow_requests", {
+                "path": request.path,
+                "endpoint": endpoint,
+                "ms": round(wall, 2),
+                "queries": profile.queries,
+                "sql_ms": round(profile.sql_ms, 2),
+            })
+
+        resp.headers.add("Server-Timing", ", ".join(timing))
+        return resp
@@ -0,0 +1,220 @@
+# =====================================================
+# 🚦 ratelimit.py — 로그인 시도 제한 (토큰 버킷)
+# =====================================================
+#
+# 비밀번호 검증(scrypt/pbkdf2)은 일부러 느리게 만든 연산이라, 제한 없이
+# 로그인 요청을 몰아 보내면 워커 CPU 가 해시 계산에 묶여 다른 요청을 처리하지 못합니다.
+# 로그인 API 는 DB 조회나 해시 계산 전에 login_limiter.hit() 로
+#   - IP 별 버킷       (LOGIN_LIMIT_IP,   기본 20회/60초)
+#   - 아이디 별 버킷   (LOGIN_LIMIT_USER, 기본 5회/60초)
+# 에서 토큰을 하나씩 꺼내고, 하나라도 비어 있으면 바로 429 + Retry-After 로 응답합니다.
+# 로그인에 성공하면 그 아이디의 버킷은 다시 채웁니다.
+#
+# 저장소
+#   - LOGIN_LIMIT_PATH 없음 : 프로세스 메모리 (워커마다 따로 셈)
+#   - LOGIN_LIMIT_PATH 지정 : SQLite 파일 (모든 워커가 같은 버킷 공유)
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def parse_rule(rule):
+    """
+    "5/60" → (burst=5, rate=5/60 초당 토큰)
+    60초 동안 5번까지, 이후에는 12초마다 한 번씩 다시 허용
+    """
+    count, _, seconds = str(rule).partition("/")
+    count, seconds = int(count), float(seconds or 60)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f"잘못된 제한 규칙: {rule!r}")
+    return count, count / seconds
+
+
+def refill(tokens, updated, now, burst, rate):
+    return min(float(burst), tokens + max(0.0, now - updated) * rate)
+
+
+# =====================================================
+# 🔹 저장소
+# =====================================================
+class MemoryBuckets:
+    """key → (tokens, updated), 너무 많아지면 가득 찬(오래 안 쓴) 버킷부터 삭제"""
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, burst, rate, now=None):
+        """토큰 하나 사용, 허용이면 0 / 거부면 다음 토큰까지 남은 초"""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._store.pop(key, (float(burst), now))
+            tokens = refill(tokens, updated, now, burst, rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._store[key] = (tokens, now)
+            if len(self._store) > self.maxsize:
+                # 가장 오래 전에 쓴 버킷 = 이미 다시 가득 찼을 가능성이 가장 높음
+                self._store.popitem(last=False)
+            return wait
+
+    def reset(self, key):
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def __len__(self):
+        return len(self._store)
+
+
+class SQLiteBuckets:
+    """
+    여러 워커가 함께 쓰는 SQLite 버킷
+    BEGIN IMMEDIATE 로 읽기-계산-쓰기를 한 번에 처리하므로 동시에 와도 토큰이 새지 않음
+    """
+
+    # 가득 찬 버킷 행을 지우는 주기 (take 횟수)
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._pid = None
+        self._conn      # 경로 / 권한 오류는 설정할 때 바로 드러나도록
+
+    @property
+    def _conn(self):
+        # gunicorn preload_app: fork 된 워커는 부모 연결을 쓰지 않고 새로 연결
+        if self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS login_bucket ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL,"
+                " full_at REAL NOT NULL)"
+            )
+            self._db, self._pid = conn, os.getpid()
+        return self._db
+
+    def take(self, key, burst, rate, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM login_bucket WHERE key = ?", (key,)
+                ).fetchone()
+                tokens = refill(*(row or (float(burst), now)), now, burst, rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / rate
+                conn.execute(
+                    "INSERT OR REPLACE INTO login_bucket (key, tokens, updated, full_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (burst - tokens) / rate),
+                )
+                self._calls += 1
+                if self._calls % self.PRUNE_EVERY == 0:
+                    conn.execute("DELETE FROM login_bucket WHERE full_at <= ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def reset(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM login_bucket WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM login_bucket")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM login_bucket").fetchone()[0]
+
+
+# =====================================================
+# 🔹 로그인 제한
+# =====================================================
+class LoginLimiter:
+    def __init__(self):
+        self.enabled = True
+        self.rules = {"ip": parse_rule("20/60"), "user": parse_rule("5/60")}
+        self.store = MemoryBuckets()
+        self.allowed = 0
+        self.rejected = 0
+
+    def configure(self, enabled=True, ip_rule=None, user_rule=None, path=None):
+        self.enabled = enabled
+        if ip_rule:
+            self.rules["ip"] = parse_rule(ip_rule)
+        if user_rule:
+            self.rules["user"] = parse_rule(user_rule)
+        if path:
+            if not isinstance(self.store, SQLiteBuckets) or self.store.path != path:
+                self.store = SQLiteBuckets(path)
+        elif not isinstance(self.store, MemoryBuckets):
+            self.store = MemoryBuckets()
+        else:
+            self.store.clear()
+        self.allowed = self.rejected = 0
+
+    @staticmethod
+    def _user_key(username):
+        """아이디 버킷 키, 문자열 아이디가 없으면(빈 값 포함) None → IP 버킷만"""
+        name = username.strip().lower() if isinstance(username, str) else ""
+        return "user:" + name if name else None
+
+    def hit(self, ip, username):
+        """
+        시도 1회 기록, 허용이면 0 / 거부면 Retry-After 초(정수)
+        두 버킷 모두에서 토큰을 꺼내므로 IP 를 바꿔 가며 한 아이디를 노려도,
+        한 IP 에서 아이디를 바꿔 가며 시도해도 막힘
+        """
+        if not self.enabled:
+            return 0
+        buckets = [("ip:" + (ip or "-"), self.rules["ip"])]
+        user_key = self._user_key(username)
+        if user_key:
+            # 아이디 없는 요청끼리 "user:" 버킷 하나를 나눠 쓰지 않도록
+            buckets.append((user_key, self.rules["user"]))
+        wait = 0.0
+        for key, (burst, rate) in buckets:
+            wait = max(wait, self.store.take(key, burst, rate))
+        if wait:
+            self.rejected += 1
+            return max(1, math.ceil(wait))
+        self.allowed += 1
+        return 0
+
+    def succeeded(self, username):
+        """로그인 성공 → 그 아이디의 실패 기록을 지움"""
+        user_key = self._user_key(username)
+        if self.enabled and user_key:
+            self.store.reset(user_key)
+
+    def stats(self):
+        return {"allowed": self.allowed, "rejected": self.rejected, "buckets": len(self.store)}
+
+
+login_limiter = LoginLimiter()
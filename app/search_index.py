@@ -0,0 +1,220 @@
+# =====================================================
+# 🔎 search_index.py — FTS5 전문 검색
+# =====================================================
+#
+# migrations.py 의 item_fts (trigram) 섀도 테이블 하나에서
+# 분실물/습득물을 한 번에 검색하고 bm25 점수로 정렬합니다.
+# trigram 은 3글자 이상만 색인을 탈 수 있으므로 "지갑" 같은 2글자 검색어는
+# item_fts 위의 LIKE 로 처리합니다. (그래도 두 테이블을 따로 스캔하지는 않음)
+
+from datetime import date as _date
+
+from sqlalchemy import text
+
+from app import db
+from app.models import Item
+from app.utils import parse_date
+from app.pagination import decode_cursor, encode_cursor, keyset_filter, parse_datetime
+
+# 키워드가 검색하는 FTS 컬럼
+KEYWORD_COLUMNS = ("name", "description", "category")
+
+TRIGRAM = 3
+
+_available = {}
+
+
+def fts_available():
+    """item_fts 테이블이 있는지 (엔진별로 한 번만 확인)"""
+    engine = db.engine
+    if engine.url not in _available:
+        if engine.dialect.name != "sqlite":
+            _available[engine.url] = False
+        else:
+            row = db.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_fts'"
+            )).first()
+            _available[engine.url] = row is not None
+    return _available[engine.url]
+
+
+def _quote(term):
+    """FTS5 문자열 리터럴 ("..." 안의 " 는 두 번)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_query(keyword="", category="", place="", date=""):
+    """
+    검색 조건 → (WHERE 절, 파라미터, MATCH 사용 여부)
+    - 3글자 이상 단어: MATCH (색인 사용, bm25 가능)
+    - 3글자 미만 단어: LIKE '%단어%'
+    """
+    match_parts = []
+    where = []
+    params = {}
+
+    def add_term(columns, term, n):
+        if len(term) >= TRIGRAM:
+            match_parts.append("{" + " ".join(columns) + "} : " + _quote(term))
+        else:
+            key = f"like{n}"
+            params[key] = f"%{_escape_like(term)}%"
+            where.append("(" + " OR ".join(
+                f"item_fts.{c} LIKE :{key} ESCAPE '\\'" for c in columns
+            ) + ")")
+
+    n = 0
+    for term in keyword.split():
+        add_term(KEYWORD_COLUMNS, term, n)
+        n += 1
+    for term in place.split():
+        add_term(("place",), term, n)
+        n += 1
+
+    if match_parts:
+        params["match"] = " AND ".join(match_parts)
+        where.insert(0, "item_fts MATCH :match")
+    if category:
+        params["category"] = category
+        where.append("item_fts.category = :category")
+    if date:
+        params["date"] = date
+        where.append("item_fts.date = :date")
+
+    return " AND ".join(where) or "1", params, bool(match_parts)
+
+
+def search_keys(keyword="", category="", place="", date="", after=None, limit=None):
+    """
+    분실물/습득물을 한 번의 쿼리로 검색
+    after: 이전 페이지 마지막 행의 정렬 키 (sort_key)
+    반환: [("lost" | "found", item_id, sort_key), ...] (관련도 순)
+    """
+    where, params, ranked = build_query(keyword, category, place, date)
+
+    if ranked:
+        # rank == bm25(item_fts), 작을수록 관련도 높음
+        columns = "item_type, item_id, rank, item_fts.rowid"
+        order = "rank, item_fts.rowid"
+        if after and len(after) == 2:
+            where += " AND (rank > :after_rank OR (rank = :after_rank AND item_fts.rowid > :after_rowid))"
+            params.update(after_rank=after[0], after_rowid=after[1])
+    else:
+        columns = "item_type, item_id, item_fts.rowid"
+        order = "item_fts.rowid DESC"
+        if after and len(after) == 1:
+            where += " AND item_fts.rowid < :after_rowid"
+            params.update(after_rowid=after[0])
+
+    sql = f"SELECT {columns} FROM item_fts WHERE {where} ORDER BY {order}"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+
+    return [(row[0], row[1], list(row[2:])) for row in db.session.execute(text(sql), params)]
+
+
+# =====================================================
+# 🔹 검색 결과 한 페이지 (/search, /api/search, /api/v1/items 공용)
+# =====================================================
+# 결과에 넣는 기본 필드 (/api/v1/items 는 ?fields= 로 바꿀 수 있음)
+RESULT_FIELDS = ("id", "type", "name", "category", "place", "date", "image")
+
+# 필드와 상관없이 항상 읽는 컬럼 (커서 = created_at, id)
+KEY_COLUMNS = ("id", "created_at")
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, _date) else value
+
+
+def to_result(row, fields=RESULT_FIELDS):
+    """컬럼만 조회한 행 → dict (날짜는 ISO 문자열)"""
+    return {f: _plain(getattr(row, f)) for f in fields}
+
+
+def _result_query(fields=RESULT_FIELDS):
+    # ORM 객체를 만들지 않고 필요한 컬럼만 SELECT
+    columns = list(dict.fromkeys(KEY_COLUMNS + tuple(fields)))
+    return db.session.query(*[getattr(Item, c) for c in columns])
+
+
+def _like_filters(query, keyword, category, place, date):
+    """FTS 를 쓸 수 없을 때의 기존 필터 (LIKE)"""
+    if keyword:
+        query = query.filter(Item.name.contains(keyword))
+    if category:
+        query = query.filter(Item.category == category)
+    if place:
+        query = query.filter(Item.place.contains(place))
+    if date:
+        query = query.filter(Item.date == date)
+    return query
+
+
+def _fts_page(keyword, category, place, date, after, size, fields):
+    keys = search_keys(keyword, category, place, date, after=after, limit=size + 1)
+    next_cursor = None
+    if len(keys) > size:
+        keys = keys[:size]
+        next_cursor = encode_cursor(["fts"] + keys[-1][2])
+
+    ids = [i for _, i, _ in keys]
+    loaded = {}
+    if ids:
+        for row in _result_query(fields).filter(Item.id.in_(ids)):
+            loaded[row.id] = to_result(row, fields)
+
+    return [loaded[i] for i in ids if i in loaded], next_cursor
+
+
+def _recent_page(keyword, category, place, date, after, size, fields):
+    """분실물/습득물을 한 테이블에서 (created_at, id) 내림차순으로 size + 1 개"""
+    query = _like_filters(_result_query(fields), keyword, category, place, date)
+    created_at = parse_datetime(after[0]) if after and len(after) >= 2 else None
+    if created_at is not None:
+        query = query.filter(keyset_filter([Item.created_at, Item.id], [created_at, after[1]]))
+    rows = query.order_by(Item.created_at.desc(), Item.id.desc()).limit(size + 1).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(["recent", rows[-1].created_at, rows[-1].id])
+
+    return [to_result(row, fields) for row in rows], next_cursor
+
+
+def _cursor_shape_ok(mode, after):
+    """fts: [rank(수), rowid(정수)] / recent: [created_at(문자열), id(정수)]"""
+    if mode == "fts":
+        return len(after) == 2 and isinstance(after[0], (int, float)) and isinstance(after[1], int)
+    if mode == "recent":
+        return len(after) == 2 and isinstance(after[0], str) and isinstance(after[1], int)
+    return mode is None
+
+
+def search_items(keyword="", category="", place="", date="", cursor=None, size=20,
+                 fields=RESULT_FIELDS):
+    """
+    검색 결과 한 페이지
+    - 키워드/장소가 있으면 FTS (bm25 순)
+    - 그 외에는 최신순 (created_at, id)
+    fields: 결과 dict 에 넣을 Item 컬럼 이름
+    반환: (results, next_cursor)
+    """
+    # 날짜는 'YYYY-MM-DD' 만 허용 (형식이 틀리면 필터 무시)
+    date = parse_date(date)
+    values = decode_cursor(cursor) or []
+    mode, after = (values[0], values[1:]) if values else (None, None)
+    if not _cursor_shape_ok(mode, after):
+        mode, after = None, None            # 모양이 틀린 커서는 첫 페이지
+
+    if (keyword or place) and fts_available():
+        return _fts_page(keyword, category, place, date.isoformat() if date else "",
+                         after if mode == "fts" else None, size, fields)
+    return _recent_page(keyword, category, place, date,
+                        after if mode == "recent" else None, size, fields)
@@ -0,0 +1,307 @@
+# =====================================================
+# 📦 storage.py — 내용 해시 기반 업로드 저장소
+# =====================================================
+#
+# 업로드 파일을 원래 이름 대신 sha256 으로 저장합니다.
+#   static/uploads/ab/cd/abcd....jpg   (앞 2+2 글자로 디렉터리 분산)
+#   - 같은 이름의 다른 사진이 서로 덮어쓰지 않음
+#   - 같은 사진을 다시 올리면 파일을 새로 만들지 않음 (blob 테이블)
+#   - 청크 단위로 복사하면서 해시 계산, UPLOAD_MAX_BYTES 를 넘으면 즉시 413
+#     (multipart 업로드는 Werkzeug 가 이미 본문 전체를 임시 파일로 받아 둔 뒤이므로
+#      네트워크 수신을 줄이지는 않음 — 요청 전체 크기는 MAX_CONTENT_LENGTH 가 막음.
+#      여기서는 파일 하나의 크기 제한과 복사/해시 중 메모리 사용만 제한)
+#
+# blob.refcount 는 그 이미지를 쓰는 물품 수입니다. 물품 추가/이미지 교체/삭제 시
+# 매퍼 이벤트가 같은 트랜잭션에서 증감하고, 0 이 된 blob 은 커밋 직후 파일과
+# 변환본(images.py)까지 지웁니다. 중간에 실패해 남은 파일은 `flask uploads gc`.
+# 저장할 때 blob 행에 먼저 쓰기(값은 그대로)를 해 두므로, 물품이 커밋되어 refcount 가
+# 오를 때까지 collect 의 DELETE 는 기다렸다가 refcount 를 다시 보고 지우지 않습니다.
+#
+# 참고: images.py 가 본 파일을 리사이즈해 덮어쓰므로 디스크의 내용은
+# "원본 해시로 찾는 변환 결과" 입니다. (같은 원본 → 같은 결과)
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import AppGroup
+from sqlalchemy import bindparam, event, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+
+from app import db, images, metrics
+from app.models import Blob, LostItem, FoundItem
+
+CHUNK_SIZE = 64 * 1024
+
+URL_PREFIX = "/static/uploads/"
+_BLOB_URL = re.compile(r"^/static/uploads/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.?\w*$")
+
+
+def upload_dir():
+    return os.path.join(current_app.static_folder, "uploads")
+
+
+def digest_from_url(url):
+    """blob URL 이면 sha256, 예전 방식(원래 파일 이름) URL 이면 None"""
+    m = _BLOB_URL.match(url or "")
+    return m.group(1) if m else None
+
+
+# =====================================================
+# 🔹 저장
+# =====================================================
+def _stream_to_temp(stream, tmp_dir, limit):
+    """
+    청크 단위로 임시 파일에 쓰면서 sha256 계산 → (임시 경로, digest, 크기)
+    stream 은 보통 Werkzeug 가 이미 받아 둔 업로드 파일 (요청 본문을 직접 읽지 않음)
+    """
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=tmp_dir, prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise RequestEntityTooLarge()
+                sha.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return tmp, sha.hexdigest(), size
+
+
+def _reserve(digest):
+    """
+    기존 blob 행에 값을 바꾸지 않는 UPDATE (현재 세션 트랜잭션 안)
+    → 이 트랜잭션이 끝날 때까지 collect 가 그 행을 지우지 못함 (SQLite 쓰기 잠금 /
+    다른 DB 는 행 잠금). 행이 이미 지워졌으면 False
+    """
+    table = Blob.__table__
+    return db.session.execute(
+        table.update().where(table.c.digest == digest).values(refcount=table.c.refcount)
+    ).rowcount > 0
+
+
+def _ensure_blob(digest, path, size):
+    """
+    blob 행을 잡아 두거나(_reserve) 없으면 refcount=0 으로 추가 (현재 세션 트랜잭션 안)
+    같은 파일이 동시에 올라오면 먼저 들어간 행을 사용
+    찾기와 refcount 증가(물품 저장)가 같은 트랜잭션이므로 그 사이에 GC 되지 않음
+    """
+    while True:
+        if _reserve(digest):
+            return db.session.get(Blob, digest)
+        try:
+            with db.session.begin_nested():
+                blob = Blob(digest=digest, path=path, size=size, refcount=0)
+                db.session.add(blob)
+            return blob
+        except IntegrityError:
+            continue        # 다른 요청이 먼저 추가 → 그 행을 잡음
+
+
+def store(file):
+    """
+    업로드 파일 저장 후 URL 반환 (파일이 없으면 None)
+    refcount 는 이 URL 을 가진 물품이 저장될 때 올라갑니다.
+    """
+    if not file or file.filename == "":
+        return None
+    return store_stream(file.stream, file.filename)
+
+
+def store_path(path):
+    """로컬 파일을 업로드와 같은 방식으로 저장 (`flask items import` 용)"""
+    with open(path, "rb") as f:
+        return store_stream(f, os.path.basename(path))
+
+
+def store_stream(stream, filename):
+    # 변환할 수 없는 확장자(.tiff, .heic 등)는 .jpg 로 저장 → images.py 가 JPEG 로 다시 저장
+    ext = images.stored_extension(os.path.splitext(secure_filename(filename))[1])
+    base = upload_dir()
+    tmp_dir = os.path.join(base, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    limit = current_app.config.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+    tmp, digest, size = _stream_to_temp(stream, tmp_dir, limit)
+    metrics.upload_bytes.inc(size)
+
+    blob = _ensure_blob(digest, f"{digest[:2]}/{digest[2:4]}/{digest}{ext}", size)
+    final = os.path.join(base, *blob.path.split("/"))
+
+    if os.path.exists(final):
+        # 이미 있는 사진 → 파일은 그대로 재사용
+        # (행을 잡은 뒤에 확인하므로 collect 가 막 지운 파일을 재사용하지 않음)
+        os.remove(tmp)
+        metrics.upload_files.inc(result="dedup")
+    else:
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        os.replace(tmp, final)
+        images.submit(final)
+        metrics.upload_files.inc(result="new")
+
+    return URL_PREFIX + blob.path
+
+
+# =====================================================
+# 🔹 refcount (매퍼 이벤트, 물품과 같은 트랜잭션)
+# =====================================================
+def _adjust(connection, target, url, delta):
+    digest = digest_from_url(url)
+    if not digest:
+        return
+    table = Blob.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.digest == digest)
+        .values(refcount=table.c.refcount + delta)
+    )
+    if delta < 0:
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("released_blobs", set()).add(digest)
+
+
+def _after_insert(mapper, connection, target):
+    _adjust(connection, target, target.image, +1)
+
+
+def _after_update(mapper, connection, target):
+    history = inspect(target).attrs.image.history
+    if not history.has_changes():
+        return
+    for url in history.added:
+        _adjust(connection, target, url, +1)
+    for url in history.deleted:
+        _adjust(connection, target, url, -1)
+
+
+def _after_delete(mapper, connection, target):
+    _adjust(connection, target, target.image, -1)
+
+
+def add_refs(counts):
+    """
+    {digest: 개수} 만큼 refcount 증가 (현재 세션 트랜잭션 안)
+    매퍼 이벤트를 거치지 않는 대량 추가(`flask items import`)용
+    """
+    if not counts:
+        return
+    table = Blob.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.digest == bindparam("d"))
+        .values(refcount=table.c.refcount + bindparam("n")),
+        [{"d": digest, "n": n} for digest, n in counts.items()],
+    )
+
+
+for _Model in (LostItem, FoundItem):
+    event.listen(_Model, "after_insert", _after_insert)
+    event.listen(_Model, "after_update", _after_update)
+    event.listen(_Model, "after_delete", _after_delete)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    released = session.info.pop("released_blobs", None)
+    if released and has_app_context():
+        collect(released)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("released_blobs", None)
+
+
+# =====================================================
+# 🔹 정리 (GC)
+# =====================================================
+def _remove_files(path):
+    for p in [path] + list(images.variant_paths(path).values()):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+    images.forget(URL_PREFIX + os.path.relpath(path, upload_dir()).replace(os.sep, "/"))
+
+
+def collect(digests=None):
+    """
+    refcount 가 0 이하인 blob 의 행과 파일 삭제, 지운 개수 반환
+    digests 를 주면 그 blob 들만 확인 (삭제 직후 호출용)
+    """
+    table = Blob.__table__
+    query = select(table.c.digest, table.c.path).where(table.c.refcount <= 0)
+    if digests is not None:
+        query = query.where(table.c.digest.in_(list(digests)))
+
+    removed = 0
+    with db.engine.begin() as conn:
+        for digest, path in conn.execute(query).all():
+            # 그 사이에 다시 참조되었으면 (refcount > 0) 지우지 않음
+            deleted = conn.execute(
+                table.delete().where(table.c.digest == digest, table.c.refcount <= 0)
+            ).rowcount
+            if deleted:
+                _remove_files(os.path.join(upload_dir(), *path.split("/")))
+                removed += 1
+    return removed
+
+
+def sweep_orphans(grace_seconds=3600):
+    """
+    blob 행이 없는 파일 / 남은 임시 파일 삭제 (업로드 도중 실패한 흔적)
+    진행 중인 업로드를 건드리지 않도록 grace_seconds 보다 오래된 것만
+    """
+    base = upload_dir()
+    known = {p.rsplit("/", 1)[-1][:64] for p in db.session.scalars(select(Blob.path))}
+    cutoff = time.time() - grace_seconds
+    removed = 0
+
+    for root, dirs, files in os.walk(base):
+        rel_root = os.path.relpath(root, base).replace(os.sep, "/")
+        if rel_root == ".":
+            # 최상위에는 예전 방식 업로드가 있으므로 샤드 디렉터리와 .tmp 만 확인
+            dirs[:] = [d for d in dirs if d == ".tmp" or re.fullmatch(r"[0-9a-f]{2}", d)]
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.getmtime(path) > cutoff:
+                continue
+            if rel_root == ".tmp":
+                os.remove(path)
+                removed += 1
+                continue
+            m = re.fullmatch(r"([0-9a-f]{64})(?:_thumb)?(\.\w+)?(?:\.variants\.json)?", name)
+            if not m:
+                continue
+            if m.group(1) not in known:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+uploads_cli = AppGroup("uploads", help="업로드 파일 저장소 관리")
+
+
+@uploads_cli.command("gc")
+@click.option("--grace", default=3600, show_default=True, help="이보다 오래된 고아 파일만 삭제(초)")
+def gc_command(grace):
+    """참조되지 않는 blob 과 고아 파일 삭제"""
+    blobs = collect()
+    files = sweep_orphans(grace)
+    click.echo(f"blob {blobs}개, 고아 파일 {files}개 삭제")
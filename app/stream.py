@@ -0,0 +1,286 @@
+# =====================================================
+# 📡 stream.py — 새 물품 실시간 알림 (SSE /stream/items)
+# =====================================================
+#
+# /, /search 를 몇 초마다 다시 불러오는 대신 EventSource 로 새 등록만 받습니다.
+#   const es = new EventSource("/stream/items?category=지갑&place=도서관");
+#   es.addEventListener("item", e => JSON.parse(e.data));
+#
+# - 같은 프로세스: changelog.subscribe 로 커밋 직후 바로 전달 (DB 조회 없음)
+# - 다른 워커: 프로세스마다 꼬리 스레드 하나가 버전 스탬프 파일을 보다가
+#   바뀌면 item_change 에서 새 insert 만 읽어 전달 (이미 보낸 물품은 건너뜀)
+# - 필터: category 는 같은 값, place 는 단어마다 포함 (/search 와 같은 뜻)
+# - 구독자마다 버퍼 STREAM_BUFFER 개. 보내는 쪽은 절대 기다리지 않고, 넘치면
+#   그 구독자만 "overflow" 를 보내고 끊음 → 브라우저가 Last-Event-ID 로 다시
+#   연결하면 놓친 물품을 DB 에서 채워 줌 (id = 물품 id, 가끔 중복될 수 있음)
+# - 기다리는 동안 요청 컨텍스트 / DB 세션을 잡지 않음
+#   gevent 워커: 연결당 greenlet 하나 (threading 이 패치되므로 그대로 동작)
+#   gthread 워커: 연결이 스레드 하나를 점유 → STREAM_MAX_CLIENTS 로 제한하고
+#                 STREAM_MAX_SECONDS 마다 끊어서 스레드를 돌려줌 (브라우저가 재연결)
+# - STREAM_ENABLED 가 꺼져 있으면 404 (기본. 홈 화면도 구독하지 않음)
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func, select
+
+from app import changelog, db, metrics
+from app.auth import login_required
+from app.models import Item, ItemChange
+from app.search_index import RESULT_FIELDS, to_result
+
+OVERFLOW = object()
+
+# 꼬리 스레드가 한 번에 읽는 item_change 행 수
+TAIL_BATCH = 500
+
+stream_bp = Blueprint("stream", __name__)
+
+
+class Subscriber:
+    """연결 하나의 필터 + 제한된 버퍼"""
+
+    def __init__(self, category="", place="", maxsize=100):
+        self.category = category
+        self.places = place.split()
+        self.maxsize = maxsize
+        self.overflowed = False
+        self._buffer = deque()
+        self._cond = threading.Condition()
+
+    def wants(self, item):
+        if self.category and item["category"] != self.category:
+            return False
+        return all(p in (item["place"] or "") for p in self.places)
+
+    def put(self, item):
+        """버퍼가 차 있으면 버리고 False (느린 구독자 때문에 기다리지 않음)"""
+        with self._cond:
+            if self.overflowed:
+                return False
+            if len(self._buffer) >= self.maxsize:
+                self.overflowed = True
+                self._buffer.clear()
+                self._cond.notify()
+                return False
+            self._buffer.append(item)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout):
+        """다음 물품 / 시간 초과면 None / 넘쳤으면 OVERFLOW"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._buffer or self.overflowed, timeout)
+            if self.overflowed:
+                return OVERFLOW
+            return self._buffer.popleft() if self._buffer else None
+
+
+class Hub:
+    """프로세스 안 구독자 목록 + 다른 워커 변경을 읽는 꼬리 스레드"""
+
+    def __init__(self, remember=10000):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        # 이미 전달한 물품 id (같은 물품을 커밋 훅과 꼬리 스레드가 두 번 보내지 않도록)
+        self._sent = deque(maxlen=remember)
+        self._sent_ids = set()
+        self._tail_pid = None
+
+    def subscribe(self, sub):
+        with self._lock:
+            self._subscribers.add(sub)
+            metrics.stream_clients.set(len(self._subscribers))
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+            metrics.stream_clients.set(len(self._subscribers))
+
+    def count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, items):
+        with self._lock:
+            fresh = []
+            for item in items:
+                if item["id"] in self._sent_ids:
+                    continue
+                if len(self._sent) == self._sent.maxlen:
+                    self._sent_ids.discard(self._sent[0])
+                self._sent.append(item["id"])
+                self._sent_ids.add(item["id"])
+                fresh.append(item)
+            subscribers = list(self._subscribers)
+
+        for sub in subscribers:
+            for item in fresh:
+                if sub.wants(item) and not sub.put(item):
+                    break
+
+    # ---- 다른 워커에서 등록된 물품 ----
+    def start_tail(self, app):
+        """프로세스(fork 후 워커)마다 한 번"""
+        with self._lock:
+            if self._tail_pid == os.getpid():
+                return
+            self._tail_pid = os.getpid()
+        threading.Thread(target=self._tail, args=(app,), name="stream-tail", daemon=True).start()
+
+    def _tail(self, app):
+        interval = float(app.config.get("STREAM_POLL_SECONDS", 1.0))
+        with app.app_context():
+            path = changelog.stamp_path()
+            last_change = db.session.execute(select(func.max(ItemChange.id))).scalar() or 0
+        stamp = changelog.read_stamp(path)
+
+        while True:
+            time.sleep(interval)
+            current = changelog.read_stamp(path)
+            if current == stamp:
+                continue
+            stamp = current
+            try:
+                with app.app_context():
+                    last_change = self._read_inserts(last_change)
+            except Exception:
+                app.logger.exception("SSE 변경 기록 읽기 실패")
+
+    def _read_inserts(self, last_change):
+        while True:
+            rows = db.session.execute(
+                select(ItemChange.id, ItemChange.item_id)
+                .where(ItemChange.id > last_change, ItemChange.op == "insert")
+                .order_by(ItemChange.id)
+                .limit(TAIL_BATCH)
+            ).all()
+            if not rows:
+                return last_change
+            last_change = rows[-1].id
+
+            with self._lock:
+                ids = [r.item_id for r in rows if r.item_id not in self._sent_ids]
+            if ids:
+                found = {
+                    row.id: to_result(row, RESULT_FIELDS)
+                    for row in _item_query().filter(Item.id.in_(ids))
+                }
+                self.publish([found[i] for i in ids if i in found])
+            if len(rows) < TAIL_BATCH:
+                return last_change
+
+
+hub = Hub()
+
+
+@changelog.subscribe
+def _on_commit(changes):
+    items = [to_result(c.item, RESULT_FIELDS) for c in changes if c.op == "insert"]
+    if items:
+        hub.publish(items)
+
+
+def _item_query():
+    return db.session.query(*[getattr(Item, f) for f in RESULT_FIELDS])
+
+
+def items_after(item_id, category="", place="", limit=100):
+    """Last-Event-ID 이후에 등록된 물품 (재연결할 때 놓친 것 채우기)"""
+    query = _item_query().filter(Item.id > item_id)
+    if category:
+        query = query.filter(Item.category == category)
+    for word in place.split():
+        query = query.filter(Item.place.contains(word))
+    return [to_result(row, RESULT_FIELDS) for row in query.order_by(Item.id).limit(limit)]
+
+
+def sse(data, event=None, event_id=None):
+    """SSE 이벤트 하나 (data 는 JSON 으로)"""
+    head = ""
+    if event_id is not None:
+        head += f"id: {event_id}\n"
+    if event:
+        head += f"event: {event}\n"
+    return head + "data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n\n"
+
+
+def _event(item):
+    return sse(item, "item", item["id"])
+
+
+def _events(sub, backlog, retry_ms, keepalive, max_seconds):
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        for item in backlog:
+            yield _event(item)
+
+        deadline = time.monotonic() + max_seconds
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return                      # 브라우저가 retry 후 다시 연결
+            item = sub.get(min(keepalive, left))
+            if item is None:
+                yield ": keepalive\n\n"     # 끊긴 연결은 여기서 쓰기 실패로 정리됨
+            elif item is OVERFLOW:
+                metrics.stream_events.inc(result="overflow")
+                yield sse({}, "overflow")
+                return
+            else:
+                metrics.stream_events.inc(result="sent")
+                yield _event(item)
+    finally:
+        hub.unsubscribe(sub)
+
+
+# =====================================================
+# 🔹 GET /stream/items
+# =====================================================
+@stream_bp.route("/items")
+@login_required
+def items():
+    config = current_app.config
+    if not config["STREAM_ENABLED"]:
+        # EventSource 는 200 이 아닌 응답이면 다시 연결하지 않음
+        return jsonify({"error": "실시간 알림이 꺼져 있습니다."}), 404
+    if hub.count() >= config["STREAM_MAX_CLIENTS"]:
+        resp = jsonify({"error": "실시간 알림 연결이 너무 많습니다. 잠시 후 다시 시도해 주세요."})
+        resp.status_code = 503
+        resp.headers["Retry-After"] = str(config["STREAM_RETRY_MS"] // 1000 or 1)
+        return resp
+
+    category = request.args.get("category", "")
+    place = request.args.get("place", "")
+    sub = hub.subscribe(Subscriber(category, place, config["STREAM_BUFFER"]))
+    hub.start_tail(current_app._get_current_object())
+
+    # 구독을 먼저 걸고 놓친 물품을 읽음 (사이에 등록된 물품이 빠지지 않도록)
+    last_id = request.headers.get("Last-Event-ID", "")
+    backlog = []
+    if last_id.isdigit():
+        try:
+            backlog = items_after(int(last_id), category, place, config["STREAM_BUFFER"])
+        except Exception:
+            hub.unsubscribe(sub)
+            raise
+
+    resp = current_app.response_class(
+        _events(
+            sub, backlog,
+            config["STREAM_RETRY_MS"],
+            config["STREAM_KEEPALIVE_SECONDS"],
+            config["STREAM_MAX_SECONDS"],
+        ),
+        mimetype="text/event-stream",
+    )
+    # 스트림을 한 번도 읽기 전에 끊겨도 구독 해제
+    resp.call_on_close(lambda: hub.unsubscribe(sub))
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"       # nginx 가 모아서 보내지 않도록
+    return resp
@@ -0,0 +1,134 @@
+# =====================================================
+# 👤 users.py — 현재 사용자 (g.current_user) / 프로세스 사용자 캐시
+# =====================================================
+#
+# 세션에는 user_id 만 믿고, 권한(is_admin) 은 매 요청 실제 사용자 정보로 확인합니다.
+# 매번 DB 를 읽지 않도록
+#   - 요청 안: g.current_user 를 처음 쓸 때 한 번만 로드
+#   - 프로세스 안: user_id → (id, username, is_admin) 스냅샷 캐시
+# 를 두고, User 가 바뀌어 커밋되면 캐시에서 빼고 "<db 파일>.users" 스탬프를
+# 갱신합니다. 다른 워커는 요청마다 스탬프 mtime 만 확인해 바뀌었으면 캐시를 비우므로,
+# admin.toggle_admin 같은 권한 변경이 모든 워커에 즉시 반영됩니다.
+
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from flask import g, has_request_context, session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from werkzeug.local import LocalProxy
+
+from app import db, changelog
+from app.cache import _registry
+from app.models import User
+
+STAMP_KIND = "users"
+
+
+class UserCache:
+    """user_id → 사용자 스냅샷 (LRU, 스탬프가 바뀌면 전체 무효화)"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.hits = 0
+        self.misses = 0
+        _registry["users"] = self
+
+    def _check_stamp(self):
+        stamp = changelog.read_stamp(changelog.stamp_path(STAMP_KIND))
+        with self._lock:
+            if stamp != self._stamp:
+                self._store.clear()
+                self._stamp = stamp
+
+    def get(self, user_id):
+        """스냅샷 반환, 없는 사용자면 None (app context 필요)"""
+        if not user_id:
+            return None
+        self._check_stamp()
+        with self._lock:
+            if user_id in self._store:
+                self._store.move_to_end(user_id)
+                self.hits += 1
+                return self._store[user_id]
+            self.misses += 1
+
+        user = db.session.get(User, user_id)
+        info = None if user is None else SimpleNamespace(
+            id=user.id, username=user.username, is_admin=bool(user.is_admin)
+        )
+        with self._lock:
+            self._store[user_id] = info
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+        return info
+
+    def forget(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._store.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._store)}
+
+
+user_cache = UserCache()
+
+
+# =====================================================
+# 🔹 User 변경 → 캐시 무효화
+# =====================================================
+def _record(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("user_changes", set()).add(target.id)
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(User, _event, _record)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    changed = session.info.pop("user_changes", None)
+    if not changed:
+        return
+    user_cache.forget(changed)
+    # 다른 워커는 다음 요청에서 스탬프가 바뀐 것을 보고 캐시를 비움
+    changelog.touch_stamp(STAMP_KIND)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("user_changes", None)
+
+
+# =====================================================
+# 🔹 현재 사용자
+# =====================================================
+def get_current_user():
+    """세션의 사용자 스냅샷 (요청당 한 번만 조회, 로그인 안 했거나 삭제됐으면 None)"""
+    if not has_request_context():
+        return None
+    if "_current_user" not in g:
+        g._current_user = user_cache.get(session.get("user_id"))
+    return g._current_user
+
+
+def install(app):
+    """g.current_user 를 요청마다 지연 로딩 프록시로 설정"""
+    @app.before_request
+    def _bind_current_user():
+        g.current_user = LocalProxy(get_current_user)
+
+    @app.context_processor
+    def _inject_current_user():
+        return {"current_user": LocalProxy(get_current_user)}
@@ -3,7 +3,11 @@
 # =====================================================
 
 from collections import defaultdict
+from datetime import date
+from flask import current_app
+from sqlalchemy import func
 from .models import db, LostItem, FoundItem
+from .cache import stats_cache
 
 # 🔹 카테고리 목록 (원하는 대로 수정 가능)
 CATEGORIES = [
@@ -16,46 +20,68 @@ LOCATIONS = [
 ]
 
 
-def statistics_data():
+def parse_date(value):
     """
-    전체 분실물/습득물 통계 데이터를 계산하는 함수
-    반환:
-      total_lost, total_found,
-      lost_stats (카테고리별 분실 수),
-      found_stats (카테고리별 습득 수),
-      location_stats = { 장소: {"lost": x, "found": y} }
+    'YYYY-MM-DD' 문자열 → date (비어 있거나 형식이 틀리면 None)
+    """
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat((value or "").strip())
+    except ValueError:
+        return None
+
+
+def _group_counts(Model, column):
+    """
+    column 값별 개수 (NULL / 빈 문자열은 "기타")
+    행을 읽지 않고 SQL GROUP BY 로 개수만 가져옵니다.
     """
-    # 전체 개수
-    total_lost = LostItem.query.count()
-    total_found = FoundItem.query.count()
+    key = func.coalesce(func.nullif(column, ""), "기타")
+    rows = db.session.query(key, func.count(Model.id)).group_by(key)
+    return {k: n for k, n in rows}
 
-    # 카테고리별 통계
-    lost_stats = defaultdict(int)
-    found_stats = defaultdict(int)
 
-    for item in LostItem.query.all():
-        lost_stats[item.category or "기타"] += 1
+def _compute_statistics():
+    lost_stats = _group_counts(LostItem, LostItem.category)
+    found_stats = _group_counts(FoundItem, FoundItem.category)
 
-    for item in FoundItem.query.all():
-        found_stats[item.category or "기타"] += 1
+    # 전체 개수 = 카테고리별 개수의 합
+    total_lost = sum(lost_stats.values())
+    total_found = sum(found_stats.values())
 
     # 장소별 통계
     location_stats = defaultdict(lambda: {"lost": 0, "found": 0})
 
-    for item in LostItem.query.all():
-        key = item.place or "기타"
-        location_stats[key]["lost"] += 1
+    for place, n in _group_counts(LostItem, LostItem.place).items():
+        location_stats[place]["lost"] = n
 
-    for item in FoundItem.query.all():
-        key = item.place or "기타"
-        location_stats[key]["found"] += 1
+    for place, n in _group_counts(FoundItem, FoundItem.place).items():
+        location_stats[place]["found"] = n
 
     # dict 로 변환해서 반환
     return (
         total_lost,
         total_found,
-        dict(lost_stats),
-        dict(found_stats),
+        lost_stats,
+        found_stats,
         dict(location_stats)
     )
 
+
+def statistics_data():
+    """
+    전체 분실물/습득물 통계 데이터를 계산하는 함수
+    반환:
+      total_lost, total_found,
+      lost_stats (카테고리별 분실 수),
+      found_stats (카테고리별 습득 수),
+      location_stats = { 장소: {"lost": x, "found": y} }
+
+    결과는 데이터 버전이 바뀌거나 STATS_CACHE_TTL(초) 이 지날 때까지 메모리에서 재사용합니다.
+    """
+    return stats_cache.get_or_set(
+        "statistics",
+        _compute_statistics,
+        ttl=current_app.config.get("STATS_CACHE_TTL", 60),
+    )
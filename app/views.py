@@ -2,17 +2,26 @@
 # 📄 views.py — 主页面 / 物品 CRUD / AI / 统计
 # =====================================================
 
-import os
 from flask import (
     Blueprint, render_template, request, redirect,
-    jsonify, flash, current_app, url_for, session
+    jsonify, flash, current_app, url_for, session, make_response
 )
-from werkzeug.utils import secure_filename
 
 from app import db
-from app.models import LostItem, FoundItem, Feedback, User
-from app.utils import CATEGORIES, LOCATIONS, statistics_data
-from openai import OpenAI
+from app.models import Item, LostItem, FoundItem, ITEM_CLASSES, Feedback, User
+from app.utils import CATEGORIES, LOCATIONS, statistics_data, parse_date
+from app.ai_match import ai_match_items
+from app.search_index import search_items
+from app.pagination import page_size, page_url
+from app import llm
+from app.llm import LLMBusyError
+from app.cache import ai_cache
+from app import storage
+from app import matcher
+from app import fragments
+from app.fragments import conditional_page
+from app.stream import sse
+from app.api import list_items as api_list_items
 
 # ---- 使用 auth.py 中的登录与管理员检测 ----
 from app.auth import login_required, admin_required
@@ -23,14 +32,14 @@ from app.auth import login_required, admin_required
 # =====================================================
 views = Blueprint("views", __name__)
 
+# 템플릿에서 {{ select_options("categories", categories, 선택값) }}
+views.add_app_template_global(fragments.select_options, "select_options")
+
 
 # =====================================================
 # 🔹 首页（必须登录）
 # =====================================================
-@views.route("/")
-@login_required
-def home():
-
+def _recent_items_context():
     recent_lost = LostItem.query.order_by(LostItem.id.desc()).limit(3).all()
     recent_found = FoundItem.query.order_by(FoundItem.id.desc()).limit(3).all()
 
@@ -64,13 +73,20 @@ def home():
         "found_items": len(recent_found),
         "pending_items": len(recent_lost),
     }
+    return {"items_recent": items_recent, "stats": stats}
+
 
+@views.route("/")
+@login_required
+@conditional_page()
+def home():
+    # 최근 등록 카드는 데이터 버전이 같으면 렌더링된 HTML 재사용 (fragments.py)
     return render_template(
         "index.html",
         categories=CATEGORIES,
         locations=LOCATIONS,
-        items_recent=items_recent,
-        stats=stats,
+        recent_items=fragments.render("recent_items", "_recent_items.html", _recent_items_context),
+        live_items=current_app.config["STREAM_ENABLED"],
     )
 
 
@@ -78,14 +94,22 @@ def home():
 # 🔹 保存上传文件
 # =====================================================
 def save_uploaded_file(file):
-    if not file or file.filename == "":
-        return None
-    filename = secure_filename(file.filename)
-    upload_dir = os.path.join(current_app.root_path, "static", "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    save_path = os.path.join(upload_dir, filename)
-    file.save(save_path)
-    return "/static/uploads/" + filename
+    # 내용 해시로 저장 (같은 사진은 한 번만, 리사이즈/썸네일은 백그라운드) — storage.py
+    return storage.store(file)
+
+
+# JSON 으로 답하는 경로 (폼 페이지가 아니므로 flash + 리다이렉트 대신 JSON 413)
+JSON_PREFIXES = ("/api/", "/ai/", "/auth/api/", "/stream/")
+
+
+@views.app_errorhandler(413)
+def upload_too_large(e):
+    limit_mb = current_app.config.get("UPLOAD_MAX_BYTES", 0) // (1024 * 1024)
+    message = f"파일이 너무 큽니다. (최대 {limit_mb}MB)"
+    if request.is_json or request.path.startswith(JSON_PREFIXES):
+        return jsonify({"error": message}), 413
+    flash(message, "danger")
+    return redirect(request.referrer or url_for("views.home"))
 
 
 # =====================================================
@@ -99,7 +123,7 @@ def register():
         name = request.form.get("name")
         category = request.form.get("category")
         place = request.form.get("place")
-        date = request.form.get("date")
+        date = parse_date(request.form.get("date"))
         contact = request.form.get("contact")
         description = request.form.get("description")
 
@@ -109,7 +133,7 @@ def register():
             flash("필수 입력값이 누락되었습니다.", "danger")
             return redirect(url_for("views.register"))
 
-        Model = LostItem if item_type == "lost" else FoundItem
+        Model = ITEM_CLASSES.get(item_type, FoundItem)
         item = Model(
             name=name,
             category=category,
@@ -137,79 +161,79 @@ def register():
 # =====================================================
 @views.route("/search")
 @login_required
+@conditional_page()
 def search():
     keyword = request.args.get("keyword", "")
     category = request.args.get("category", "")
     place = request.args.get("place", "")
     date = request.args.get("date", "")
 
-    def apply_filters(query, Model):
-        if keyword:
-            query = query.filter(Model.name.contains(keyword))
-        if category:
-            query = query.filter_by(category=category)
-        if place:
-            query = query.filter(Model.place.contains(place))
-        if date:
-            query = query.filter_by(date=date)
-        return query
-
-    lost_items = apply_filters(LostItem.query, LostItem).all()
-    found_items = apply_filters(FoundItem.query, FoundItem).all()
-
-    results = [
-        {
-            "id": i.id,
-            "type": "lost",
-            "name": i.name,
-            "category": i.category,
-            "place": i.place,
-            "date": i.date,
-            "image": i.image
-        }
-        for i in lost_items
-    ] + [
-        {
-            "id": i.id,
-            "type": "found",
-            "name": i.name,
-            "category": i.category,
-            "place": i.place,
-            "date": i.date,
-            "image": i.image
-        }
-        for i in found_items
-    ]
+    results, next_cursor = search_items(
+        keyword, category, place, date,
+        cursor=request.args.get("cursor"), size=page_size(),
+    )
 
     return render_template(
         "search.html",
         results=results,
+        next_url=page_url(next_cursor) if next_cursor else None,
+        first_url=page_url(None) if request.args.get("cursor") else None,
         categories=CATEGORIES,
         locations=LOCATIONS,
     )
 
 
+# =====================================================
+# 🔹 搜索 API（JSON）— 예전 경로, /api/v1/items 로 대체 (deprecated)
+# =====================================================
+@views.route("/api/search")
+def search_api():
+    # 구현을 따로 두지 않고 v1 목록(필드 선택 / 커서 / ETag)을 그대로 사용
+    # 응답 모양은 예전(items, next_cursor)을 포함하는 상위 집합
+    resp = make_response(api_list_items())
+    resp.headers["Deprecation"] = "true"
+    resp.headers["Link"] = f'<{url_for("api.list_items")}>; rel="successor-version"'
+    return resp
+
+
 # =====================================================
 # 🔹 详情页
 # =====================================================
+def find_item(item_id, item_type=None):
+    """
+    기본 키로 한 번만 조회 (LostItem / FoundItem 인스턴스)
+    /item/lost/<id> 처럼 종류가 주어졌는데 다르면 None
+    """
+    item = db.session.get(Item, item_id)
+    if item is None or (item_type and item.type != item_type):
+        return None
+    return item
+
+
 @views.route("/item/<int:item_id>")
+@views.route("/item/<any(lost, found):item_type>/<int:item_id>")
 @login_required
-def item_detail(item_id):
-    item = LostItem.query.get(item_id) or FoundItem.query.get(item_id)
+def item_detail(item_id, item_type=None):
+    item = find_item(item_id, item_type)
     if not item:
         return "해당 물품을 찾을 수 없습니다.", 404
 
-    item_type = "lost" if isinstance(item, LostItem) else "found"
-    return render_template("item_detail.html", item=item, item_type=item_type)
+    return render_template(
+        "item_detail.html",
+        item=item,
+        item_type=item.type,
+        matches=matcher.matches_for(item),
+    )
 
 
 # =====================================================
 # 🔹 编辑物品
 # =====================================================
 @views.route("/edit/<int:item_id>", methods=["GET", "POST"])
+@views.route("/edit/<any(lost, found):item_type>/<int:item_id>", methods=["GET", "POST"])
 @login_required
-def edit_item(item_id):
-    item = LostItem.query.get(item_id) or FoundItem.query.get(item_id)
+def edit_item(item_id, item_type=None):
+    item = find_item(item_id, item_type)
     if not item:
         return "항목을 찾을 수 없습니다.", 404
 
@@ -217,7 +241,7 @@ def edit_item(item_id):
         item.name = request.form.get("name")
         item.category = request.form.get("category")
         item.place = request.form.get("place")
-        item.date = request.form.get("date")
+        item.date = parse_date(request.form.get("date"))
         item.contact = request.form.get("contact")
         item.description = request.form.get("description")
 
@@ -227,7 +251,7 @@ def edit_item(item_id):
 
         db.session.commit()
         flash("수정이 완료되었습니다!", "success")
-        return redirect(url_for("views.item_detail", item_id=item.id))
+        return redirect(url_for("views.item_detail", item_type=item.type, item_id=item.id))
 
     return render_template("edit_item.html", item=item)
 
@@ -236,9 +260,10 @@ def edit_item(item_id):
 # 🔹 删除物品
 # =====================================================
 @views.route("/delete/<int:item_id>", methods=["POST"])
+@views.route("/delete/<any(lost, found):item_type>/<int:item_id>", methods=["POST"])
 @login_required
-def delete_item(item_id):
-    item = LostItem.query.get(item_id) or FoundItem.query.get(item_id)
+def delete_item(item_id, item_type=None):
+    item = find_item(item_id, item_type)
     if not item:
         return "항목을 찾을 수 없습니다.", 404
     db.session.delete(item)
@@ -250,6 +275,13 @@ def delete_item(item_id):
 # =====================================================
 # 🔹 AI 问答页面
 # =====================================================
+def _qa_messages(question):
+    return [
+        {"role": "system", "content": "친절한 AI 분실물 도움 도우미입니다."},
+        {"role": "user", "content": question}
+    ]
+
+
 @views.route("/ai", methods=["GET", "POST"])
 @login_required
 def ai_page():
@@ -261,21 +293,73 @@ def ai_page():
             ai_answer = "질문이 비어 있습니다."
         else:
             try:
-                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                resp = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "친절한 AI 분실물 도움 도우미입니다."},
-                        {"role": "user", "content": question}
-                    ]
-                )
-                ai_answer = resp.choices[0].message.content
+                # 같은 질문(정규화 기준)은 캐시된 답변 재사용
+                ai_answer = ai_cache.get_or_set("qa", question, lambda: llm.chat(_qa_messages(question)))
+            except LLMBusyError as e:
+                ai_answer = str(e)
             except Exception as e:
                 ai_answer = f"오류 발생: {e}"
 
     return render_template("ai_search.html", ai_answer=ai_answer)
 
 
+# =====================================================
+# 🔹 AI 问答（流式）— 토큰이 도착하는 대로 SSE 로 전달
+# =====================================================
+def _answer_events(chunks, cache_key=None):
+    """
+    data: {"delta": "..."} 를 조각마다, 끝나면 event: done
+    다 받은 답변만 캐시 (중간에 끊기면 저장 안 함)
+    """
+    parts = []
+    try:
+        for delta in chunks:
+            parts.append(delta)
+            yield sse({"delta": delta})
+    except llm.LLMError as e:
+        yield sse({"error": f"오류 발생: {e}"}, "error")
+        return
+    if cache_key is not None:
+        ai_cache.set(cache_key, "".join(parts))
+    yield sse({}, "done")
+
+
+@views.route("/ai/stream", methods=["POST"])
+@login_required
+def ai_stream():
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        question = data.get("question", "")
+    else:
+        question = request.form.get("question", "")
+    if not isinstance(question, str):
+        return jsonify({"error": "질문은 문자열이어야 합니다."}), 400
+    if not question:
+        return jsonify({"error": "질문이 비어 있습니다."}), 400
+
+    key = ai_cache.current_key("qa", question)
+    cached = ai_cache.get(key)
+    if cached is not None:
+        chunks = None
+        events = _answer_events([cached])
+    else:
+        try:
+            chunks = llm.stream_chat(_qa_messages(question))
+        except LLMBusyError as e:
+            return jsonify({"error": str(e)}), 503
+        except Exception as e:
+            return jsonify({"error": f"오류 발생: {e}"}), 502
+        events = _answer_events(chunks, key)
+
+    resp = current_app.response_class(events, mimetype="text/event-stream")
+    if chunks is not None:
+        # 클라이언트가 끊으면 (중지 버튼 / 창 닫기) 업스트림 요청도 닫음
+        resp.call_on_close(chunks.close)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
 # =====================================================
 # 🔹 AI 自动匹配（用于前端 fetch）
 # =====================================================
@@ -288,32 +372,8 @@ def ai_match():
     if not user_text:
         return jsonify({"error": "설명이 비었습니다."}), 400
 
-    def item_to_text(i, tag):
-        return f"[{tag}] {i.name} / {i.category} / {i.place} / {i.date} / {i.description}\n"
-
-    db_text = ""
-    for i in LostItem.query.all():
-        db_text += item_to_text(i, "분실")
-    for i in FoundItem.query.all():
-        db_text += item_to_text(i, "습득")
-
-    prompt = f"""
-사용자 설명: \"{user_text}\"
-DB 목록:
-{db_text}
-가장 유사한 3개 항목을 JSON 배열 형식으로 추천해 주세요.
-"""
-
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "AI 분실물 자동 매칭 전문가"},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return jsonify({"matches": resp.choices[0].message.content})
+        return jsonify({"matches": ai_match_items(user_text, limit=3)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -341,21 +401,30 @@ def contact():
 # =====================================================
 # 🔹 统计页面
 # =====================================================
+def _stats_charts_context():
+    total_lost, total_found, lost_stats, found_stats, location_stats = statistics_data()
+    return {
+        "lost_labels": list(lost_stats.keys()),
+        "lost_values": list(lost_stats.values()),
+        "found_labels": list(found_stats.keys()),
+        "found_values": list(found_stats.values()),
+        "location_stats": location_stats,
+    }
+
+
 @views.route("/statistics")
 @login_required
+@conditional_page(lambda: [matcher.matched_count()])
 def statistics_page():
-    total_lost, total_found, lost_stats, found_stats, location_stats = statistics_data()
+    # 매칭은 데이터 버전과 따로 바뀌므로 ETag 에 매칭 수를 포함
+    total_lost, total_found, _, _, _ = statistics_data()
 
     return render_template(
         "statistics.html",
         lost_count=total_lost,
         found_count=total_found,
-        matched_count=0,
-        lost_labels=list(lost_stats.keys()),
-        lost_values=list(lost_stats.values()),
-        found_labels=list(found_stats.keys()),
-        found_values=list(found_stats.values()),
-        location_stats=location_stats,
+        matched_count=matcher.matched_count(),
+        charts=fragments.render("stats_charts", "_stats_charts.html", _stats_charts_context),
     )
 
 
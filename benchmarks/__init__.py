@@ -0,0 +1,17 @@
+# =====================================================
+# ⏱ benchmarks — 성능 측정 스크립트 모음
+# =====================================================
+#
+# 모두 저장소 최상위에서 모듈로 실행하고, 결과는 JSON 으로 출력합니다.
+# (common.write_report 가 커밋 / 환경 정보를 붙이므로 커밋끼리 비교 가능)
+#
+#   python -m benchmarks.load                    엔드포인트 부하 (p50/p95/p99, 처리량, RSS)
+#   python -m benchmarks.bench_indexes           인덱스 전/후 쿼리 시간
+#   python -m benchmarks.bench_sqlite_contention 다중 프로세스 SQLite 경합
+#   python -m benchmarks.bench_match_backfill    자동 매칭 전체 계산
+#   python -m benchmarks.bench_login_throttle    로그인 공격 시 CPU
+#   python -m benchmarks.bench_startup           import / create_app / gunicorn 부팅 시간, 메모리
+#   python -m benchmarks.bench_ai_stream         AI 질문 첫 바이트 시간 (일반 vs 스트리밍), 취소
+#   python -m benchmarks.fake_llm                가짜 OpenAI 호환 서버
+#
+# 공통 도구: common.py (백분위수 / RSS / 보고서), seed.py (가짜 데이터)
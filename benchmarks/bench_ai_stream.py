@@ -0,0 +1,182 @@
+# =====================================================
+# ⏱ bench_ai_stream.py — AI 질문 첫 바이트 시간 (일반 vs 스트리밍)
+# =====================================================
+#
+# 가짜 LLM 서버(fake_llm.py, 첫 토큰 --delay + 토큰마다 --token-delay)를 두고
+# 실제 HTTP 서버(werkzeug, 스레드)로 띄운 앱에
+#   - blocking : POST /ai        (답변을 다 받은 뒤 페이지 렌더링)
+#   - stream   : POST /ai/stream (토큰이 오는 대로 SSE)
+# 를 보내 첫 바이트(TTFB) / 첫 답변 조각 / 전체 시간을 잽니다.
+# 질문마다 번호를 붙여 AI 결과 캐시에 맞지 않게 합니다.
+#
+# 취소: 스트림에서 첫 조각을 받자마자 연결을 끊고, 가짜 LLM 서버가 생성을
+# 멈출 때까지(= 업스트림 요청이 닫힐 때까지) 걸린 시간을 잽니다.
+#
+#   python -m benchmarks.bench_ai_stream --requests 20 --delay 0.3 --token-delay 0.02 --words 80
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+from benchmarks.common import latency_summary, write_report  # noqa: E402
+from benchmarks.fake_llm import start_fake_server  # noqa: E402
+from benchmarks.seed import BENCH_USER, create_accounts  # noqa: E402
+
+
+class Client:
+    """쿠키 하나를 들고 다니는 http.client 래퍼 (요청마다 새 연결)"""
+
+    def __init__(self, port):
+        self.port = port
+        self.cookie = None
+
+    def open(self, method, path, body=None, content_type=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        headers = {"Cookie": self.cookie} if self.cookie else {}
+        if content_type:
+            headers["Content-Type"] = content_type
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        cookie = resp.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";", 1)[0]
+        return conn, resp
+
+    def login(self):
+        body = json.dumps({"username": BENCH_USER[0], "password": BENCH_USER[1]})
+        conn, resp = self.open("POST", "/auth/api/login", body, "application/json")
+        resp.read()
+        conn.close()
+        if resp.status != 200:
+            raise RuntimeError(f"벤치마크 계정 로그인 실패: {resp.status}")
+
+
+def blocking_once(client, question):
+    t0 = time.perf_counter()
+    body = urllib.parse.urlencode({"question": question})
+    conn, resp = client.open("POST", "/ai", body, "application/x-www-form-urlencoded")
+    resp.read(1)
+    first = time.perf_counter() - t0
+    resp.read()
+    total = time.perf_counter() - t0
+    conn.close()
+    # 일반 페이지는 답변이 끝나야 첫 바이트가 나오므로 첫 조각 = 첫 바이트
+    return first, first, total
+
+
+def stream_once(client, question, cancel=False):
+    t0 = time.perf_counter()
+    conn, resp = client.open("POST", "/ai/stream", json.dumps({"question": question}), "application/json")
+    if resp.status != 200:
+        raise RuntimeError(f"/ai/stream 실패: {resp.status} {resp.read()[:200]!r}")
+    first_byte = first_delta = None
+    for line in resp:
+        if first_byte is None:
+            first_byte = time.perf_counter() - t0
+        if first_delta is None and line.startswith(b'data: {"delta"'):
+            first_delta = time.perf_counter() - t0
+            if cancel:
+                break
+    total = time.perf_counter() - t0
+    conn.close()            # 읽다 말고 닫으면 서버는 다음 조각을 쓸 때 끊김을 알게 됨
+    return first_byte, first_delta, total
+
+
+def run_mode(client, fn, requests, tag):
+    first_byte, first_delta, total = [], [], []
+    for n in range(requests):
+        fb, fd, tt = fn(client, f"{tag} {n} 지갑을 잃어버렸어요")
+        first_byte.append(fb * 1000)
+        first_delta.append(fd * 1000)
+        total.append(tt * 1000)
+    seconds = sum(total) / 1000
+    return {
+        "ttfb": latency_summary(first_byte, seconds),
+        "first_answer_chunk": latency_summary(first_delta, seconds),
+        "total": latency_summary(total, seconds),
+    }
+
+
+def measure_cancel(client, stats, repeat):
+    """첫 조각 후 끊기 → 업스트림 생성이 멈출 때까지 (ms)"""
+    samples = []
+    for n in range(repeat):
+        before = stats.get("cancelled", 0)
+        stream_once(client, f"cancel {n} 우산을 잃어버렸어요", cancel=True)
+        t0 = time.perf_counter()
+        while stats.get("cancelled", 0) == before and time.perf_counter() - t0 < 10:
+            time.sleep(0.005)
+        if stats.get("cancelled", 0) > before:
+            samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        "attempts": repeat,
+        "upstream_cancelled": len(samples),
+        "cancel_to_upstream_abort": latency_summary(samples, 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20, help="모드마다 요청 수")
+    parser.add_argument("--delay", type=float, default=0.3, help="가짜 LLM 첫 토큰까지(초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="가짜 LLM 토큰마다(초)")
+    parser.add_argument("--words", type=int, default=80, help="가짜 답변 단어 수")
+    parser.add_argument("--cancel", type=int, default=5, help="취소 측정 횟수")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    llm_server, llm_url = start_fake_server(
+        delay=args.delay, token_delay=args.token_delay, words=args.words,
+    )
+    stats = llm_server.RequestHandlerClass.stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "bench.db"),
+            "DB_AUTO_INIT": True,
+            "MATCH_ENABLED": False,
+            "METRICS_DIR": None,
+            "LOGIN_LIMIT_ENABLED": False,
+            "OPENAI_BASE_URL": llm_url,
+            "LLM_MAX_RETRIES": 0,
+        })
+        with app.app_context():
+            create_accounts()
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)     # 요청 로그 끔
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = Client(server.server_port)
+        client.login()
+
+        try:
+            report = {
+                "benchmark": "ai_stream",
+                "requests": args.requests,
+                "fake_llm": {"delay_s": args.delay, "token_delay_s": args.token_delay, "words": args.words},
+                "blocking": run_mode(client, blocking_once, args.requests, "blocking"),
+                "stream": run_mode(client, stream_once, args.requests, "stream"),
+                "cancel": measure_cancel(client, stats, args.cancel),
+                "fake_llm_streams": dict(stats),
+            }
+        finally:
+            server.shutdown()
+            llm_server.shutdown()
+
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# =====================================================
+# ⏱ bench_indexes.py — 인덱스 적용 전/후 검색·목록 지연 시간
+# =====================================================
+#
+# 임시 SQLite DB 에 N 개(기본 100,000)의 분실물/습득물을 넣고,
+# 0002 마이그레이션의 인덱스를 뺀 상태와 넣은 상태에서
+# 같은 쿼리들을 반복 실행해 중앙값/p95 (ms) 를 JSON 으로 출력합니다.
+#
+#   python -m benchmarks.bench_indexes --rows 100000 --repeat 20
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.migrations import create_item_indexes, drop_item_indexes  # noqa: E402
+from app.models import LostItem  # noqa: E402
+from app.pagination import keyset_page  # noqa: E402
+from app.search_index import search_items  # noqa: E402
+from app.utils import _compute_statistics  # noqa: E402
+from benchmarks.common import write_report  # noqa: E402
+from benchmarks.seed import START_DATE, seed  # noqa: E402
+
+
+def queries():
+    """측정할 쿼리 (이름 → 함수)"""
+    day = START_DATE + timedelta(days=100)
+    return {
+        "search_category": lambda: search_items(category="지갑", size=20),
+        "search_date": lambda: search_items(date=day.isoformat(), size=20),
+        "search_category_date": lambda: search_items(
+            category="가방", date=day.isoformat(), size=20),
+        "date_range_count": lambda: LostItem.query.filter(
+            LostItem.date.between(day, day + timedelta(days=30))).count(),
+        "list_first_page": lambda: keyset_page(LostItem.query, LostItem, None, 20),
+        "list_deep_page": lambda: keyset_page(
+            LostItem.query.filter(LostItem.created_at < datetime(2024, 6, 1)),
+            LostItem, None, 20),
+        "user_items": lambda: LostItem.query.filter_by(user_id=7).all(),
+        "statistics": _compute_statistics,
+    }
+
+
+def measure(repeat):
+    results = {}
+    for name, fn in queries().items():
+        fn()  # 워밍업
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+            db.session.rollback()
+        samples.sort()
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "bench.db"),
+            "DB_AUTO_INIT": True,
+        })
+        with app.app_context():
+            t0 = time.perf_counter()
+            seed(args.rows)
+            seed_seconds = time.perf_counter() - t0
+
+            with db.engine.begin() as conn:
+                drop_item_indexes(conn)
+                conn.execute(text("ANALYZE"))
+            before = measure(args.repeat)
+
+            with db.engine.begin() as conn:
+                create_item_indexes(conn)
+                conn.execute(text("ANALYZE"))
+            after = measure(args.repeat)
+
+    report = {
+        "benchmark": "indexes",
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "seed_seconds": round(seed_seconds, 2),
+        "without_indexes": before,
+        "with_indexes": after,
+        "speedup": {
+            k: round(before[k]["median_ms"] / max(after[k]["median_ms"], 1e-6), 1)
+            for k in before
+        },
+    }
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
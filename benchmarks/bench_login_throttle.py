@@ -0,0 +1,122 @@
+# =====================================================
+# ⏱ bench_login_throttle.py — 로그인 공격 부하에서 워커 CPU 사용량
+# =====================================================
+#
+# 임시 DB 에 사용자 N 명을 만들고, 여러 IP 에서 틀린 비밀번호로
+# /auth/api/login 을 반복 호출(크리덴셜 스터핑 흉내)하면서
+#   - 워커(이 프로세스)가 쓴 CPU 시간 / 걸린 시간
+#   - 응답 코드별 개수 (401 = 해시 계산함, 429 = 해시 전에 거부)
+#   - 공격 중 다른 사용자의 정상 로그인 시간
+# 을 제한 켬/끔 두 경우로 측정해 JSON 으로 출력합니다.
+# 해시 정책별 검증 1회 비용도 같이 잽니다.
+#
+#   python -m benchmarks.bench_login_throttle --attempts 500 --ips 50 --users 20
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import User  # noqa: E402
+from benchmarks.common import write_report  # noqa: E402
+
+POLICIES = ("scrypt:32768:8:1", "pbkdf2:sha256:600000", "pbkdf2:sha256:100000")
+
+
+def hash_cost(method, rounds=5):
+    """검증 1회 평균 (ms)"""
+    pwhash = generate_password_hash("correct horse", method=method)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        check_password_hash(pwhash, "wrong")
+    return round((time.perf_counter() - t0) / rounds * 1000, 1)
+
+
+def run(tmp, limited, args):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, f"bench-{limited}.db"),
+        "MATCH_ENABLED": False,
+        "DB_AUTO_INIT": True,
+        "PASSWORD_HASH_METHOD": args.method,
+        "LOGIN_LIMIT_ENABLED": limited,
+        "LOGIN_LIMIT_PATH": os.path.join(tmp, "limits.db") if args.sqlite else None,
+    })
+    with app.app_context():
+        for i in range(args.users + 1):
+            user = User(username=f"user{i}")
+            user.set_password(f"secret-{i}")
+            db.session.add(user)
+        db.session.commit()
+
+    client = app.test_client()
+    rng = random.Random(42)
+    ips = [f"10.0.{i // 250}.{i % 250 + 1}" for i in range(args.ips)]
+    codes = {}
+
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    for _ in range(args.attempts):
+        resp = client.post(
+            "/auth/api/login",
+            json={"username": f"user{rng.randrange(args.users)}", "password": "guess"},
+            environ_base={"REMOTE_ADDR": rng.choice(ips)},
+        )
+        codes[resp.status_code] = codes.get(resp.status_code, 0) + 1
+    cpu = time.process_time() - cpu0
+    wall = time.perf_counter() - t0
+
+    # 공격받지 않은 사용자(공격 IP 아님)의 정상 로그인
+    t1 = time.perf_counter()
+    resp = client.post(
+        "/auth/api/login",
+        json={"username": f"user{args.users}", "password": f"secret-{args.users}"},
+        environ_base={"REMOTE_ADDR": "192.168.0.10"},
+    )
+    legit_ms = (time.perf_counter() - t1) * 1000
+
+    return {
+        "limited": limited,
+        "status_codes": {str(k): v for k, v in sorted(codes.items())},
+        "cpu_seconds": round(cpu, 2),
+        "wall_seconds": round(wall, 2),
+        "cpu_ms_per_attempt": round(cpu / args.attempts * 1000, 2),
+        "legit_login_status": resp.status_code,
+        "legit_login_ms": round(legit_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--ips", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--method", default=POLICIES[0], help="PASSWORD_HASH_METHOD")
+    parser.add_argument("--sqlite", action="store_true", help="SQLite 버킷 저장소 사용")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [run(tmp, False, args), run(tmp, True, args)]
+
+    report = {
+        "benchmark": "login_throttle",
+        "attempts": args.attempts,
+        "ips": args.ips,
+        "users": args.users,
+        "method": args.method,
+        "store": "sqlite" if args.sqlite else "memory",
+        "hash_verify_ms": {m: hash_cost(m) for m in POLICIES},
+        "runs": runs,
+        "cpu_saved_ratio": round(1 - runs[1]["cpu_seconds"] / max(runs[0]["cpu_seconds"], 1e-6), 3),
+    }
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
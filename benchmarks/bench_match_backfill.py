@@ -0,0 +1,67 @@
+# =====================================================
+# ⏱ bench_match_backfill.py — 자동 매칭 전체 계산 시간 / 메모리
+# =====================================================
+#
+# 임시 SQLite DB 에 N 개(기본 100,000)의 분실물/습득물을 넣고
+# matcher.backfill() 을 실행해 걸린 시간, 저장된 쌍 수, 최대 RSS 를 JSON 으로 출력합니다.
+# 블록(카테고리/장소) + 날짜 창으로 후보를 줄이므로 비교 횟수와 메모리는
+# 전체 행 수가 아니라 batch 크기와 블록 밀도에 따라 정해집니다.
+#
+#   python -m benchmarks.bench_match_backfill --rows 100000 --batch 1000
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, matcher  # noqa: E402
+from benchmarks.common import rss_mb, write_report  # noqa: E402
+from benchmarks.seed import seed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "bench.db"),
+            "MATCH_ENABLED": False,
+            "DB_AUTO_INIT": True,
+        })
+        with app.app_context():
+            t0 = time.perf_counter()
+            seed(args.rows)
+            seed_seconds = time.perf_counter() - t0
+            rss_before = rss_mb()
+
+            batches = []
+            totals = matcher.backfill(
+                batch=args.batch, reset=True,
+                progress=lambda t: batches.append(rss_mb()),
+            )
+
+    report = {
+        "benchmark": "match_backfill",
+        "rows": args.rows,
+        "batch": args.batch,
+        "seed_seconds": round(seed_seconds, 2),
+        "backfill_seconds": totals["seconds"],
+        "lost_items": totals["lost"],
+        "pairs": totals["pairs"],
+        "lost_per_second": round(totals["lost"] / max(totals["seconds"], 1e-6)),
+        "rss_before_mb": rss_before,
+        "rss_peak_mb": rss_mb(),
+        "rss_after_first_batch_mb": batches[0] if batches else None,
+    }
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
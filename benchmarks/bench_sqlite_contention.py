@@ -0,0 +1,145 @@
+# =====================================================
+# ⏱ bench_sqlite_contention.py — 다중 프로세스 읽기/쓰기 경합
+# =====================================================
+#
+# gunicorn 워커 여러 개가 같은 SQLite 파일을 쓰는 상황을 흉내 냅니다.
+# DB_PROFILE 별로 (default / production) 새 DB 파일을 만들고,
+# writer 프로세스는 물품 등록 + 커밋, reader 프로세스는 검색/목록 조회를
+# 정해진 시간 동안 반복합니다. 처리량, 지연 시간, "database is locked" 횟수를 JSON 으로 출력합니다.
+#
+#   python -m benchmarks.bench_sqlite_contention --writers 4 --readers 4 --seconds 10
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import LostItem  # noqa: E402
+from app.pagination import keyset_page  # noqa: E402
+from app.search_index import search_items  # noqa: E402
+from app.utils import CATEGORIES, LOCATIONS  # noqa: E402
+from benchmarks.common import percentile, write_report  # noqa: E402
+
+
+def make_app(db_file, profile, init=False):
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + db_file,
+        "DB_PROFILE": profile,
+        "DB_AUTO_INIT": init,
+    })
+
+
+def worker(role, db_file, profile, seconds, seed, queue):
+    app = make_app(db_file, profile)
+    rnd = random.Random(seed)
+    latencies, errors, ops = [], 0, 0
+
+    with app.app_context():
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            t0 = time.perf_counter()
+            try:
+                if role == "writer":
+                    db.session.add(LostItem(
+                        name=f"{rnd.choice(CATEGORIES)} {seed}-{ops}",
+                        category=rnd.choice(CATEGORIES),
+                        place=rnd.choice(LOCATIONS),
+                        description="경합 벤치마크",
+                    ))
+                    db.session.commit()
+                else:
+                    search_items(category=rnd.choice(CATEGORIES), size=20)
+                    keyset_page(LostItem.query, LostItem, None, 20)
+                    db.session.rollback()
+                ops += 1
+                latencies.append((time.perf_counter() - t0) * 1000)
+            except OperationalError as e:
+                db.session.rollback()
+                if "locked" not in str(e):
+                    raise
+                errors += 1
+
+    queue.put({"role": role, "ops": ops, "errors": errors, "latencies": latencies})
+
+
+def run_profile(profile, args, tmp):
+    db_file = os.path.join(tmp, f"{profile}.db")
+    app = make_app(db_file, profile, init=True)
+    with app.app_context():
+        if profile == "default":
+            # 새 파일은 rollback journal 모드 — WAL 이 아닌 상태를 명시적으로 유지
+            db.session.execute(text("PRAGMA journal_mode = DELETE"))
+        db.session.execute(LostItem.__table__.insert(), [
+            {"type": "lost", "name": f"seed {i}", "category": CATEGORIES[i % len(CATEGORIES)],
+             "place": LOCATIONS[i % len(LOCATIONS)]}
+            for i in range(args.seed_rows)
+        ])
+        db.session.commit()
+        db.session.remove()
+        # 자식 프로세스가 부모의 연결을 물려받지 않도록
+        db.engine.dispose()
+
+    queue = mp.Queue()
+    procs = [
+        mp.Process(target=worker, args=(role, db_file, profile, args.seconds, n, queue))
+        for n, role in enumerate(["writer"] * args.writers + ["reader"] * args.readers)
+    ]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    report = {}
+    for role in ("writer", "reader"):
+        rows = [r for r in results if r["role"] == role]
+        latencies = [x for r in rows for x in r["latencies"]]
+        ops = sum(r["ops"] for r in rows)
+        report[role + "s"] = {
+            "processes": len(rows),
+            "ops": ops,
+            "ops_per_sec": round(ops / args.seconds, 1),
+            "locked_errors": sum(r["errors"] for r in rows),
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": round(max(latencies), 3) if latencies else None,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--profiles", default="default,production")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "sqlite_contention",
+        "writers": args.writers,
+        "readers": args.readers,
+        "seconds": args.seconds,
+        "profiles": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles.split(","):
+            report["profiles"][profile] = run_profile(profile, args, tmp)
+
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# =====================================================
+# ⏱ bench_startup.py — import / 앱 생성 / 워커 부팅 시간
+# =====================================================
+#
+# 매번 새 파이썬 프로세스에서 (.pyc / OS 파일 캐시는 있는 상태)
+#   1) import app, create_app (DB_AUTO_INIT 끔/켬), 첫 요청까지 걸린 시간
+#      + create_app 직후 이미 로드된 무거운 모듈 (numpy / openai / PIL)
+#      + 그 무거운 모듈을 따로 import 하는 비용 (지연 import 로 아낀 시간)
+#   2) gunicorn: preload 끔 / 앱만 preload / 앱 + 무거운 모듈 preload
+#      - 첫 응답까지 걸린 시간
+#      - 부팅 동안 마스터 + 워커가 쓴 CPU 시간 (워커 수만큼 반복되는 import 비용)
+#      - 워커 메모리 합: RSS / PSS (PSS 는 공유 페이지를 나눠 셈 → copy-on-write 효과)
+# 를 JSON 으로 출력합니다. (gunicorn 측정은 Linux /proc 필요)
+#
+#   python -m benchmarks.bench_startup --repeat 5 --workers 4
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from benchmarks.common import ROOT, write_report  # noqa: E402
+from benchmarks.load import free_port  # noqa: E402
+
+HEAVY_MODULES = ("numpy", "openai", "PIL.Image")
+
+# 새 프로세스에서 실행: import → create_app → 첫 요청
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app({"SQLALCHEMY_DATABASE_URI": sys.argv[1], "DB_AUTO_INIT": sys.argv[2] == "1",
+                  "MATCH_ENABLED": False, "METRICS_DIR": None})
+t2 = time.perf_counter()
+status = app.test_client().get("/auth/login").status_code
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "status": status,
+    "heavy_loaded": [m for m in sys.argv[3].split(",") if m in sys.modules],
+}))
+"""
+
+HEAVY_PROBE = r"""
+import importlib, json, sys, time
+t0 = time.perf_counter()
+for name in sys.argv[1].split(","):
+    importlib.import_module(name)
+print(json.dumps({"ms": (time.perf_counter() - t0) * 1000}))
+"""
+
+
+def _python(code, *args, env=None):
+    """새 인터프리터로 실행 → (출력 JSON, 프로세스 전체 시간 ms)"""
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], cwd=ROOT, check=True,
+        capture_output=True, text=True, env={**os.environ, **(env or {})},
+    ).stdout
+    wall = (time.perf_counter() - t0) * 1000
+    return json.loads(out.strip().splitlines()[-1]), wall
+
+
+def _median(rows, key):
+    return round(statistics.median(r[key] for r in rows), 1)
+
+
+def measure_process(uri, auto_init, repeat):
+    rows = []
+    for _ in range(repeat):
+        result, wall = _python(PROBE, uri, "1" if auto_init else "0", ",".join(HEAVY_MODULES))
+        result["process_ms"] = wall
+        rows.append(result)
+    return {
+        "db_auto_init": auto_init,
+        "process_ms": _median(rows, "process_ms"),
+        "import_ms": _median(rows, "import_ms"),
+        "create_app_ms": _median(rows, "create_app_ms"),
+        "first_request_ms": _median(rows, "first_request_ms"),
+        "heavy_loaded_after_first_request": rows[-1]["heavy_loaded"],
+    }
+
+
+# =====================================================
+# 🔹 gunicorn (Linux /proc)
+# =====================================================
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime (+ 끝난 자식 cutime, cstime)
+    ticks = sum(int(v) for v in fields[11:15])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def _memory_kb(pid):
+    """smaps_rollup 의 Rss / Pss (kB)"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def measure_gunicorn(db_uri, preload, modules, args, tmp):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_uri,
+        "MATCH_ENABLED": "0",
+        "METRICS_DIR": tempfile.mkdtemp(dir=tmp),
+        "GUNICORN_PRELOAD": "1" if preload else "0",
+        "GUNICORN_PRELOAD_MODULES": ",".join(modules),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_WORKERS": str(args.workers),
+        "GUNICORN_THREADS": "4",
+    }
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "runserver:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("gunicorn 이 시작되지 않았습니다")
+            try:
+                urllib.request.urlopen(base_url + "/auth/login", timeout=2).read()
+                break
+            except OSError:
+                time.sleep(0.05)
+        first_response = time.perf_counter() - t0
+
+        # 모든 워커가 뜰 때까지 기다린 뒤 요청을 조금 보내고 측정
+        while len(_children(proc.pid)) < args.workers and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(args.settle)
+        for _ in range(args.workers * 20):
+            urllib.request.urlopen(base_url + "/auth/login", timeout=5).read()
+
+        workers = _children(proc.pid)
+        memory = [_memory_kb(pid) for pid in workers]
+        cpu = _cpu_seconds(proc.pid) + sum(_cpu_seconds(pid) for pid in workers)
+        return {
+            "preload": preload,
+            "preload_modules": list(modules) if preload else [],
+            "workers": len(workers),
+            "first_response_s": round(first_response, 3),
+            "boot_cpu_s": round(cpu, 2),
+            "workers_rss_mb": round(sum(m["Rss"] for m in memory) / 1024, 1),
+            "workers_pss_mb": round(sum(m["Pss"] for m in memory) / 1024, 1),
+            "master_pss_mb": round(_memory_kb(proc.pid)["Pss"] / 1024, 1),
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="새 프로세스 측정 반복 횟수 (중앙값)")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 수")
+    parser.add_argument("--settle", type=float, default=1.0, help="워커가 다 뜬 뒤 기다릴 시간(초)")
+    parser.add_argument("--no-gunicorn", action="store_true", help="gunicorn 측정 생략")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_uri = "sqlite:///" + os.path.join(tmp, "bench.db")
+        # 스키마는 한 번만 만들어 둠 (`flask db init` 과 같은 일)
+        create_app({"SQLALCHEMY_DATABASE_URI": db_uri, "DB_AUTO_INIT": True, "METRICS_DIR": None})
+
+        heavy = [_python(HEAVY_PROBE, ",".join(HEAVY_MODULES))[0]["ms"] for _ in range(args.repeat)]
+        report = {
+            "benchmark": "startup",
+            "repeat": args.repeat,
+            "heavy_modules": list(HEAVY_MODULES),
+            "heavy_import_ms": round(statistics.median(heavy), 1),
+            "process": [
+                measure_process(db_uri, False, args.repeat),
+                measure_process(db_uri, True, args.repeat),
+            ],
+        }
+        if not args.no_gunicorn and os.path.exists("/proc/self/smaps_rollup"):
+            report["gunicorn"] = [
+                measure_gunicorn(db_uri, False, (), args, tmp),
+                measure_gunicorn(db_uri, True, (), args, tmp),
+                measure_gunicorn(db_uri, True, HEAVY_MODULES, args, tmp),
+            ]
+
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
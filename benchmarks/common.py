@@ -0,0 +1,74 @@
+# =====================================================
+# ⏱ common.py — 벤치마크 공통 도구
+# =====================================================
+
+import json
+import os
+import platform
+import resource
+import sqlite3
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, p):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3)
+
+
+def rss_mb(who=resource.RUSAGE_SELF):
+    """최대 RSS (MB, Linux 는 KB / macOS 는 바이트 단위)"""
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024), 1)
+
+
+def latency_summary(samples, seconds, errors=0):
+    """지연 시간 목록(ms) → 요청 수 / 처리량 / 백분위수"""
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / seconds, 1) if seconds else None,
+        "mean_ms": round(sum(samples) / len(samples), 3) if samples else None,
+        "p50_ms": percentile(samples, 0.50),
+        "p95_ms": percentile(samples, 0.95),
+        "p99_ms": percentile(samples, 0.99),
+        "max_ms": round(max(samples), 3) if samples else None,
+    }
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def environment():
+    """어느 커밋 / 어떤 환경에서 잰 결과인지"""
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_report(report, out=None):
+    """환경 정보를 붙여 JSON 출력 (out 을 주면 파일에도 저장)"""
+    report = {**report, "env": environment()}
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return report
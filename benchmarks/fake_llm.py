@@ -0,0 +1,192 @@
+# =====================================================
+# 🧪 fake_llm.py — 로컬 가짜 OpenAI 호환 서버
+# =====================================================
+#
+# 실제 API 키 없이 AI 기능을 시험하거나 부하를 줄 때 사용합니다.
+#   python -m benchmarks.fake_llm --port 8085 --delay 0.5
+#   OPENAI_BASE_URL=http://127.0.0.1:8085/v1 python runserver.py
+#
+# POST /v1/chat/completions
+#   - 프롬프트에 "lost:1", "found:3" 처럼 시작하는 후보 줄이 있으면
+#     그 키들을 JSON 배열로 돌려줌 (AI 매칭 재정렬 흉내)
+#   - 그 외에는 질문을 그대로 되돌려 주는 답변
+#   - "stream": true 이면 OpenAI 와 같은 SSE 조각 (data: {...delta...} / data: [DONE])
+# --delay      : 첫 토큰까지 대기 시간(초) — 느린 업스트림 재현
+# --token-delay: 토큰(단어) 하나마다 대기 시간(초) — 스트리밍이 아니면 전부 기다린 뒤 응답
+# --words      : 답변을 이 단어 수까지 늘림 (0 이면 그대로) — 긴 답변 재현
+# --fail-rate  : 이 비율만큼 500 응답 — 재시도 동작 확인
+# 스트리밍 도중 클라이언트가 끊으면 생성을 멈추고 stats["cancelled"] 를 올림
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANDIDATE_LINE = re.compile(r"^((?:lost|found):\d+) ", re.MULTILINE)
+TOKEN = re.compile(r"\S+\s*")
+FILLER = "분실물 센터 에 문의 하시거나 등록 된 습득물 목록 을 확인 해 보세요.".split()
+
+
+def fake_answer(messages):
+    prompt = messages[-1].get("content", "") if messages else ""
+    keys = CANDIDATE_LINE.findall(prompt)
+    if keys:
+        return json.dumps([
+            {"key": k, "score": round(1.0 - n * 0.1, 2)} for n, k in enumerate(keys[:5])
+        ])
+    return f"[fake] {prompt[:200]}"
+
+
+def pad_answer(answer, words):
+    """질문 답변을 words 단어까지 늘림 (AI 매칭 JSON 은 그대로)"""
+    missing = words - len(TOKEN.findall(answer))
+    if not answer.startswith("[fake]") or missing <= 0:
+        return answer
+    return " ".join([answer.rstrip()] + [FILLER[n % len(FILLER)] for n in range(missing)])
+
+
+_stats_lock = threading.Lock()
+
+
+def _count(stats, name):
+    if stats is not None:
+        with _stats_lock:
+            stats[name] = stats.get(name, 0) + 1
+
+
+def _stream_chunk(model, delta, finish_reason=None):
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    token_delay = 0.0
+    words = 0
+    fail_rate = 0.0
+    stats = None        # {"streams", "completed", "cancelled"} — start_fake_server 가 만듦
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, request, answer):
+        """SSE 로 토큰(단어)마다 한 조각씩 — 끊기면 멈추고 cancelled"""
+        model = request.get("model", "fake")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        _count(self.stats, "streams")
+
+        chunks = [_stream_chunk(model, {"role": "assistant", "content": ""})]
+        chunks += [_stream_chunk(model, {"content": t}) for t in TOKEN.findall(answer)]
+        chunks.append(_stream_chunk(model, {}, "stop"))
+        try:
+            for n, chunk in enumerate(chunks):
+                if 1 < n < len(chunks) - 1:
+                    time.sleep(self.token_delay)
+                data = json.dumps(chunk, ensure_ascii=False)
+                self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            _count(self.stats, "cancelled")
+            self.close_connection = True
+            return
+        _count(self.stats, "completed")
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            self._send_json(500, {"error": {"message": "fake upstream error"}})
+            return
+
+        messages = request.get("messages", [])
+        answer = pad_answer(fake_answer(messages), self.words)
+        if request.get("stream"):
+            self._stream(request, answer)
+            return
+
+        # 스트리밍과 같은 생성 시간을 다 기다린 뒤 한 번에
+        time.sleep(self.token_delay * max(0, len(TOKEN.findall(answer)) - 1))
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        self._send_json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(answer) // 4,
+                "total_tokens": prompt_tokens + len(answer) // 4,
+            },
+        })
+
+
+def _handler(delay=0.0, token_delay=0.0, words=0, fail_rate=0.0):
+    return type("Handler", (FakeLLMHandler,), {
+        "delay": delay, "token_delay": token_delay, "words": words,
+        "fail_rate": fail_rate, "stats": {},
+    })
+
+
+def start_fake_server(host="127.0.0.1", port=0, delay=0.0, fail_rate=0.0, token_delay=0.0, words=0):
+    """
+    백그라운드 스레드에서 서버 시작 (벤치마크/스크립트용)
+    반환: (server, base_url) — 끝나면 server.shutdown()
+    server.RequestHandlerClass.stats 로 스트림 완료/취소 수 확인
+    """
+    handler = _handler(delay, token_delay, words, fail_rate)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 OpenAI 호환 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--words", type=int, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    handler = _handler(args.delay, args.token_delay, args.words, args.fail_rate)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"fake LLM: http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
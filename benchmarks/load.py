@@ -0,0 +1,328 @@
+# =====================================================
+# ⏱ load.py — 주요 엔드포인트 부하 측정
+# =====================================================
+#
+# 임시 SQLite DB 에 가짜 데이터(seed.py)를 넣고 자주 쓰는 화면/API 를
+# 동시에 반복 호출해 엔드포인트별 p50/p95/p99 (ms), 처리량(req/s),
+# 최대 RSS 를 JSON 으로 출력합니다. AI 엔드포인트는 fake_llm 서버를 사용합니다.
+#
+#   --mode client   : Flask test client (한 프로세스 안, 스레드로 동시 요청)
+#   --mode gunicorn : gunicorn.conf.py 로 실제 서버를 띄워 HTTP 로 호출
+#
+#   python -m benchmarks.load --rows 20000 --requests 200 --concurrency 8
+#   python -m benchmarks.load --mode gunicorn --workers 4 --out run.json
+#
+# 결과 JSON 에는 커밋 해시가 들어가므로 커밋 전/후 결과를 비교할 수 있습니다.
+
+import argparse
+import json
+import os
+import random
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, matcher  # noqa: E402
+from app.cache import cache_stats  # noqa: E402
+from app.utils import CATEGORIES, LOCATIONS  # noqa: E402
+from benchmarks.common import ROOT, latency_summary, rss_mb, write_report  # noqa: E402
+from benchmarks.fake_llm import start_fake_server  # noqa: E402
+from benchmarks.seed import ADJECTIVES, BENCH_ADMIN, BENCH_USER, create_accounts, seed  # noqa: E402
+
+
+# =====================================================
+# 🔹 측정할 엔드포인트
+# =====================================================
+# 이름 → (계정, 요청 만드는 함수(rnd, rows) → (method, path, JSON 본문, form))
+def _search(rnd, rows):
+    query = urllib.parse.urlencode({
+        "keyword": rnd.choice(CATEGORIES), "place": rnd.choice(LOCATIONS),
+    })
+    return "GET", "/search?" + query, None, None
+
+
+def _api_items(rnd, rows):
+    query = urllib.parse.urlencode({
+        "keyword": rnd.choice(CATEGORIES), "place": rnd.choice(LOCATIONS),
+        "fields": "id,name,image",
+    })
+    return "GET", "/api/v1/items?" + query, None, None
+
+
+def _ai_text(rnd):
+    # 같은 문장이 반복되면 AI 결과 캐시에 맞음 (조합 수 = 캐시 가능한 키 수)
+    return f"{rnd.choice(LOCATIONS)}에서 {rnd.choice(ADJECTIVES)} {rnd.choice(CATEGORIES)} 잃어버렸어요"
+
+
+ENDPOINTS = {
+    "index": ("user", lambda rnd, rows: ("GET", "/", None, None)),
+    "search": ("user", _search),
+    "statistics": ("user", lambda rnd, rows: ("GET", "/statistics", None, None)),
+    "item_detail": ("user", lambda rnd, rows: ("GET", f"/item/{rnd.randrange(1, rows + 1)}", None, None)),
+    "api_items": ("user", _api_items),
+    "admin_items": ("admin", lambda rnd, rows: ("GET", "/admin/items", None, None)),
+    "ai_match": ("user", lambda rnd, rows: ("POST", "/ai/ai/match", {"text": _ai_text(rnd)}, None)),
+    "api_ai_match": ("user", lambda rnd, rows: ("POST", "/api/ai-match", {"description": _ai_text(rnd)}, None)),
+    "ai_qa": ("user", lambda rnd, rows: ("POST", "/ai", None, {"question": _ai_text(rnd)})),
+}
+
+
+# =====================================================
+# 🔹 요청 보내는 쪽 (test client / HTTP)
+# =====================================================
+class ClientSession:
+    """Flask test client 한 개 = 브라우저 한 개 (쿠키 유지)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, payload=None, form=None):
+        resp = self.client.open(path, method=method, json=payload, data=form)
+        resp.close()
+        return resp.status_code
+
+
+class HTTPSession:
+    """urllib + 쿠키 (리다이렉트는 따라가지 않음 — test client 와 같은 상태 코드)"""
+
+    class _NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), self._NoRedirect()
+        )
+
+    def request(self, method, path, payload=None, form=None):
+        headers, body = {}, None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urllib.parse.urlencode(form).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+def login(session, account):
+    username, password = BENCH_ADMIN if account == "admin" else BENCH_USER
+    path = "/auth/api/admin/login" if account == "admin" else "/auth/api/login"
+    status = session.request("POST", path, {"username": username, "password": password})
+    if status != 200:
+        raise RuntimeError(f"벤치마크 계정 로그인 실패 ({account}): {status}")
+
+
+def run_endpoint(name, make_session, rows, requests, concurrency, warmup):
+    """requests 번을 concurrency 개 스레드로 나눠 호출 → 지연 시간 요약"""
+    account, build = ENDPOINTS[name]
+    sessions = []
+    for _ in range(concurrency):
+        session = make_session()
+        login(session, account)
+        sessions.append(session)
+
+    rnd = random.Random(name)
+    for _ in range(warmup):
+        sessions[0].request(*build(rnd, rows))
+
+    lock = threading.Lock()
+    remaining = [requests]
+    latencies, statuses = [], {}
+
+    def loop(session, seed):
+        local = random.Random(seed)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            req = build(local, rows)
+            t0 = time.perf_counter()
+            try:
+                status = session.request(*req)
+            except Exception:       # 연결 오류 등 → 오류로 집계
+                status = "exception"
+            elapsed = (time.perf_counter() - t0) * 1000
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if isinstance(status, int) and status < 400:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=loop, args=(s, f"{name}-{n}")) for n, s in enumerate(sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    errors = sum(n for s, n in statuses.items() if not isinstance(s, int) or s >= 400)
+    summary = latency_summary(latencies, seconds, errors)
+    summary["status_codes"] = {str(k): v for k, v in sorted(statuses.items(), key=str)}
+    return summary
+
+
+# =====================================================
+# 🔹 준비 / 서버
+# =====================================================
+def prepare_db(db_file, args):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite:///" + db_file, "MATCH_ENABLED": False,
+                      "DB_AUTO_INIT": True})
+    with app.app_context():
+        t0 = time.perf_counter()
+        seed(args.rows, users=args.users)
+        create_accounts()
+        if not args.no_match:
+            matcher.backfill(batch=1000)
+        seconds = time.perf_counter() - t0
+        db.session.remove()
+        db.engine.dispose()
+    return round(seconds, 2)
+
+
+def app_env(db_file, llm_url):
+    """서버 / test client 공통 설정 (환경 변수 이름 = config 키)"""
+    return {
+        "DATABASE_URL": "sqlite:///" + db_file,
+        "OPENAI_API_KEY": "fake",
+        "OPENAI_BASE_URL": llm_url,
+        "AI_MATCH_OFFLINE": "0",
+        "LOGIN_LIMIT_ENABLED": "0",     # 스레드마다 로그인하므로 제한 끔
+        "MATCH_ENABLED": "0",
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(env, args):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "runserver:app"],
+        cwd=ROOT,
+        env={**os.environ, **env,
+             "GUNICORN_BIND": f"127.0.0.1:{port}",
+             "GUNICORN_WORKERS": str(args.workers),
+             "GUNICORN_THREADS": str(args.threads)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("gunicorn 이 시작되지 않았습니다")
+        try:
+            urllib.request.urlopen(base_url + "/auth/login", timeout=2).read()
+            return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("gunicorn 응답 대기 시간 초과")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=("client", "gunicorn"), default="client")
+    parser.add_argument("--rows", type=int, default=20_000, help="물품 수 (분실물 + 습득물)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="쉼표로 구분")
+    parser.add_argument("--llm-delay", type=float, default=0.05, help="가짜 LLM 응답 지연(초)")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 수")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn 워커당 스레드 수")
+    parser.add_argument("--no-match", action="store_true", help="자동 매칭 계산 생략")
+    parser.add_argument("--out", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.endpoints.split(",") if n.strip()]
+    unknown = set(names) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))}")
+
+    llm_server, llm_url = start_fake_server(delay=args.llm_delay)
+    results, server = {}, None
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        seed_seconds = prepare_db(db_file, args)
+        env = app_env(db_file, llm_url)
+
+        if args.mode == "client":
+            app = create_app({
+                "SQLALCHEMY_DATABASE_URI": env["DATABASE_URL"],
+                "OPENAI_API_KEY": env["OPENAI_API_KEY"],
+                "OPENAI_BASE_URL": env["OPENAI_BASE_URL"],
+                "AI_MATCH_OFFLINE": False,
+                "LOGIN_LIMIT_ENABLED": False,
+                "MATCH_ENABLED": False,
+            })
+            make_session = lambda: ClientSession(app)  # noqa: E731
+        else:
+            server, base_url = start_gunicorn(env, args)
+            make_session = lambda: HTTPSession(base_url)  # noqa: E731
+
+        try:
+            for name in names:
+                results[name] = run_endpoint(
+                    name, make_session, args.rows, args.requests, args.concurrency, args.warmup
+                )
+        finally:
+            if server is not None:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+            llm_server.shutdown()
+
+    total = sum(r["requests"] for r in results.values())
+    report = {
+        "benchmark": "load",
+        "mode": args.mode,
+        "rows": args.rows,
+        "requests_per_endpoint": args.requests,
+        "concurrency": args.concurrency,
+        "llm_delay": args.llm_delay,
+        "seed_seconds": seed_seconds,
+        "endpoints": results,
+        "total_requests": total,
+        "total_seconds": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": {
+            # client 모드는 이 프로세스가 서버, gunicorn 모드는 종료된 워커 중 최대
+            "runner": rss_mb(),
+            "server": rss_mb() if args.mode == "client" else rss_mb(resource.RUSAGE_CHILDREN),
+        },
+    }
+    if args.mode == "client":
+        report["cache"] = cache_stats()
+    if args.mode == "gunicorn":
+        report["workers"] = args.workers
+        report["threads"] = args.threads
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from app import create_app, db
 from app.models import User
 
 def create_admin():
-    app = create_app()
+    app = create_app({"DB_AUTO_INIT": True})     # 스키마가 없으면 먼저 생성
 
     # 使用 app_context 包裹数据库操作
     with app.app_context():
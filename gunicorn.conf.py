@@ -0,0 +1,82 @@
+# =====================================================
+# 🦄 gunicorn.conf.py — 운영 서버 설정
+# =====================================================
+#
+#   gunicorn runserver:app
+#
+# AI 요청은 LLM 응답을 기다리는 동안 블로킹되므로 sync 워커 대신
+#   - gthread (기본): 워커당 여러 스레드 → AI 요청이 스레드 하나만 점유
+#   - gevent        : GUNICORN_WORKER_CLASS=gevent (pip install gevent 필요)
+# 를 사용합니다. 프로세스당 동시 LLM 호출 수는 LLM_MAX_CONCURRENCY 로 제한됩니다.
+# 실시간 알림(/stream/items)은 연결마다 오래 열려 있으므로 gevent 워커일 때만 켭니다.
+# (gthread 에서는 연결 하나가 스레드 하나를 STREAM_MAX_SECONDS 동안 점유 → 기본 꺼짐,
+#  필요하면 STREAM_ENABLED=1 로 켜되 STREAM_MAX_CLIENTS 는 threads // 2 로 제한됨)
+#
+# preload_app (기본 켬): 마스터가 앱을 한 번 만들고 워커는 fork 로 물려받습니다.
+#   - 워커마다 import / create_app 을 반복하지 않아 부팅이 빠름
+#   - 마스터에서 무거운 모듈 import + 템플릿 컴파일 + gc.freeze() 후 fork
+#     → 워커끼리 메모리 페이지 공유 (copy-on-write)
+#   - DB 풀 / SQLite 캐시 연결은 fork 뒤 워커에서 새로 엶 (db_profile.py, cache.py)
+#   - 대신 HUP 로 코드를 다시 읽지 않음 → 코드 배포는 재시작 (GUNICORN_PRELOAD=0 이면 예전 방식)
+# 스키마는 시작할 때 만들지 않으므로 배포 때 `flask --app runserver db init` 을 먼저 실행합니다.
+
+import gc
+import importlib
+import multiprocessing
+import os
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5555")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+if worker_class == "gevent":
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "200"))
+    # 연결마다 greenlet 하나 → 알림을 켜고, 연결 수의 절반까지 구독 허용
+    os.environ.setdefault("STREAM_ENABLED", "1")
+    os.environ.setdefault("STREAM_MAX_CLIENTS", str(max(1, worker_connections // 2)))
+else:
+    # SSE(/stream/items) 연결은 스레드 하나를 계속 점유 → 절반은 일반 요청용으로 남김
+    os.environ.setdefault("STREAM_MAX_CLIENTS", str(max(1, threads // 2)))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# 마스터에서 미리 import 할 모듈 (앱은 처음 쓸 때 import 하도록 미뤄 둠)
+# 부팅은 조금 늦어지지만 워커마다 첫 AI/업로드 요청에서 따로 import 하지 않고 공유
+# 빈 값이면 앱만 preload
+PRELOAD_MODULES = [
+    name for name in os.getenv("GUNICORN_PRELOAD_MODULES", "numpy,openai,PIL.Image").split(",") if name
+]
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# 워커별 메트릭 파일을 모으는 디렉터리 (app/metrics.py) — 워커는 fork 후 이 값을 물려받음
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "lostfound-metrics"))
+
+
+def on_starting(server):
+    # 이전 실행의 워커 파일이 카운터에 더해지지 않도록 비움
+    from app.metrics import clear_dir
+    clear_dir(os.environ["METRICS_DIR"])
+
+
+def when_ready(server):
+    # 첫 워커를 fork 하기 직전 (마스터, 한 번)
+    if not preload_app:
+        return
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            server.log.warning("미리 import 실패: %s", name)
+
+    app = server.app.wsgi()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    # 지금까지 만든 객체는 GC 추적에서 빼서 워커의 GC 가 공유 페이지를 건드리지(복사하지) 않도록
+    gc.collect()
+    gc.freeze()
@@ -3,4 +3,8 @@ from app import create_app
 app = create_app()
 
 if __name__ == "__main__":
+    # 개발 서버: 스키마가 없으면 만들고 시작 (운영은 `flask --app runserver db init`)
+    from app.migrations import init_db
+    with app.app_context():
+        init_db()
     app.run(host="0.0.0.0", port=5555, debug=True)
@@ -0,0 +1,51 @@
+# =====================================================
+# 🧪 conftest.py — 공용 픽스처 (임시 SQLite 앱 / 클라이언트)
+# =====================================================
+#
+#   app          : 임시 DB 로 만든 앱 (스키마 + 벤치마크 계정까지)
+#   client       : 로그인하지 않은 테스트 클라이언트
+#   user_client  : BENCH_USER 로 로그인한 테스트 클라이언트
+#
+# 설정을 바꾸려면 파일 안에서 app_config 픽스처를 다시 정의하거나
+#   @pytest.mark.parametrize("app_config", [{"PROFILING": True}])
+# 처럼 테스트마다 넘깁니다.
+
+import pytest
+
+from app import create_app
+from benchmarks.seed import BENCH_USER, create_accounts
+
+BASE_CONFIG = {
+    "DB_AUTO_INIT": True,
+    "MATCH_ENABLED": False,       # 커밋 훅 매칭은 끔 (필요하면 backfill 로)
+    "METRICS_DIR": None,
+}
+
+
+@pytest.fixture
+def app_config():
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    app = create_app({
+        **BASE_CONFIG,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.db"),
+        **app_config,
+    })
+    with app.app_context():
+        create_accounts()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user_client(client):
+    body = {"username": BENCH_USER[0], "password": BENCH_USER[1]}
+    assert client.post("/auth/api/login", json=body).status_code == 200
+    return client
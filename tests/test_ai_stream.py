@@ -0,0 +1,19 @@
+# =====================================================
+# 🧪 /ai/stream — 문자열이 아닌 질문
+# =====================================================
+
+import pytest
+
+
+@pytest.mark.parametrize("body", [
+    {"question": 5},
+    {"question": ["지갑"]},
+    {"question": {"a": 1}},
+    {"question": None},
+    {},
+    ["지갑"],
+])
+def test_bad_question_is_400(user_client, body):
+    resp = user_client.post("/ai/stream", json=body)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
@@ -0,0 +1,17 @@
+# =====================================================
+# 🧪 /api/search — /api/v1/items 와 같은 구현 (deprecated)
+# =====================================================
+
+
+def test_api_search_delegates_to_v1(user_client):
+    old = user_client.get("/api/search?fields=id,name")
+    new = user_client.get("/api/v1/items?fields=id,name")
+    assert old.status_code == new.status_code == 200
+    assert old.get_json()["items"] == new.get_json()["items"]
+    assert set(old.get_json()) >= {"items", "next_cursor"}
+    assert old.headers["Deprecation"] == "true"
+    assert "/api/v1/items" in old.headers["Link"]
+
+
+def test_api_search_requires_login_as_json(client):
+    assert client.get("/api/search").status_code == 401
@@ -0,0 +1,39 @@
+# =====================================================
+# 🧪 로그인 API — 문자열이 아닌 아이디/비밀번호
+# =====================================================
+
+import pytest
+
+from benchmarks.seed import BENCH_USER
+
+
+@pytest.mark.parametrize("path", ["/auth/api/login", "/auth/api/admin/login"])
+@pytest.mark.parametrize("body", [
+    {"username": 123, "password": "x"},
+    {"username": ["a"], "password": "x"},
+    {"username": BENCH_USER[0], "password": 123},
+])
+def test_non_string_credentials_are_rejected(client, path, body):
+    assert client.post(path, json=body).status_code == 401
+
+
+@pytest.mark.parametrize("path", ["/auth/api/login", "/auth/api/admin/login"])
+@pytest.mark.parametrize("raw", ["[]", "null", '"x"', "{bad json"])
+def test_non_object_body_is_rejected(client, path, raw):
+    resp = client.post(path, data=raw, content_type="application/json")
+    assert resp.status_code == 401
+
+
+def test_string_credentials_still_log_in(client):
+    body = {"username": BENCH_USER[0], "password": BENCH_USER[1]}
+    assert client.post("/auth/api/login", json=body).status_code == 200
+
+
+@pytest.mark.parametrize("body", [{"password": "x"}, {"username": "", "password": "x"},
+                                  {"username": 5, "password": "x"}])
+def test_missing_username_does_not_share_a_global_bucket(client, body):
+    # 아이디 없는 요청은 IP 버킷만 → IP 마다 따로 (LOGIN_LIMIT_USER 기본 5/60 을 넘겨 봄)
+    for n in range(8):
+        for ip in ("10.0.0.1", "10.0.0.2"):
+            resp = client.post("/auth/api/login", json=body, environ_base={"REMOTE_ADDR": ip})
+            assert resp.status_code == 401
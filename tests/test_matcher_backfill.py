@@ -0,0 +1,55 @@
+# =====================================================
+# 🧪 matcher.backfill — 배치가 여러 번이어도 모든 분실물을 매칭하는지
+# =====================================================
+
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, matcher
+from app.models import FoundItem, LostItem, Match
+
+
+@pytest.fixture(autouse=True)
+def app_ctx(app):
+    # MATCH_ENABLED=False (conftest) → 커밋 훅 대신 backfill 로만 계산
+    with app.app_context():
+        yield
+
+
+def _seed(count, gap_days=60):
+    """서로 날짜 창이 겹치지 않는 분실물 / 습득물 쌍 count 개"""
+    first = date(2024, 1, 1)
+    lost_ids = []
+    for n in range(count):
+        day = first + timedelta(days=n * gap_days)
+        lost = LostItem(name=f"검은 지갑 {n}", category="지갑", place="도서관", date=day)
+        found = FoundItem(name=f"검은 지갑 {n}", category="지갑", place="도서관", date=day)
+        db.session.add_all([lost, found])
+        db.session.flush()
+        lost_ids.append(lost.id)
+    db.session.commit()
+    return lost_ids
+
+
+def _matched_lost_ids():
+    return {lost_id for (lost_id,) in db.session.query(Match.lost_id).distinct()}
+
+
+def test_backfill_matches_every_lost_item_across_batches():
+    lost_ids = _seed(12)
+
+    totals = matcher.backfill(batch=2)
+
+    assert totals["lost"] == 12
+    assert _matched_lost_ids() == set(lost_ids)
+
+
+def test_backfill_date_range_is_not_narrowed_by_previous_batch():
+    lost_ids = _seed(12)
+
+    # bulk import 처럼 start / end 를 주고 다시 계산
+    totals = matcher.backfill(batch=2, start=date(2024, 1, 1), end=date(2026, 1, 1))
+
+    assert totals["lost"] == 12
+    assert _matched_lost_ids() == set(lost_ids)
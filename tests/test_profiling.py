@@ -0,0 +1,53 @@
+# =====================================================
+# 🧪 느린 쿼리 기록 — 파라미터 값 가리기
+# =====================================================
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db, profiling
+from benchmarks.seed import BENCH_USER
+
+PROFILED = {"PROFILING": True, "SLOW_QUERY_MS": 0}
+
+
+def slow_queries(client):
+    profiling.metrics.reset()
+    body = {"username": BENCH_USER[0], "password": BENCH_USER[1]}
+    assert client.post("/auth/api/login", json=body).status_code == 200
+    return profiling.metrics.snapshot()["slow_queries"]
+
+
+@pytest.mark.parametrize("app_config", [PROFILED])
+def test_parameters_are_redacted_by_default(client):
+    entries = slow_queries(client)
+    assert entries
+    assert all(BENCH_USER[0] not in e["parameters"] for e in entries)
+
+
+@pytest.mark.parametrize("app_config", [{**PROFILED, "SLOW_QUERY_PARAMS": True}])
+def test_parameters_are_logged_when_enabled(client):
+    entries = slow_queries(client)
+    assert any(BENCH_USER[0] in e["parameters"] for e in entries)
+
+
+@pytest.mark.parametrize("parameters, expected", [
+    (("a", 1), ("?", "?")),
+    ([("a",), ("b",)], [("?",), ("?",)]),
+    ({"name": "a"}, {"name": "?"}),
+])
+def test_redact_keeps_shape(parameters, expected):
+    assert profiling._redact(parameters) == expected
+
+
+
+@pytest.mark.parametrize("app_config", [PROFILED])
+def test_failed_statement_leaves_no_timer_behind(app):
+    # 실패한 문장은 after_cursor_execute 가 없음 → 연결(풀에서 재사용)에 시작 시각이 남으면 안 됨
+    with app.app_context(), db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert not conn.info.get("query_started")
@@ -0,0 +1,28 @@
+# =====================================================
+# 🧪 검색 커서 — 값 모양이 틀린 커서는 첫 페이지
+# =====================================================
+
+import base64
+import json
+
+import pytest
+
+
+def encode(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("path", ["/search", "/api/v1/items"])
+@pytest.mark.parametrize("keyword", ["", "지갑"])
+@pytest.mark.parametrize("values", [
+    ["recent", "2024-01-01T00:00:00", {"a": 1}],
+    ["recent", {"a": 1}, 3],
+    ["recent", "2024-01-01T00:00:00", 2 ** 70],
+    ["fts", {"a": 1}, 3],
+    ["fts", -1.5, [1]],
+    ["fts", -1.5, "3"],
+    [{"a": 1}],
+])
+def test_malformed_cursor_is_first_page(user_client, path, keyword, values):
+    resp = user_client.get(path, query_string={"keyword": keyword, "cursor": encode(values)})
+    assert resp.status_code == 200
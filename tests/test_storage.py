@@ -0,0 +1,54 @@
+# =====================================================
+# 🧪 업로드 저장소 — 중복 재사용과 GC 가 겹칠 때
+# =====================================================
+
+import io
+import os
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app import db, images, storage
+from app.models import Blob, LostItem
+
+PHOTO = b"not really an image, but the bytes are what gets hashed" * 100
+
+
+@pytest.fixture(autouse=True)
+def app_ctx(app, tmp_path):
+    app.static_folder = str(tmp_path / "static")     # 저장소 밖(작업 트리)에 쓰지 않도록
+    with app.app_context():
+        yield
+    images.wait()
+
+
+def _path(url):
+    return os.path.join(storage.upload_dir(), *url[len(storage.URL_PREFIX):].split("/"))
+
+
+def test_reused_blob_survives_a_concurrent_collect(app):
+    # 물품 없이 올라간 사진 → refcount 0 인 blob (GC 대상)
+    url = storage.store_stream(io.BytesIO(PHOTO), "a.png")
+    db.session.commit()
+    images.wait()
+
+    # 같은 사진을 다시 올리는 요청 (아직 물품 커밋 전)
+    assert storage.store_stream(io.BytesIO(PHOTO), "b.png") == url
+
+    def run_collect():
+        with app.app_context():
+            storage.collect()
+
+    collector = threading.Thread(target=run_collect)
+    collector.start()
+    time.sleep(0.3)                 # collect 가 먼저 DELETE 를 시도하도록
+
+    db.session.add(LostItem(name="검은 지갑", category="지갑", place="도서관",
+                            date=date(2024, 1, 1), image=url))
+    db.session.commit()
+    collector.join()
+
+    assert os.path.exists(_path(url))
+    assert db.session.get(Blob, storage.digest_from_url(url)).refcount == 1
@@ -0,0 +1,17 @@
+# =====================================================
+# 🧪 /stream/items — STREAM_ENABLED 일 때만 (홈 화면 구독 포함)
+# =====================================================
+
+import pytest
+
+
+def test_feed_is_off_by_default(user_client):
+    assert b"EventSource" not in user_client.get("/").data
+    assert user_client.get("/stream/items").status_code == 404
+
+
+@pytest.mark.parametrize("app_config", [{"STREAM_ENABLED": True, "STREAM_MAX_CLIENTS": 0}])
+def test_feed_is_served_when_enabled(user_client):
+    assert b"EventSource" in user_client.get("/").data
+    # 구독자 한도 0 → 연결을 열지 않고 503 (한도 확인까지 왔다는 뜻)
+    assert user_client.get("/stream/items").status_code == 503
@@ -0,0 +1,22 @@
+# =====================================================
+# 🧪 413 — API 는 JSON, 폼 페이지는 flash + 리다이렉트
+# =====================================================
+
+import pytest
+
+
+@pytest.fixture
+def app_config():
+    return {"MAX_CONTENT_LENGTH": 1024}
+
+
+@pytest.mark.parametrize("path", ["/ai/stream", "/api/ai-match", "/auth/api/login"])
+def test_api_gets_json_413(user_client, path):
+    resp = user_client.post(path, json={"question": "x" * 4096})
+    assert resp.status_code == 413
+    assert "error" in resp.get_json()
+
+
+def test_form_page_redirects(user_client):
+    resp = user_client.post("/register", data={"name": "x" * 4096})
+    assert resp.status_code == 302